@@ -9,12 +9,47 @@ This backend service provides:
 4. Calendar sync magic (prevents double bookings)
 """
 
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Set
+from dataclasses import dataclass, field
+from collections import deque
+from functools import cached_property
 import asyncio
-import httpx
 import json
+import time
+
+from calendar_sync import CalendarSync, Booking
+from channel_client import ChannelClient
+from dashboard_cache import DashboardCache
+from dashboard_serializer import encode_dashboard
+from dashboard_stream import DashboardStreamHub
+from event_log import EventLog, correlated
+from message_classifier import MessageClassifier
+from metrics import MetricsRegistry, ALL_HOSTS
+from opportunity_worker import OpportunityPrecomputer
+from pricing_fanout import PricingFanout
+from property_store import PropertyInfoStore, PropertyInfo
+from shared_state import create_shared_state, DEFAULT_SHARED_STATE_URL
+from repository import create_repository, PropertyRow, MESSAGE_AUTO_REPLIED, MESSAGE_NEEDS_HUMAN, DEFAULT_DATABASE_URL
+from spans import SpanRecorder, timed
+from status_engine import StatusEngine, PropertyState
+from response_templates import TemplateRegistry
+from webhook_queue import WebhookQueue, DEFAULT_QUEUE_PATH
+
+# numpy-backed modules are imported on first use - keeps cold starts fast
+if TYPE_CHECKING:
+    from cleaner_dispatch import CleanerDispatcher, CleanerAssignment, CleaningJob
+    from competitor_pricing import CompetitorPricingEngine
+    from rate_calendar import RateCalendar, RateChange
+
+
+# Rough host minutes saved per task done automatically - drives "time saved"
+MINUTES_SAVED_PER_TASK = {
+    'messages_auto_handled': 4,
+    'revenue_optimizations': 20,
+    'cleaners_auto_booked': 15,
+    'calendar_conflicts': 30,
+}
 
 
 @dataclass
@@ -39,13 +74,45 @@ class MoneyOpportunity:
     confidence: float
 
 
+@dataclass
+class DashboardSnapshot:
+    properties: List[Property]
+    money_opportunity: Optional[MoneyOpportunity]
+    overall_status: str
+    total_weekly_revenue: float
+    magic_stats: Dict[str, Any]
+    json_bytes: Optional[bytes] = field(default=None, repr=False)  # Encoded on first request
+    by_id: Dict[str, Property] = field(default_factory=dict, repr=False)  # For in-place status updates
+
+
+@dataclass(frozen=True)
+class DataSource:
+    """Where the service keeps its data - defaults come from the PROPFLOW_* environment"""
+    database_url: str = DEFAULT_DATABASE_URL
+    webhook_queue_path: str = DEFAULT_QUEUE_PATH
+    shared_state_url: str = DEFAULT_SHARED_STATE_URL
+    channel_urls: Optional[Dict[str, str]] = None  # None = PROPFLOW_*_API_URL; {} = simulate every channel
+    demo: bool = False  # Hosts with no stored properties see the demo portfolio (never in production)
+
+
+# 'real' persists and talks to the configured channels; 'mock' is the same
+# service on throwaway in-memory stores (demo portfolio, simulated channels)
+DATA_SOURCES: Dict[str, DataSource] = {
+    'real': DataSource(),
+    'mock': DataSource(database_url='sqlite://', webhook_queue_path=':memory:',
+                       shared_state_url='local', channel_urls={}, demo=True),
+}
+
+
 class MVPBackendService:
     """
     Zero-configuration backend that makes smart decisions automatically
     No settings, no manual configuration - just magic
     """
     
-    def __init__(self):
+    def __init__(self, data_source: DataSource = DATA_SOURCES['real']):
+        self.data_source = data_source
+        
         # Smart defaults - works perfectly out of the box
         self.auto_settings = {
             'auto_apply_small_price_changes': True,  # Under $50
@@ -54,43 +121,633 @@ class MVPBackendService:
             'auto_sync_calendars': True,
             'notification_threshold': 50,  # Only notify for $50+ changes
         }
+        
+        # Parallel price pushes with per-platform limits
+        self.pricing_fanout = PricingFanout()
+        self.pricing_platforms = ['airbnb', 'vrbo', 'direct']
+        
+        # Nightly rate calendars - pushes send only the changed date ranges.
+        # Confirmed pushes are broadcast, so every worker diffs against what the channels have
+        self.rate_calendars: Dict[str, 'RateCalendar'] = {}
+        
+        # Per-stage latency histograms (HDR-style) for every service method - this
+        # service's own, so two apps in one process keep separate timings
+        self.spans = SpanRecorder()
+        
+        # Structured JSON-lines event log - written off the event loop, sampled per event type.
+        # This service's own, handed to every subsystem it builds
+        self.event_log = EventLog()
+        
+        # Real counters behind magic_stats - in-process updates, per-host daily rollups.
+        # This service's own, so the gauges below always read this service
+        self.metrics = MetricsRegistry(event_log=self.event_log)
+        self._guest_messages = self.metrics.counter('propflow_guest_messages_total', 'Guest messages handled', ('outcome',))
+        self._guest_message_seconds = self.metrics.histogram(
+            'propflow_guest_message_seconds', 'Time to auto-reply to or escalate a guest message')
+        self._pricing_updates = self.metrics.counter(
+            'propflow_pricing_updates_total', 'Per-property price optimizations', ('result',))
+        self._extra_revenue = self.metrics.counter(
+            'propflow_extra_revenue_dollars_total', 'Nightly rate increase from applied optimizations')
+        self._cleaner_bookings = self.metrics.counter('propflow_cleaner_bookings_total', 'Cleaner auto-bookings', ('result',))
+        self._calendar_conflicts = self.metrics.counter(
+            'propflow_calendar_conflicts_total', 'Double bookings caught on webhook bookings')
+        
+        # Properties, bookings and guest messages - SQLite by default, PostgreSQL via PROPFLOW_DATABASE_URL
+        self.repository = create_repository(data_source.database_url, spans=self.spans)
+        
+        # Webhook claims, metric totals and cache/stream events shared across worker processes
+        self.shared_state = create_shared_state(data_source.shared_state_url, event_log=self.event_log)
+        self.shared_state.subscribe(self._on_shared_message)
+        self._applying_shared = False  # Applying another worker's change - don't echo it back
+        
+        # One pooled HTTP client shared by every outbound channel call - opened on the first real request
+        self.channel_client = ChannelClient(base_urls=data_source.channel_urls)
+        
+        # Message classifier, reply templates, property details, cleaner roster and
+        # competitor pricing are built on first use - see the properties below
+        self._started = False
+        
+        # Property statuses + per-host counters, updated per event instead of rescanned per request
+        self.status_engine = StatusEngine(on_change=self._on_status_change)
+        
+        # Channel calendars merged per property - double bookings caught on insert
+        self.calendar_sync = CalendarSync(on_change=self._on_calendar_change, event_log=self.event_log)
+        
+        self._cleaner_assignments: Dict[str, 'CleanerAssignment'] = {}  # property_id -> latest booking
+        
+        # Channel webhooks persisted and acknowledged at once, processed by a worker pool
+        self.webhook_queue = WebhookQueue(handlers={
+            'airbnb_message': self._process_airbnb_message,
+            'booking_update': self._process_booking_update,
+        }, path=data_source.webhook_queue_path, shared=self.shared_state,
+            metrics=self.metrics, event_log=self.event_log)
+        
+        # Per-host dashboard snapshots - rebuilt on expiry or when the host's state changes
+        self.dashboard_cache = DashboardCache()
+        self._property_hosts: Dict[str, Set[str]] = {}
+        
+        # Open dashboards get compact diffs pushed over SSE instead of polling
+        self.dashboard_stream = DashboardStreamHub(event_log=self.event_log)
+        
+        # Opportunity detectors, highest priority first, each with its own deadline
+        self.opportunity_detectors = [
+            ('event', self._detect_event_opportunities, 2.0),            # Formula 1, concerts, conferences
+            ('competitor', self._detect_competitor_opportunities, 2.0),  # Your prices vs market
+            ('demand', self._detect_demand_opportunities, 1.0),          # Weekends, holidays
+        ]
+        
+        # Opportunities precomputed in the background - dashboards read the latest result
+        self.opportunity_worker = OpportunityPrecomputer(
+            self._compute_host_opportunity,
+            on_update=self._on_opportunity_update,
+            event_log=self.event_log
+        )
+        
+        self.detector_stats = {
+            name: {'runs': 0, 'found': 0, 'empty': 0, 'timeouts': 0, 'errors': 0, 'cancelled': 0,
+                   'latencies_ms': deque(maxlen=500)}
+            for name, _, _ in self.opportunity_detectors
+        }
+        
+        # Point-in-time values, read only when /metrics is scraped
+        self.metrics.gauge('propflow_calendar_bookings', 'Bookings across all synced calendars',
+                           lambda: sum(len(index) for index in self.calendar_sync.indexes.values()))
+        self.metrics.gauge('propflow_calendar_open_conflicts', 'Double bookings waiting for a human',
+                           lambda: len(self.calendar_sync.get_conflicts()))
+        self.metrics.gauge('propflow_webhook_queue_pending', 'Webhooks persisted but not yet processed',
+                           lambda: self.webhook_queue.get_stats()['pending'])
+        self.metrics.gauge('propflow_dashboard_cache_hosts', 'Hosts with a cached dashboard snapshot',
+                           lambda: self.dashboard_cache.get_stats()['cached_hosts'])
+        self.metrics.gauge('propflow_stage_latency_seconds', 'Service stage latency percentiles',
+                           self.spans.quantiles, ('span', 'quantile'))
+        self.metrics.gauge('propflow_db_connections_in_use', 'Repository pool connections running a query',
+                           lambda: self.repository.get_stats()['in_use'])
+        self.metrics.gauge('propflow_dashboard_streams_open', 'Dashboards connected for pushed updates',
+                           lambda: self.dashboard_stream.get_stats()['open_streams'])
+        self.metrics.gauge('propflow_event_log_queued', 'Events waiting for the log writer thread',
+                           lambda: self.event_log.get_stats()['queued'])
+    
+    # ===== LAZY SUBSYSTEMS (built on first use, not at import or startup) =====
+    
+    @cached_property
+    def message_classifier(self) -> MessageClassifier:
+        """Keyword classifier compiled once - one pass per message"""
+        return MessageClassifier()
+    
+    @cached_property
+    def response_templates(self) -> TemplateRegistry:
+        """Auto-response templates compiled once, replies cached per property"""
+        return TemplateRegistry()
+    
+    @cached_property
+    def property_info(self) -> PropertyInfoStore:
+        """Property details indexed once - cached replies refresh when they change"""
+        store = PropertyInfoStore(on_change=self.invalidate_property_info, event_log=self.event_log)
+        if self._started:
+            store.start_watching()
+        return store
+    
+    @cached_property
+    def cleaner_dispatch(self) -> 'CleanerDispatcher':
+        """Cleaner roster behind a grid index - checkouts get the best cleaner free in time"""
+        from cleaner_dispatch import CleanerDispatcher, load_cleaners
+        return CleanerDispatcher(load_cleaners())
+    
+    @cached_property
+    def competitor_pricing(self) -> 'CompetitorPricingEngine':
+        """Portfolio-wide, vectorized underpricing analysis against market comps"""
+        from competitor_pricing import CompetitorPricingEngine
+        return CompetitorPricingEngine()
+    
+    async def startup(self):
+        """Open shared resources (called from the FastAPI startup hook)"""
+        self._started = True
+        await self.shared_state.start()
+        if self.shared_state.shared:
+            self.metrics.start_sharing(self.shared_state)
+        await self.repository.start()
+        if 'property_info' in self.__dict__:
+            self.property_info.start_watching()
+        self.calendar_sync.start_syncing()
+        self.opportunity_worker.start()
+        self.webhook_queue.start()
+        self.dashboard_stream.start()
+    
+    async def shutdown(self):
+        """Release shared resources (called from the FastAPI shutdown hook)"""
+        await self.dashboard_stream.stop()
+        await self.webhook_queue.stop()
+        self.webhook_queue.close()
+        await self.opportunity_worker.stop()
+        await self.calendar_sync.stop_syncing()
+        if 'property_info' in self.__dict__:
+            await self.property_info.stop_watching()
+        await self.channel_client.close()
+        await self.repository.close()
+        await self.metrics.stop_sharing()
+        await self.shared_state.close()
+        await asyncio.to_thread(self.event_log.close)  # Don't lose the last events on exit
     
     async def get_dashboard_data(self, host_id: str) -> Dict[str, Any]:
         """
         Single API call returns everything the dashboard needs
         No complex queries, no configuration - just magic
         """
+        snapshot = await self.get_dashboard_snapshot(host_id)
+        
+        return {
+            'properties': [self._property_to_dict(p) for p in snapshot.properties],
+            'money_opportunity': self._opportunity_to_dict(snapshot.money_opportunity) if snapshot.money_opportunity else None,
+            'overall_status': snapshot.overall_status,
+            'total_weekly_revenue': snapshot.total_weekly_revenue,
+            'magic_stats': snapshot.magic_stats
+        }
+    
+    @timed('dashboard.json')
+    async def get_dashboard_json(self, host_id: str) -> bytes:
+        """
+        Dashboard as ready-to-send JSON bytes
+        Encoded once per snapshot - cached polls skip serialization entirely
+        """
+        snapshot = await self.get_dashboard_snapshot(host_id)
+        if snapshot.json_bytes is None:
+            snapshot.json_bytes = encode_dashboard(snapshot)
+        return snapshot.json_bytes
+    
+    @timed('dashboard.snapshot')
+    @correlated('host_id')
+    async def get_dashboard_snapshot(self, host_id: str) -> DashboardSnapshot:
+        """
+        Build (or reuse) the host's dashboard as plain dataclasses
+        """
+        cached = self.dashboard_cache.get(host_id)
+        if cached is not None:
+            return cached
         
         # Get properties with automatic status detection
         properties = await self._get_properties_with_smart_status(host_id)
+        for prop in properties:
+            self._property_hosts.setdefault(prop.id, set()).add(host_id)
         
-        # Auto-detect money opportunities 
-        money_opportunity = await self._detect_money_opportunities(properties)
+        # Money opportunities come precomputed from the background worker;
+        # only a host's first load (or a stale result) detects inline
+        precomputed = self.opportunity_worker.get(host_id)
+        if precomputed is not None:
+            money_opportunity = precomputed.opportunity
+        else:
+            money_opportunity = await self._detect_money_opportunities(properties)
+            self.opportunity_worker.store(host_id, money_opportunity)
         
-        # Check if any properties need human attention
-        needs_attention = [p for p in properties if p.status == 'needs-attention']
+        # Overall status and revenue are the status engine's running totals - no scan
+        totals = self.status_engine.totals(host_id)
+        today = await self.metrics.window_shared(host_id, 1)
         
+        snapshot = DashboardSnapshot(
+            properties=properties,
+            money_opportunity=money_opportunity,
+            overall_status=totals.overall_status,
+            total_weekly_revenue=round(totals.total_weekly_revenue, 2),
+            magic_stats={
+                'auto_handled_messages': int(today.get('messages_auto_handled', 0)),  # Handled automatically today
+                'revenue_optimizations': int(today.get('revenue_optimizations', 0)),  # Price adjustments made today
+                'bookings_synced': sum(self.calendar_sync.booking_count(p.id) for p in properties),  # Across all channel calendars
+            },
+            by_id={p.id: p for p in properties}
+        )
+        self.dashboard_cache.put(host_id, snapshot)
+        return snapshot
+    
+    async def get_magic_stats(self, host_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        How much work the automation did - today, this week, overall
+        Read from the daily rollups (summed across workers); nothing is recounted
+        """
+        today = await self.metrics.window_shared(host_id or ALL_HOSTS, 1)
+        week = await self.metrics.window_shared(host_id or ALL_HOSTS, 7)
+        
+        def hours_saved(totals: Dict[str, float]) -> float:
+            return round(sum(totals.get(task, 0) * minutes for task, minutes in MINUTES_SAVED_PER_TASK.items()) / 60, 1)
+        
+        auto_handled, escalated = week.get('messages_auto_handled', 0), week.get('messages_escalated', 0)
+        booked, unassigned = week.get('cleaners_auto_booked', 0), week.get('cleaners_unassigned', 0)
+        response_time = await self.metrics.mean_shared(self._guest_message_seconds)
         return {
-            'properties': [self._property_to_dict(p) for p in properties],
-            'money_opportunity': self._opportunity_to_dict(money_opportunity) if money_opportunity else None,
-            'overall_status': 'good' if len(needs_attention) == 0 else 'needs-attention',
-            'total_weekly_revenue': sum(p.weekly_revenue for p in properties),
-            'magic_stats': {
-                'auto_handled_messages': 47,  # Messages handled automatically today
-                'revenue_optimizations': 3,   # Automatic price adjustments made
-                'bookings_synced': 12,        # Calendar conflicts auto-resolved
+            'today_stats': {
+                'messages_auto_handled': int(today.get('messages_auto_handled', 0)),
+                'messages_escalated': int(today.get('messages_escalated', 0)),
+                'revenue_optimizations': int(today.get('revenue_optimizations', 0)),
+                'revenue_optimizations_failed': int(today.get('revenue_optimizations_failed', 0)),
+                'cleaners_auto_booked': int(today.get('cleaners_auto_booked', 0)),
+                'calendar_conflicts_caught': int(today.get('calendar_conflicts', 0)),
+                'total_time_saved_hours': hours_saved(today)
+            },
+            'this_week_stats': {
+                'extra_revenue_generated': round(week.get('extra_revenue', 0), 2),
+                'messages_auto_handled': int(auto_handled),
+                'cleaning_reliability': f"{booked / (booked + unassigned):.1%}" if booked + unassigned else None,
+                'response_time_average': f"{response_time:.2f} seconds" if response_time is not None else None,
+                'total_time_saved_hours': hours_saved(week)
+            },
+            'magic_level': {
+                'automation_percentage': round(100 * auto_handled / (auto_handled + escalated)) if auto_handled + escalated else None,
+                'manual_tasks_eliminated': int(sum(week.get(task, 0) for task in MINUTES_SAVED_PER_TASK)),
+                '8_year_old_usability': '✅ Approved'
             }
         }
     
+    @correlated('host_id')
+    async def _compute_host_opportunity(self, host_id: str) -> Optional[MoneyOpportunity]:
+        """Background job: detect the best money opportunity for one host"""
+        properties = await self._get_properties_with_smart_status(host_id)
+        return await self._detect_money_opportunities(properties)
+    
+    def refresh_opportunities(self, host_id: Optional[str] = None, property_id: Optional[str] = None):
+        """
+        Ask the background worker to recompute opportunities right away
+        Pass the host_id directly, or a property_id and we find its host
+        """
+        hosts = set(self._property_hosts.get(property_id, ())) if property_id is not None else set()
+        if host_id is not None:
+            hosts.add(host_id)
+        for owner in hosts:
+            self.opportunity_worker.request_refresh(owner)
+    
+    def invalidate_dashboard(self, host_id: Optional[str] = None, property_id: Optional[str] = None):
+        """
+        Something changed - drop the cached dashboard for the affected host(s)
+        Pass the host_id directly, or a property_id and we find its host
+        """
+        if host_id is not None:
+            self.dashboard_cache.invalidate(host_id)
+            self.dashboard_stream.resync(host_id)
+        if property_id is not None:
+            for owner in self._property_hosts.get(property_id, ()):
+                self.dashboard_cache.invalidate(owner)
+                self.dashboard_stream.resync(owner)
+        self._share({'t': 'invalidate', 'host_id': host_id, 'property_id': property_id})
+    
+    def _on_calendar_change(self, property_id: str):
+        """A property's bookings changed - arrivals need a rebuild, conflicts go to the status engine"""
+        self.status_engine.conflict_changed(property_id, self.calendar_sync.has_conflicts(property_id))
+        self.invalidate_dashboard(property_id=property_id)
+    
+    def _on_status_change(self, state: PropertyState):
+        """
+        Patch the property and host totals in cached dashboards - O(1), no rebuild
+        The JSON is re-encoded on the next request; open streams get the diff
+        """
+        for host_id in state.hosts:
+            totals = self.status_engine.totals(host_id)
+            self.dashboard_stream.publish(host_id, 'property', {
+                'id': state.property_id,
+                'status': state.status,
+                'unhandled_messages': state.unhandled_messages,
+                'is_clean': state.is_clean,
+                'weekly_revenue': state.weekly_revenue,
+                'overall_status': totals.overall_status,
+                'total_weekly_revenue': round(totals.total_weekly_revenue, 2),
+            })
+            snapshot = self.dashboard_cache.peek(host_id)
+            prop = snapshot.by_id.get(state.property_id) if snapshot is not None else None
+            if prop is None:
+                continue
+            prop.status = state.status
+            prop.unhandled_messages = state.unhandled_messages
+            prop.is_clean = state.is_clean
+            prop.weekly_revenue = state.weekly_revenue
+            snapshot.overall_status = totals.overall_status
+            snapshot.total_weekly_revenue = round(totals.total_weekly_revenue, 2)
+            snapshot.json_bytes = None
+    
+    def _on_opportunity_update(self, host_id: str):
+        """The background worker found a different best opportunity"""
+        result = self.opportunity_worker.results.get(host_id)
+        opportunity = result.opportunity if result is not None else None
+        self._apply_opportunity(host_id, opportunity)
+        self._share({'t': 'opportunity', 'host_id': host_id,
+                     'opportunity': self._opportunity_to_dict(opportunity) if opportunity else None})
+    
+    def _apply_opportunity(self, host_id: str, opportunity: Optional[MoneyOpportunity]):
+        """Patch the cached dashboard and push the new opportunity to open streams"""
+        snapshot = self.dashboard_cache.peek(host_id)
+        if snapshot is not None:
+            snapshot.money_opportunity = opportunity
+            snapshot.json_bytes = None
+        self.dashboard_stream.publish(host_id, 'opportunity', {'money_opportunity': opportunity})
+    
+    def _publish_escalation(self, property_id: str, message_id: str, classification: Dict[str, Any]):
+        """Tell open dashboards which message needs the host"""
+        escalation = {
+            'property_id': property_id,
+            'message_id': message_id,
+            'reason': classification['escalation_reason'],
+            'priority': classification.get('priority', 'medium'),
+        }
+        for host_id in self._property_hosts.get(property_id, ()):
+            self.dashboard_stream.publish(host_id, 'message_escalated', escalation)
+        self._share({'t': 'escalation', 'escalation': escalation})
+    
+    def _share(self, message: Dict[str, Any]):
+        """Tell the other worker processes (no-op with one worker)"""
+        if not self._applying_shared:
+            self.shared_state.send(message)
+    
+    def _on_shared_message(self, message: Dict[str, Any]):
+        """
+        Apply an event another worker handled - our status engine, cached
+        dashboards, streams and calendars stay in step without re-reading storage.
+        Events, not resulting counts, so concurrent escalations all add up
+        """
+        kind = message['t']
+        self._applying_shared = True
+        try:
+            if kind == 'escalation':
+                escalation = message['escalation']
+                self.status_engine.message_escalated(escalation['property_id'], escalation['message_id'])
+                for host_id in self._property_hosts.get(escalation['property_id'], ()):
+                    self.dashboard_stream.publish(host_id, 'message_escalated', escalation)
+            elif kind == 'cleaning':
+                self.status_engine.cleaning_changed(message['property_id'], message['cleaning'])
+            elif kind == 'invalidate':
+                self.invalidate_dashboard(message['host_id'], message['property_id'])
+            elif kind == 'opportunity':
+                opportunity = message['opportunity']
+                self._apply_opportunity(message['host_id'], MoneyOpportunity(**opportunity) if opportunity else None)
+            elif kind == 'booking':
+                property_id, channel, uid, check_in, check_out, summary = message['booking']
+                self.calendar_sync.add_booking(Booking(property_id, channel, uid, date.fromisoformat(check_in),
+                                                       date.fromisoformat(check_out), summary))
+            elif kind == 'cleaner':
+                self._apply_cleaner_booking(message['assignment'])
+            elif kind == 'rates':
+                self._apply_published_rates(message)
+        finally:
+            self._applying_shared = False
+    
+    def _apply_cleaner_booking(self, booked: Dict[str, Any]):
+        """Another worker booked this cleaner - keep them busy here too"""
+        from cleaner_dispatch import CleanerAssignment
+        
+        cleaner = self.cleaner_dispatch.cleaner(booked['cleaner_id'])
+        if cleaner is None:
+            return
+        assignment = CleanerAssignment(
+            job_id=booked['job_id'],
+            property_id=booked['property_id'],
+            cleaner=cleaner,
+            backups=[b for b in map(self.cleaner_dispatch.cleaner, booked['backup_ids']) if b is not None],
+            score=booked['score'],
+            distance_miles=booked['distance_miles'],
+            estimated_cost=booked['estimated_cost'],
+            start=datetime.fromisoformat(booked['start']),
+            end=datetime.fromisoformat(booked['end'])
+        )
+        self.cleaner_dispatch.reserve(cleaner.id, assignment.end)
+        self._cleaner_assignments[assignment.property_id] = assignment
+        self.invalidate_dashboard(property_id=assignment.property_id)
+    
+    async def set_cleaning(self, property_id: str, cleaning: bool):
+        """Cleaning started (or guests checked out) / cleaning finished"""
+        await self.repository.set_cleaning(property_id, cleaning)
+        self.status_engine.cleaning_changed(property_id, cleaning)
+        self._share({'t': 'cleaning', 'property_id': property_id, 'cleaning': cleaning})
+    
+    @timed('calendar.sync_booking')
+    def sync_booking(self, property_id: str, channel: str, uid: str,
+                     check_in: date, check_out: date, guest: str = '') -> Dict[str, Any]:
+        """
+        Add a booking pushed by a channel webhook to the property's calendar
+        Double bookings are flagged right away instead of at the next feed sync
+        """
+        booking = Booking(property_id, channel, uid, check_in, check_out, f'Reserved - {guest}' if guest else 'Reserved')
+        overlaps = self.calendar_sync.add_booking(booking)
+        self._share({'t': 'booking', 'booking': [property_id, channel, uid, check_in.isoformat(),
+                                                 check_out.isoformat(), booking.summary]})
+        if overlaps:
+            self._calendar_conflicts.inc()
+            self.metrics.record('calendar_conflicts', 1, self._property_hosts.get(property_id, ()))
+        return {
+            'calendar_synced': True,
+            'double_booking': bool(overlaps),
+            'conflicts_with': [b.to_dict() for b in overlaps]
+        }
+    
+    @timed('cleaning.assign')
+    def auto_book_cleaner(self, property_id: str,
+                          checkout: Optional[datetime] = None,
+                          next_arrival: Optional[datetime] = None,
+                          job_type: str = 'standard') -> Dict[str, Any]:
+        """
+        Book the best cleaner (plus backups) for a checkout - no manual booking
+        The clean has to finish before the next guest checks in
+        """
+        job = self._cleaning_job(property_id, checkout, next_arrival, job_type)
+        assignment = self.cleaner_dispatch.assign(job) if job is not None else None
+        return self._record_cleaning(property_id, assignment, located=job is not None)
+    
+    @timed('cleaning.assign_batch')
+    def auto_book_cleaners(self, checkouts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Book cleaners for a whole day of checkouts in one optimization
+        Beats booking one at a time when several properties want the same cleaner
+        """
+        jobs = [self._cleaning_job(c['property_id'], c.get('checkout'), c.get('next_arrival'),
+                                   c.get('job_type', 'standard')) for c in checkouts]
+        located = [job for job in jobs if job is not None]
+        assigned = iter(self.cleaner_dispatch.assign_batch(located))
+        return [self._record_cleaning(c['property_id'], next(assigned) if job is not None else None,
+                                      located=job is not None)
+                for c, job in zip(checkouts, jobs)]
+    
+    def _cleaning_job(self, property_id: str, checkout: Optional[datetime],
+                      next_arrival: Optional[datetime], job_type: str) -> Optional['CleaningJob']:
+        info = self._get_property_info(property_id)
+        if info.lat is None or info.lng is None:
+            return None  # No location on file - nobody can be matched
+        checkout = checkout or datetime.now()
+        if next_arrival is None:
+            # Same-day turnover: the next guest's check-in is the deadline
+            booking = self.calendar_sync.next_arrival(property_id, checkout.date())
+            if booking is not None and booking.check_in == checkout.date():
+                try:
+                    checkin = datetime.strptime(info.checkin_time, '%I:%M %p').time()
+                    next_arrival = datetime.combine(booking.check_in, checkin)
+                except ValueError:
+                    pass
+        from cleaner_dispatch import CleaningJob
+        return CleaningJob(
+            id=f"{property_id}_{checkout:%Y%m%d%H%M}",
+            property_id=property_id,
+            lat=info.lat,
+            lng=info.lng,
+            checkout=checkout,
+            next_arrival=next_arrival,
+            job_type=job_type
+        )
+    
+    def _record_cleaning(self, property_id: str, assignment: Optional['CleanerAssignment'],
+                         located: bool = True) -> Dict[str, Any]:
+        hosts = self._property_hosts.get(property_id, ())
+        if assignment is None:
+            self._cleaner_bookings.inc('unassigned')
+            self.metrics.record('cleaners_unassigned', 1, hosts)
+            reason = 'No cleaner available before the next guest arrives' if located else 'Property location missing'
+            return {'cleaner_booked': None, 'backup_cleaners': [], 'magic_applied': False, 'needs_human': reason}
+        self._cleaner_assignments[property_id] = assignment
+        self._share({'t': 'cleaner', 'assignment': {
+            **assignment.to_dict(), 'backup_ids': [backup.id for backup in assignment.backups]
+        }})
+        self._cleaner_bookings.inc('booked')
+        self.metrics.record('cleaners_auto_booked', 1, hosts)
+        self.invalidate_dashboard(property_id=property_id)
+        return {
+            **assignment.to_dict(),
+            'cleaning_time': self._friendly_time(assignment.start, date.today()),
+            'magic_applied': True
+        }
+    
+    @staticmethod
+    def _friendly_time(when: datetime, today: date) -> str:
+        """'2:00 PM today' / 'Friday 2:00 PM'"""
+        clock = f"{when:%I:%M %p}".lstrip('0')
+        return f"{clock} today" if when.date() == today else f"{when:%A} {clock}"
+    
+    @timed('webhook.airbnb_message')
+    async def _process_airbnb_message(self, webhook_data: Dict[str, Any]):
+        """Queued Airbnb message webhook - auto-reply or escalate"""
+        await self.auto_handle_guest_message(
+            f"airbnb_{webhook_data.get('message_id', 'unknown')}",
+            webhook_data.get('property_id', 'unknown'),
+            webhook_data.get('message', {}).get('content', '')
+        )
+    
+    @timed('webhook.booking_update')
+    async def _process_booking_update(self, webhook_data: Dict[str, Any]):
+        """
+        Queued booking webhook - checkouts book a cleaner, new bookings
+        go on the calendar and trigger a pricing check, cleaning events
+        update the property's status in place
+        """
+        booking_event = webhook_data.get('event_type', '')
+        property_id = webhook_data.get('property_id', '')
+        
+        if booking_event in ('cleaning_started', 'cleaning_finished'):
+            await self.set_cleaning(property_id, booking_event == 'cleaning_started')
+            return
+        
+        if booking_event == 'checkout':
+            await self.set_cleaning(property_id, True)  # Guests are out - cleaning until the cleaner is done
+        
+        # Booking changes the host's dashboard - drop the cached snapshot
+        self.invalidate_dashboard(host_id=webhook_data.get('host_id'), property_id=property_id)
+        
+        if booking_event == 'checkout':
+            self.auto_book_cleaner(property_id, job_type=webhook_data.get('job_type', 'standard'))
+        
+        elif booking_event == 'new_booking':
+            # Check for pricing opportunities in the background
+            self.refresh_opportunities(host_id=webhook_data.get('host_id'), property_id=property_id)
+            
+            if webhook_data.get('check_in') and webhook_data.get('check_out'):
+                check_in = date.fromisoformat(webhook_data['check_in'])
+                check_out = date.fromisoformat(webhook_data['check_out'])
+                booking = (
+                    property_id,
+                    webhook_data.get('channel', 'airbnb'),
+                    str(webhook_data.get('booking_id', f"{property_id}_{check_in.isoformat()}")),
+                    check_in,
+                    check_out,
+                    webhook_data.get('guest_name', '')
+                )
+                self.sync_booking(*booking)
+                await self.repository.upsert_bookings([booking])  # Idempotent - safe on webhook retries
+    
+    @timed('dashboard.properties')
     async def _get_properties_with_smart_status(self, host_id: str) -> List[Property]:
         """
         Get properties and automatically determine their status
         No manual status updates needed - AI figures it out
         """
-        # In production, this queries your database
-        # For MVP, return smart mock data that demonstrates the magic
+        # One batched query: properties + next arrival + open messages
+        today = date.today()
+        rows = await self.repository.dashboard_rows(host_id, today)
+        if not rows and self.data_source.demo:
+            # Mock data source: nothing stored for this host yet - show the demo portfolio
+            properties = self._demo_properties()
+            stored_arrivals = [None] * len(properties)
+        else:
+            properties = [self._row_to_property(row, today) for row in rows]
+            stored_arrivals = [row.next_check_in for row in rows]
+        
+        # Live channel calendars fill in arrivals the database doesn't have yet
+        for prop, stored_check_in in zip(properties, stored_arrivals):
+            self._apply_next_arrival(prop, today, stored_check_in)
+            self._apply_cleaner_assignment(prop, today)
+        
+        # Auto-detect property status - the engine keeps it (and the host's totals) current from here on.
+        # The demo portfolio's message counts are canned, so its escalations live in the engine only
+        self.status_engine.load_host(host_id, properties, self.calendar_sync.has_conflicts, stored_messages=bool(rows))
         
-        properties = [
+        return properties
+    
+    def _row_to_property(self, row: PropertyRow, today: date) -> Property:
+        return Property(
+            id=row.id,
+            name=row.name,
+            weekly_revenue=row.weekly_revenue,
+            status='good',
+            cleaner_name=row.cleaner_name,
+            cleaning_time=row.cleaning_time,
+            next_guest=(row.next_guest or 'New guest') if row.next_check_in else 'Ready for guests',
+            guest_arrival_time=self._arrival_time(row.id, row.next_check_in, today) if row.next_check_in else '',
+            unhandled_messages=row.unhandled_messages,
+            is_clean=row.is_clean
+        )
+    
+    @staticmethod
+    def _demo_properties() -> List[Property]:
+        """Smart mock data that demonstrates the magic before any real data exists"""
+        return [
             Property(
                 id='1',
                 name='Manhattan Loft',
@@ -116,50 +773,95 @@ class MVPBackendService:
                 is_clean=True
             )
         ]
-        
-        # Auto-detect property status based on conditions
-        for prop in properties:
-            prop.status = self._auto_detect_property_status(prop)
-        
-        return properties
     
-    def _auto_detect_property_status(self, property: Property) -> str:
+    def _apply_next_arrival(self, property: Property, today: date, stored_check_in: Optional[date] = None):
         """
-        Smart status detection - no manual updates needed
+        Fill next_guest / guest_arrival_time from the property's calendar (O(log n))
+        A stored arrival that comes sooner is kept
         """
-        # Critical attention needed (human intervention required)
-        if property.unhandled_messages > 0:
-            return 'needs-attention'
-        
-        # Currently being cleaned
-        if not property.is_clean:
-            return 'cleaning'
-        
-        # Everything good - no action needed
-        return 'good'
+        booking = self.calendar_sync.next_arrival(property.id, today)
+        if booking is None or (stored_check_in is not None and stored_check_in < booking.check_in):
+            return
+        property.next_guest = booking.guest or 'New guest'
+        property.guest_arrival_time = self._arrival_time(property.id, booking.check_in, today)
+    
+    def _arrival_time(self, property_id: str, check_in: date, today: date) -> str:
+        checkin_time = self._get_property_info(property_id).checkin_time
+        return checkin_time if check_in == today else f"{check_in:%a} {checkin_time}"
+    
+    def _apply_cleaner_assignment(self, property: Property, today: date):
+        """Show the booked cleaner until their clean is done"""
+        assignment = self._cleaner_assignments.get(property.id)
+        if assignment is None or assignment.end < datetime.now():
+            return
+        property.cleaner_name = assignment.cleaner.name.split()[0]
+        property.cleaning_time = self._friendly_time(assignment.start, today)
     
+    @timed('opportunities.detect')
     async def _detect_money_opportunities(self, properties: List[Property]) -> Optional[MoneyOpportunity]:
         """
         Auto-detect revenue opportunities from multiple sources
         No manual price research needed - AI does it all
-        """
-        
-        # Event detection (Formula 1, concerts, conferences)
-        event_opportunities = await self._detect_event_opportunities(properties)
-        if event_opportunities:
-            return event_opportunities[0]  # Return best opportunity
-        
-        # Competitor analysis (your prices vs market)
-        competitor_opportunities = await self._detect_competitor_opportunities(properties)
-        if competitor_opportunities:
-            return competitor_opportunities[0]
         
-        # Demand pattern analysis (weekends, holidays)
-        demand_opportunities = await self._detect_demand_opportunities(properties)
-        if demand_opportunities:
-            return demand_opportunities[0]
-        
-        return None  # No opportunities right now
+        All detectors start at once; the highest-priority one that finds
+        something within its deadline wins and lower-priority ones are cancelled
+        """
+        tasks = [
+            asyncio.create_task(self._run_detector(name, detector, deadline, properties))
+            for name, detector, deadline in self.opportunity_detectors
+        ]
+        try:
+            # Await in priority order - lower-priority detectors keep running meanwhile
+            for task in tasks:
+                opportunities = await task
+                if opportunities:
+                    return opportunities[0]  # Return best opportunity
+            return None  # No opportunities right now
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _run_detector(self, name: str, detector, deadline: float,
+                            properties: List[Property]) -> List[MoneyOpportunity]:
+        """
+        Run one detector under its deadline and record how long it took
+        A slow or failing detector just counts as 'nothing found'
+        """
+        stats = self.detector_stats[name]
+        stats['runs'] += 1
+        started = time.perf_counter()
+        outcome = 'errors'
+        try:
+            opportunities = await asyncio.wait_for(detector(properties), deadline)
+            outcome = 'found' if opportunities else 'empty'
+            return opportunities
+        except asyncio.TimeoutError:
+            outcome = 'timeouts'
+            return []
+        except asyncio.CancelledError:
+            outcome = 'cancelled'  # A higher-priority detector already won
+            raise
+        except Exception as e:
+            self.event_log.warning('opportunity.detector_failed', detector=name, error=str(e))
+            return []
+        finally:
+            elapsed = time.perf_counter() - started
+            stats[outcome] += 1
+            stats['latencies_ms'].append(elapsed * 1000)
+            self.spans.record(f'detector.{name}', elapsed)
+    
+    def get_detector_stats(self) -> Dict[str, Any]:
+        """Per-detector outcomes and latency (p50/p95 over recent runs)"""
+        report = {}
+        for name, stats in self.detector_stats.items():
+            latencies = sorted(stats['latencies_ms'])
+            report[name] = {
+                **{k: v for k, v in stats.items() if k != 'latencies_ms'},
+                'p50_ms': round(latencies[len(latencies) // 2], 3) if latencies else None,
+                'p95_ms': round(latencies[int(len(latencies) * 0.95)], 3) if latencies else None,
+            }
+        return report
     
     async def _detect_event_opportunities(self, properties: List[Property]) -> List[MoneyOpportunity]:
         """
@@ -187,24 +889,30 @@ class MVPBackendService:
         """
         Auto-scrape competitor prices and find underpricing opportunities
         """
-        # In production, this scrapes Airbnb/VRBO competitor listings
-        # For MVP, simulate finding pricing opportunities
-        
-        opportunities = []
-        
-        for prop in properties:
-            # Simulate: your price is below market rate
-            if prop.weekly_revenue < 2500:  # Threshold for underpricing
-                opportunities.append(
-                    MoneyOpportunity(
-                        id=f'competitor_{prop.id}',
-                        event=f'💰 {prop.name} Priced Below Market',
-                        extra_money=450.0,
-                        confidence=0.87
-                    )
-                )
+        # CPU-bound on big portfolios - runs in a worker thread, so the detector's
+        # deadline frees the event loop on time (a late analysis finishes in the
+        # background and its result is dropped)
+        return await asyncio.to_thread(self._find_underpriced_properties, properties)
+    
+    def _find_underpriced_properties(self, properties: List[Property]) -> List[MoneyOpportunity]:
+        """Vectorized market comparison - blocking, so never called on the event loop"""
+        # In production, comps are scraped from Airbnb/VRBO competitor listings and
+        # loaded with competitor_pricing.load_comps(). Without comps for a market,
+        # the engine falls back to the MVP rule (under $2,500/week = underpriced).
+        analysis = self.competitor_pricing.analyze(
+            [p.id for p in properties],
+            [p.weekly_revenue for p in properties]
+        )
         
-        return opportunities
+        return [
+            MoneyOpportunity(
+                id=f'competitor_{properties[i].id}',
+                event=f'💰 {properties[i].name} Priced Below Market',
+                extra_money=round(float(analysis.extra_money[i]), 2),
+                confidence=round(float(analysis.confidence[i]), 2)
+            )
+            for i in self.competitor_pricing.underpriced_indices(analysis)
+        ]
     
     async def _detect_demand_opportunities(self, properties: List[Property]) -> List[MoneyOpportunity]:
         """
@@ -228,86 +936,199 @@ class MVPBackendService:
         
         return []
     
+    @timed('pricing.apply')
     async def apply_pricing_optimization(self, opportunity_id: str, properties: List[str]) -> Dict[str, Any]:
         """
         One-click pricing optimization across all platforms
         No forms, no manual work - just applies optimal prices
         """
         
-        # Auto-calculate optimal prices based on opportunity
-        optimization_results = []
-        
-        for prop_id in properties:
-            # In production, this:
-            # 1. Calculates optimal price using AI
-            # 2. Updates Airbnb API
-            # 3. Updates VRBO API  
-            # 4. Updates direct booking sites
-            # 5. Logs the change for tracking
-            
-            result = await self._apply_smart_pricing(prop_id, opportunity_id)
-            optimization_results.append(result)
+        # In production, each property:
+        # 1. Calculates optimal price using AI
+        # 2. Updates Airbnb API
+        # 3. Updates VRBO API  
+        # 4. Updates direct booking sites
+        # 5. Logs the change for tracking
+        # All properties (and all platforms per property) run in parallel
+        report = await self.pricing_fanout.run(
+            properties,
+            lambda prop_id: self._apply_smart_pricing(prop_id, opportunity_id)
+        )
+        # Only a property every platform accepted counts as updated - a rejected
+        # push stays unpublished in its rate calendar and is retried next time
+        optimization_results, rejected, unchanged = [], [], []
+        for result in report.results:
+            if result.get('unchanged'):
+                unchanged.append(result['property_id'])  # Already priced - not another optimization
+                continue
+            self.invalidate_dashboard(property_id=result['property_id'])
+            (rejected if result['platform_errors'] else optimization_results).append(result)
+        for result in optimization_results:
+            hosts = self._property_hosts.get(result['property_id'], ())
+            self._pricing_updates.inc('applied')
+            self._extra_revenue.inc(amount=result['extra_revenue'])
+            self.metrics.record('revenue_optimizations', 1, hosts)
+            self.metrics.record('extra_revenue', result['extra_revenue'], hosts)
+        errors = [{'property_id': e['item'], 'error': e['error']} for e in report.errors] + [
+            {'property_id': r['property_id'], 'error': 'Rejected by ' + ', '.join(sorted(r['platform_errors'])),
+             'platform_errors': r['platform_errors']}
+            for r in rejected
+        ]
+        if errors:
+            self._pricing_updates.inc('failed', amount=len(errors))
+        for error in errors:
+            # Rejected pushes have their own rollup - never counted as optimizations or revenue
+            self.metrics.record('revenue_optimizations_failed', 1, self._property_hosts.get(error['property_id'], ()))
         
         return {
-            'success': True,
-            'properties_updated': len(properties),
+            'success': not errors,
+            'properties_updated': len(optimization_results),
+            'properties_unchanged': unchanged,
             'estimated_extra_revenue': sum(r['extra_revenue'] for r in optimization_results),
             'auto_applied': True,  # No human intervention needed
-            'results': optimization_results
+            'results': optimization_results,
+            'errors': errors,
+            'timing': report.timing()
         }
     
+    @timed('pricing.property')
+    @correlated('property_id', 'opportunity_id')
     async def _apply_smart_pricing(self, property_id: str, opportunity_id: str) -> Dict[str, Any]:
         """
         Apply intelligent pricing for a specific property
+        Updates the nights the opportunity covers, then pushes only what changed
         """
+        from rate_calendar import HORIZON_DAYS
+        
+        today = date.today()
+        weekend_start, weekend_end = self._upcoming_weekend(today)
+        
         # Smart pricing calculation based on opportunity type
         if 'event_f1' in opportunity_id:
-            # Formula 1 event - major price increase justified
+            # Formula 1 event - major price increase justified (event nights only)
             new_price = 400.0
             old_price = 180.0
+            start, end = weekend_start, weekend_end
         elif 'competitor' in opportunity_id:
-            # Competitor analysis - moderate increase to market rate
+            # Competitor analysis - moderate increase to market rate (whole calendar)
             new_price = 220.0
             old_price = 185.0
+            start, end = today, today + timedelta(days=HORIZON_DAYS)
         elif 'demand' in opportunity_id:
-            # Demand spike - smaller increase
+            # Demand spike - smaller increase (weekend nights only)
             new_price = 210.0
             old_price = 190.0
+            start, end = weekend_start, weekend_end
         else:
             # Default optimization
             new_price = 200.0
             old_price = 175.0
+            start, end = today, today + timedelta(days=HORIZON_DAYS)
         
-        # Auto-update across all platforms
-        await self._update_all_platforms(property_id, new_price)
+        calendar = self._get_rate_calendar(property_id, base_price=old_price)
+        old_price = calendar.published_price_on(start)  # A rejected push left its price in the working copy
+        calendar.set_price(start, end, new_price)
+        changes = calendar.diff()
+        if not changes:
+            # The channels already have these prices - nothing to push or count
+            return {
+                'property_id': property_id,
+                'unchanged': True,
+                'old_price': old_price,
+                'new_price': new_price,
+                'extra_revenue': 0.0,
+                'changed_ranges': 0,
+                'platforms_updated': [],
+                'platform_errors': {},
+            }
+        
+        # Auto-update across all platforms (in parallel) - only the changed date ranges
+        platform_results = await self._update_all_platforms(property_id, changes)
+        if all(r.success for r in platform_results):
+            calendar.mark_published()  # Failed pushes are retried with the same delta next time
+            self._share({'t': 'rates', 'property_id': property_id, 'base_price': calendar.base_price,
+                         'changes': [change.to_dict() for change in changes]})
         
         return {
             'property_id': property_id,
             'old_price': old_price,
             'new_price': new_price,
             'extra_revenue': new_price - old_price,
-            'platforms_updated': ['airbnb', 'vrbo', 'direct'],
+            'dates_updated': {'start': start.isoformat(), 'end': end.isoformat()},
+            'changed_ranges': len(changes),
+            'platforms_updated': [r.platform for r in platform_results if r.success],
+            'platform_errors': {r.platform: r.error for r in platform_results if not r.success},
             'updated_at': datetime.now().isoformat()
         }
     
-    async def _update_all_platforms(self, property_id: str, new_price: float):
+    @staticmethod
+    def _upcoming_weekend(today: date) -> tuple:
+        """Friday-Sunday nights of this weekend (or the next one) as [start, end)"""
+        friday = today + timedelta(days=4 - today.weekday())  # In the past if it's already the weekend
+        return max(friday, today), friday + timedelta(days=3)
+    
+    def _get_rate_calendar(self, property_id: str, base_price: float) -> 'RateCalendar':
+        """This property's nightly rate calendar (created on first use)"""
+        calendar = self.rate_calendars.get(property_id)
+        if calendar is None:
+            from rate_calendar import RateCalendar
+            calendar = RateCalendar(property_id, base_price)
+            self.rate_calendars[property_id] = calendar
+        else:
+            calendar.roll_forward(date.today())
+        return calendar
+    
+    def _apply_published_rates(self, message: Dict[str, Any]):
+        """Another worker pushed these nights - our calendar starts from them too"""
+        from rate_calendar import RateChange
+        
+        calendar = self._get_rate_calendar(message['property_id'], base_price=message['base_price'])
+        calendar.apply_published([
+            RateChange(date.fromisoformat(c['start_date']), date.fromisoformat(c['end_date']),
+                       c['nightly_price'], c['min_stay'], c['available'])
+            for c in message['changes']
+        ])
+    
+    @timed('pricing.push_platforms')
+    async def _update_all_platforms(self, property_id: str, changes: List['RateChange']):
         """
         Automatically update pricing across all booking platforms
+        Platforms are updated concurrently - one slow channel doesn't block the others
+        """
+        platform_results = await self.pricing_fanout.push_to_platforms(
+            self.pricing_platforms,
+            lambda platform: self._update_platform(platform, property_id, changes)
+        )
+        self.event_log.emit('pricing.platforms_updated', property_id=property_id, ranges=len(changes),
+                       platforms={r.platform: r.success for r in platform_results},
+                       slowest_ms=round(max((r.elapsed_seconds for r in platform_results), default=0) * 1000, 1))
+        return platform_results
+    
+    async def _update_platform(self, platform: str, property_id: str, changes: List['RateChange']):
         """
-        # In production, this makes API calls to:
+        Push changed rate-calendar ranges to a single booking platform
+        """
+        # In production, this makes an API call to:
         # - Airbnb API (update calendar prices)
         # - VRBO API (update rate calendar)  
         # - Direct booking site (update rates)
-        # - Property management system (sync changes)
-        
-        await asyncio.sleep(0.1)  # Simulate API calls
-        print(f"🤖 Auto-updated property {property_id} to ${new_price}/night across all platforms")
+        if self.channel_client.is_configured(platform):
+            await self.channel_client.request(
+                platform, 'PUT', f'/listings/{property_id}/calendar',
+                json={'rates': [change.to_dict() for change in changes]}
+            )
+        else:
+            await asyncio.sleep(0.1)  # Simulate API call
     
-    async def auto_handle_guest_message(self, message_id: str, property_id: str, message_text: str) -> Dict[str, Any]:
+    @timed('message.handle')
+    @correlated('property_id', 'message_id')
+    async def auto_handle_guest_message(self, message_id: str, property_id: str, message_text: str,
+                                        channel: str = 'airbnb') -> Dict[str, Any]:
         """
         Automatically handle guest messages with AI
         90% auto-response rate - only escalate complex issues
         """
+        started = time.perf_counter()
         
         # Smart message classification (no manual rules needed)
         message_category = self._classify_message(message_text)
@@ -315,18 +1136,25 @@ class MVPBackendService:
         if message_category['auto_respondable']:
             # Auto-generate and send response
             response = self._generate_smart_response(message_category, property_id)
-            await self._send_auto_response(message_id, response)
+            await self._send_auto_response(message_id, response, channel)
+            elapsed = time.perf_counter() - started
+            self._record_message(property_id, True, elapsed)
+            await self._store_messages([(message_id, property_id, MESSAGE_AUTO_REPLIED)])
             
             return {
                 'auto_handled': True,
                 'response_sent': response,
                 'category': message_category['type'],
                 'confidence': message_category['confidence'],
-                'response_time_seconds': 0.3  # Near-instant response
+                'response_time_seconds': round(elapsed, 3)  # Measured: received -> reply sent
             }
         else:
             # Escalate to human with context
             await self._escalate_to_human(message_id, message_category)
+            self._record_message(property_id, False, time.perf_counter() - started)
+            await self._store_messages([(message_id, property_id, MESSAGE_NEEDS_HUMAN)])
+            self.status_engine.message_escalated(property_id, message_id)
+            self._publish_escalation(property_id, message_id, message_category)
             
             return {
                 'auto_handled': False,
@@ -336,127 +1164,200 @@ class MVPBackendService:
                 'priority': message_category.get('priority', 'medium')
             }
     
-    def _classify_message(self, message_text: str) -> Dict[str, Any]:
+    @timed('message.handle_batch')
+    async def auto_handle_guest_messages(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Smart message classification using simple keyword matching
-        In production, this would use an NLP model
+        Handle a whole batch of guest messages at once (e.g. a channel backlog replay)
+        Classifies in one pass, then sends replies and escalations in bulk per channel
         """
-        message_lower = message_text.lower()
+        started = time.perf_counter()
+        categories = self.message_classifier.classify_many([m['message_text'] for m in messages])
         
-        # WiFi questions (very common)
-        if any(word in message_lower for word in ['wifi', 'password', 'internet', 'connection']):
-            return {
-                'type': 'wifi_question',
-                'auto_respondable': True,
-                'confidence': 0.95
-            }
+        results: List[Dict[str, Any]] = [None] * len(messages)
+        replies_by_channel: Dict[str, List[tuple]] = {}
+        escalations: List[tuple] = []
         
-        # Check-in questions (very common)
-        if any(word in message_lower for word in ['check in', 'checkin', 'key', 'access', 'lockbox']):
-            return {
-                'type': 'checkin_question', 
-                'auto_respondable': True,
-                'confidence': 0.92
-            }
+        for index, (message, message_category) in enumerate(zip(messages, categories)):
+            if message_category['auto_respondable']:
+                response = self._generate_smart_response(message_category, message['property_id'])
+                channel = message.get('channel') or 'airbnb'
+                replies_by_channel.setdefault(channel, []).append((index, message['message_id'], response))
+                results[index] = {
+                    'message_id': message['message_id'],
+                    'auto_handled': True,
+                    'response_sent': response,
+                    'category': message_category['type'],
+                    'confidence': message_category['confidence'],
+                    'response_time_seconds': None  # Filled in once the bulk send returns
+                }
+            else:
+                escalations.append((index, message['message_id'], message_category))
+                results[index] = {
+                    'message_id': message['message_id'],
+                    'auto_handled': False,
+                    'escalated_to_human': True,
+                    'escalation_reason': message_category['escalation_reason'],
+                    'suggested_response': message_category.get('suggested_response'),
+                    'priority': message_category.get('priority', 'medium')
+                }
         
-        # Amenities questions (common)
-        if any(word in message_lower for word in ['amenities', 'kitchen', 'towels', 'parking', 'gym']):
-            return {
-                'type': 'amenities_question',
-                'auto_respondable': True, 
-                'confidence': 0.88
-            }
+        # One bulk call per channel chunk - all channels in parallel
+        sends = [
+            (chunk, self._send_auto_responses(channel, [(message_id, response) for _, message_id, response in chunk]))
+            for channel, replies in replies_by_channel.items()
+            for chunk in self._chunks(replies)
+        ]
+        sends += [
+            (chunk, self._escalate_to_human_bulk([(message_id, category) for _, message_id, category in chunk]))
+            for chunk in self._chunks(escalations)
+        ]
+        outcomes = await asyncio.gather(*(send for _, send in sends), return_exceptions=True)
         
-        # Complaints (need human attention)
-        if any(word in message_lower for word in ['problem', 'issue', 'broken', 'dirty', 'complaint']):
-            return {
-                'type': 'complaint',
-                'auto_respondable': False,
-                'escalation_reason': 'Guest complaint detected',
-                'priority': 'high',
-                'suggested_response': 'I apologize for the inconvenience. Let me personally look into this right away.'
-            }
+        for (chunk, _), outcome in zip(sends, outcomes):
+            if isinstance(outcome, BaseException):
+                for index, _, _ in chunk:
+                    # Nothing reached the guest / host - neither a reply nor an escalation
+                    result = results[index]
+                    result['error'] = str(outcome) or type(outcome).__name__
+                    result['auto_handled'] = False
+                    result['escalated_to_human'] = False
+                    result.pop('response_sent', None)
         
-        # Emergency (immediate human attention)
-        if any(word in message_lower for word in ['emergency', 'urgent', 'help', 'stuck', 'locked out']):
-            return {
-                'type': 'emergency',
-                'auto_respondable': False,
-                'escalation_reason': 'Emergency situation detected',
-                'priority': 'critical'
-            }
+        elapsed = time.perf_counter() - started
+        stored = []
+        for message, result, message_category in zip(messages, results, categories):
+            if 'error' not in result:
+                self._record_message(message['property_id'], result['auto_handled'], elapsed)
+                stored.append((message['message_id'], message['property_id'],
+                               MESSAGE_AUTO_REPLIED if result['auto_handled'] else MESSAGE_NEEDS_HUMAN))
+                if result['auto_handled']:
+                    result['response_time_seconds'] = round(elapsed, 3)
+                else:
+                    self.status_engine.message_escalated(message['property_id'], message['message_id'])
+                    self._publish_escalation(message['property_id'], message['message_id'], message_category)
+        await self._store_messages(stored)  # One transaction for the whole batch
         
-        # Default: escalate unclear messages
-        return {
-            'type': 'unclear',
-            'auto_respondable': False,
-            'escalation_reason': 'Message unclear - human review needed',
-            'priority': 'medium'
-        }
+        return results
+    
+    def _record_message(self, property_id: str, auto_handled: bool, seconds: float):
+        self._guest_messages.inc('auto_replied' if auto_handled else 'escalated')
+        self._guest_message_seconds.observe(seconds)
+        self.metrics.record('messages_auto_handled' if auto_handled else 'messages_escalated', 1,
+                            self._property_hosts.get(property_id, ()))
+    
+    async def _store_messages(self, messages: List[tuple]):
+        """Persist (message_id, property_id, status) - the guest already has their reply, so never fail on it"""
+        try:
+            await self.repository.record_messages(messages)
+        except Exception as e:
+            self.event_log.warning('messages.store_failed', count=len(messages), error=str(e) or type(e).__name__)
+    
+    @staticmethod
+    def _chunks(items: List[Any], size: int = 100) -> List[List[Any]]:
+        """Split bulk sends into channel-friendly chunks"""
+        return [items[i:i + size] for i in range(0, len(items), size)]
+    
+    @timed('message.classify')
+    def _classify_message(self, message_text: str) -> Dict[str, Any]:
+        """
+        Smart message classification using simple keyword matching
+        In production, this would use an NLP model
+        """
+        return self.message_classifier.classify(message_text)
     
+    @timed('message.generate_response')
     def _generate_smart_response(self, message_category: Dict[str, Any], property_id: str) -> str:
         """
         Generate contextual auto-responses based on property and message type
         """
-        # In production, this would pull real property details from database
-        property_info = self._get_property_info(property_id)
-        
-        response_templates = {
-            'wifi_question': f"Hi! The WiFi password is: {property_info['wifi_password']}. Network name: {property_info['wifi_network']}. Enjoy your stay! 😊",
-            
-            'checkin_question': f"Welcome! Check-in is at {property_info['checkin_time']}. The lockbox code is: {property_info['lockbox_code']}. Key is inside the black lockbox by the door. Let me know if you need anything! 🗝️",
-            
-            'amenities_question': f"You have access to: {', '.join(property_info['amenities'])}. Everything you need should be there. Have a wonderful stay! 🏠"
-        }
-        
-        return response_templates.get(message_category['type'], 
-                                    "Thanks for your message! I'll get back to you shortly. 😊")
+        # Property details are only loaded when the reply isn't cached yet
+        return self.response_templates.render(
+            message_category['type'], property_id, self._get_property_info
+        )
     
-    def _get_property_info(self, property_id: str) -> Dict[str, Any]:
+    def invalidate_property_info(self, property_id: Optional[str] = None):
+        """
+        Call when property details change so auto-responses stay accurate
+        """
+        self.response_templates.invalidate(property_id)
+    
+    def _get_property_info(self, property_id: str) -> PropertyInfo:
         """
         Get property-specific information for auto-responses
         """
-        # Mock property info - in production, this comes from database
-        property_data = {
-            '1': {  # Manhattan Loft
-                'wifi_password': 'Manhattan2024!',
-                'wifi_network': 'Manhattan_Guest',
-                'checkin_time': '3:00 PM',
-                'lockbox_code': '1234',
-                'amenities': ['Full kitchen', 'Washer/dryer', 'Gym access', 'WiFi', 'AC']
-            },
-            '2': {  # Brooklyn House
-                'wifi_password': 'Brooklyn2024!', 
-                'wifi_network': 'Brooklyn_Guest',
-                'checkin_time': '4:00 PM',
-                'lockbox_code': '5678',
-                'amenities': ['Full kitchen', 'Garden', 'Parking', 'BBQ', 'WiFi']
-            }
-        }
-        
-        return property_data.get(property_id, {
-            'wifi_password': 'Guest2024!',
-            'wifi_network': 'Guest_WiFi',
-            'checkin_time': '3:00 PM',
-            'lockbox_code': 'Contact host',
-            'amenities': ['WiFi', 'Kitchen', 'Basic amenities']
-        })
+        # O(1) indexed lookup - in production, the store is backed by the database
+        return self.property_info.get(property_id)
     
-    async def _send_auto_response(self, message_id: str, response: str):
+    @timed('message.send_reply')
+    async def _send_auto_response(self, message_id: str, response: str, channel: str = 'airbnb'):
         """
-        Automatically send response to guest
+        Automatically send response to guest on the channel the message came from
         """
-        # In production, this sends via Airbnb/VRBO messaging APIs
-        await asyncio.sleep(0.1)  # Simulate API call
-        print(f"🤖 Auto-sent response: {response[:50]}...")
+        # Sends via Airbnb/VRBO messaging APIs when configured
+        if self.channel_client.is_configured(channel):
+            await self.channel_client.request(
+                channel, 'POST', f'/messages/{message_id}/reply',
+                json={'message': response}
+            )
+        else:
+            await asyncio.sleep(0.1)  # Simulate API call
+        self.event_log.emit('message.auto_replied', message_id=message_id, response_chars=len(response))
     
+    @timed('message.escalate')
     async def _escalate_to_human(self, message_id: str, classification: Dict[str, Any]):
         """
         Escalate message to human with AI context
         """
-        # In production, this creates a notification/alert for the host
-        await asyncio.sleep(0.1)  # Simulate notification
-        print(f"🚨 Escalated message {message_id} to human: {classification['escalation_reason']}")
+        # Creates a notification/alert for the host when configured
+        if self.channel_client.is_configured('notifications'):
+            await self.channel_client.request(
+                'notifications', 'POST', '/alerts',
+                json={
+                    'message_id': message_id,
+                    'reason': classification['escalation_reason'],
+                    'priority': classification.get('priority', 'medium')
+                }
+            )
+        else:
+            await asyncio.sleep(0.1)  # Simulate notification
+        self.event_log.emit('message.escalated', message_id=message_id, reason=classification['escalation_reason'],
+                       priority=classification.get('priority', 'medium'))
+    
+    @timed('message.send_replies_bulk')
+    async def _send_auto_responses(self, channel: str, replies: List[tuple]):
+        """
+        Send many auto-responses to one channel in a single bulk call
+        """
+        if self.channel_client.is_configured(channel):
+            await self.channel_client.request(
+                channel, 'POST', '/messages/bulk-reply',
+                json={'replies': [{'message_id': m, 'message': r} for m, r in replies]}
+            )
+        else:
+            await asyncio.sleep(0.1)  # Simulate one bulk API call
+        self.event_log.emit('message.auto_replied_bulk', channel=channel, count=len(replies))
+    
+    @timed('message.escalate_bulk')
+    async def _escalate_to_human_bulk(self, escalations: List[tuple]):
+        """
+        Escalate many messages to the host in one notification batch
+        """
+        if self.channel_client.is_configured('notifications'):
+            await self.channel_client.request(
+                'notifications', 'POST', '/alerts/bulk',
+                json={'alerts': [
+                    {
+                        'message_id': message_id,
+                        'reason': classification['escalation_reason'],
+                        'priority': classification.get('priority', 'medium')
+                    }
+                    for message_id, classification in escalations
+                ]}
+            )
+        else:
+            await asyncio.sleep(0.1)  # Simulate one bulk notification
+        self.event_log.emit('message.escalated_bulk', count=len(escalations),
+                       message_ids=[message_id for message_id, _ in escalations])
     
     def _property_to_dict(self, property: Property) -> Dict[str, Any]:
         """Convert Property object to dictionary for JSON response"""
@@ -489,7 +1390,7 @@ if __name__ == "__main__":
     
     async def demo_mvp_backend():
         """Demo the MVP backend functionality"""
-        service = MVPBackendService()
+        service = MVPBackendService(DATA_SOURCES['mock'])
         
         print("🤖 PropFlow AI MVP Backend Demo")
         print("=" * 50)
@@ -0,0 +1,3 @@
+# PropFlow AI benchmarks - run from the backend directory:
+#   python -m benchmarks.bench_classifier
+#   python -m benchmarks.suite --quick        # Whole-app suite, JSON results
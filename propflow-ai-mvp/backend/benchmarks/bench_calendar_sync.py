@@ -0,0 +1,78 @@
+"""
+Benchmark: double-booking checks over a 5,000-property, 3-year booking history
+Linear rescan of a property's bookings vs the sorted-interval BookingIndex
+
+Run with: python -m benchmarks.bench_calendar_sync
+"""
+
+from datetime import date, timedelta
+import random
+import time
+
+from calendar_sync import Booking, CalendarSync
+
+
+PORTFOLIO_SIZE = 5000
+HISTORY_DAYS = 3 * 365
+CHANNELS = ('airbnb', 'vrbo', 'direct')
+
+
+def synthetic_history(rng: random.Random, property_id: str, start: date):
+    """Back-to-back stays of 2-7 nights with gaps, across all channels"""
+    day = 0
+    while day < HISTORY_DAYS:
+        day += rng.randint(0, 4)
+        nights = rng.randint(2, 7)
+        yield Booking(property_id, rng.choice(CHANNELS), f'{property_id}-{day}',
+                      start + timedelta(days=day), start + timedelta(days=day + nights))
+        day += nights
+
+
+def main(checks: int = 100000):
+    rng = random.Random(7)
+    start = date(2024, 1, 1)
+    sync = CalendarSync(feeds_path='')
+
+    bookings = [b for i in range(PORTFOLIO_SIZE) for b in synthetic_history(rng, str(i), start)]
+    started = time.perf_counter()
+    for booking in bookings:
+        sync.add_booking(booking)
+    load_seconds = time.perf_counter() - started
+
+    # Old approach: rescan every booking the property has ever had
+    by_property = {}
+    for booking in bookings:
+        by_property.setdefault(booking.property_id, []).append(booking)
+
+    print(f"Portfolio: {PORTFOLIO_SIZE:,} properties, {len(bookings):,} bookings over {HISTORY_DAYS // 365} years")
+    print(f"Indexed load (with conflict checks): {load_seconds * 1000:,.0f} ms "
+          f"({len(bookings) / load_seconds:,.0f} inserts/s)")
+
+    # Random dates inside the history (mostly conflicts - the rescan can stop early),
+    # then new bookings for upcoming dates (free nights - the rescan reads everything)
+    for label, offset in (('inside the history', 0), ('upcoming dates', HISTORY_DAYS + 7)):
+        probes = []
+        for _ in range(checks):
+            check_in = start + timedelta(days=offset + rng.randrange(HISTORY_DAYS if not offset else 180))
+            probes.append((str(rng.randrange(PORTFOLIO_SIZE)), check_in, check_in + timedelta(days=rng.randint(1, 7))))
+
+        started = time.perf_counter()
+        linear_conflicts = sum(1 for pid, check_in, check_out in probes
+                               if any(b.check_in < check_out and check_in < b.check_out for b in by_property[pid]))
+        linear_seconds = time.perf_counter() - started
+
+        indexes = sync.indexes
+        started = time.perf_counter()
+        indexed_conflicts = sum(1 for pid, check_in, check_out in probes
+                                if indexes[pid].overlapping(check_in, check_out))
+        indexed_seconds = time.perf_counter() - started
+        assert indexed_conflicts == linear_conflicts
+
+        print(f"{checks:,} overlap checks, {label} ({indexed_conflicts:,} conflicts):")
+        print(f"  linear rescan:  {linear_seconds * 1000:8.1f} ms  ({linear_seconds / checks * 1e6:6.2f} µs/check)")
+        print(f"  interval index: {indexed_seconds * 1000:8.1f} ms  ({indexed_seconds / checks * 1e6:6.2f} µs/check)")
+        print(f"  speedup: {linear_seconds / indexed_seconds:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
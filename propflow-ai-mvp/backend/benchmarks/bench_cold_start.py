@@ -0,0 +1,143 @@
+"""
+Benchmark: cold start of the app - import, server boot and first requests
+What a fresh worker (Railway wake-up, gunicorn respawn) pays before it serves
+
+Each run is a new interpreter. "import main" is the app module plus
+create_app(); "eager" additionally builds every lazy subsystem, which is what
+importing the app used to cost. The server runs boot uvicorn on a scratch
+database and time the first request of each kind - the first to touch a lazy
+subsystem pays for building it. Unconfigured channels simulate each API call
+with a 100 ms sleep, so compare a first request with the second of its kind.
+
+Run with: python -m benchmarks.bench_cold_start [--runs 5] [--data-source real]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.bench_workers import BACKEND_DIR, free_port, seed_host
+
+
+HEAVY_MODULES = ['fastapi', 'httpx', 'numpy', 'cleaner_dispatch', 'competitor_pricing', 'rate_calendar']
+
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+if {eager}:
+    service = main.app.state.backend_service
+    for name in ('message_classifier', 'response_templates', 'property_info', 'cleaner_dispatch', 'competitor_pricing'):
+        getattr(service, name)
+    import httpx, rate_calendar
+built = time.perf_counter()
+print(json.dumps({{'import_ms': (imported - started) * 1000, 'total_ms': (built - started) * 1000,
+                  'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def scratch_env(scratch: str, data_source: str) -> dict:
+    return {
+        **os.environ,
+        'PROPFLOW_DATA_SOURCE': data_source,
+        'PROPFLOW_DATABASE_URL': f"sqlite:///{scratch}/propflow.db",
+        'PROPFLOW_WEBHOOK_QUEUE_PATH': f"{scratch}/webhook_queue.db",
+        'PROPFLOW_EVENT_LOG_PATH': f"{scratch}/events.jsonl",
+    }
+
+
+def probe_import(eager: bool, env: dict) -> dict:
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', IMPORT_PROBE.format(eager=eager, heavy=HEAVY_MODULES)],
+                            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['process_ms'] = (time.perf_counter() - started) * 1000  # Interpreter start to exit
+    return result
+
+
+def probe_server(env: dict, scratch: str) -> dict:
+    asyncio.run(seed_host(f"sqlite:///{scratch}/propflow.db"))  # Real hosts only see what is stored
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=open(f"{scratch}/uvicorn.log", 'wb')
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+            while True:
+                try:
+                    client.get('/').raise_for_status()
+                    break
+                except httpx.TransportError:
+                    if time.perf_counter() - started > 60:
+                        raise RuntimeError(f"uvicorn did not start - see {scratch}/uvicorn.log")
+                    time.sleep(0.01)
+            timings = {'ready_ms': (time.perf_counter() - started) * 1000}
+
+            def timed(name, send):
+                request_started = time.perf_counter()
+                send().raise_for_status()
+                timings[name] = (time.perf_counter() - request_started) * 1000
+
+            timed('first_dashboard_ms', lambda: client.get('/api/dashboard/demo_host'))
+            timed('warm_dashboard_ms', lambda: client.get('/api/dashboard/demo_host'))
+            timed('first_message_ms', lambda: client.post('/api/guest-message', json={
+                'message_id': 'cold-1', 'property_id': '1', 'message_text': "What's the WiFi password?",
+                'guest_name': 'Bench'}))
+            timed('second_message_ms', lambda: client.post('/api/guest-message', json={
+                'message_id': 'cold-2', 'property_id': '1', 'message_text': "What's the WiFi password?",
+                'guest_name': 'Bench'}))
+            timed('first_cleaning_ms', lambda: client.post('/api/cleaning/batch-assign', json={
+                'checkouts': [{'property_id': '1'}]}))
+            timed('first_pricing_ms', lambda: client.post('/api/apply-pricing', json={
+                'opportunity_id': 'event_f1_2024', 'property_ids': ['1']}))
+    finally:
+        process.terminate()
+        process.wait(30)
+    return timings
+
+
+def median(runs: list, key: str) -> float:
+    return statistics.median(run[key] for run in runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--data-source', default='real', choices=['real', 'mock'])
+    args = parser.parse_args()
+
+    lazy, eager, servers = [], [], []
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory() as scratch:
+            env = scratch_env(scratch, args.data_source)
+            lazy.append(probe_import(False, env))
+            eager.append(probe_import(True, env))
+            servers.append(probe_server(env, scratch))
+
+    print(f"Cold start, data source '{args.data_source}' (median of {args.runs} fresh processes)")
+    print(f"  import main (lazy subsystems):    {median(lazy, 'import_ms'):7.1f} ms   "
+          f"interpreter start to exit {median(lazy, 'process_ms'):7.1f} ms")
+    print(f"    loaded: {', '.join(lazy[0]['loaded']) or 'nothing heavy'}")
+    print(f"  import main + every subsystem:    {median(eager, 'total_ms'):7.1f} ms   "
+          f"interpreter start to exit {median(eager, 'process_ms'):7.1f} ms   (the old eager import)")
+    print(f"  uvicorn spawn -> first 200:       {median(servers, 'ready_ms'):7.1f} ms")
+    for key, label in [('first_dashboard_ms', 'first dashboard'), ('warm_dashboard_ms', 'second dashboard'),
+                       ('first_message_ms', 'first guest message'), ('second_message_ms', 'second guest message'),
+                       ('first_cleaning_ms', 'first cleaner booking'),
+                       ('first_pricing_ms', 'first price push')]:
+        print(f"  {label + ':':<34}{median(servers, key):7.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
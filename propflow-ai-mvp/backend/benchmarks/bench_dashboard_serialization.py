@@ -0,0 +1,101 @@
+"""
+Benchmark: dashboard serialization for a 1,000-property host
+Old dict -> Pydantic -> response_model -> JSON path vs one-pass dataclass encoding
+
+The contract - the fast payload equals the old one byte for byte - is
+enforced by tests/test_dashboard_serializer.py, which reuses the builders here.
+
+Run with: python -m benchmarks.bench_dashboard_serialization
+"""
+
+import json
+import time
+
+from pydantic import TypeAdapter
+
+import dashboard_serializer
+from MVP_BackendService import MVPBackendService, Property, MoneyOpportunity, DashboardSnapshot
+from mvp_main import DashboardResponse, PropertyResponse, MoneyOpportunityResponse
+
+
+PORTFOLIO_SIZE = 1000
+
+
+def synthetic_snapshot(size: int) -> DashboardSnapshot:
+    properties = [
+        Property(
+            id=str(i),
+            name=f'Property {i}',
+            weekly_revenue=1500.0 + (i % 40) * 50,
+            status=('good', 'needs-attention', 'cleaning')[i % 3],
+            cleaner_name='Maria' if i % 2 else 'Carlos',
+            cleaning_time='3:00 PM',
+            next_guest='Jake & Sarah',
+            guest_arrival_time='3:00 PM',
+            unhandled_messages=int(i % 3 == 1),
+            is_clean=i % 3 != 2
+        )
+        for i in range(size)
+    ]
+    return DashboardSnapshot(
+        properties=properties,
+        money_opportunity=MoneyOpportunity('event_f1_2024', '🏎️ Formula 1 Race This Weekend!', 2847.0, 0.94),
+        overall_status='needs-attention',
+        total_weekly_revenue=sum(p.weekly_revenue for p in properties),
+        magic_stats={'auto_handled_messages': 47, 'revenue_optimizations': 3, 'bookings_synced': 12}
+    )
+
+
+def legacy_encode(service: MVPBackendService, snapshot: DashboardSnapshot, adapter: TypeAdapter) -> bytes:
+    """What get_dashboard used to do: dicts, models, response_model validation, json.dumps"""
+    properties = [PropertyResponse(**service._property_to_dict(p)) for p in snapshot.properties]
+    opportunity = (MoneyOpportunityResponse(**service._opportunity_to_dict(snapshot.money_opportunity))
+                   if snapshot.money_opportunity else None)
+    response = DashboardResponse(
+        properties=properties,
+        money_opportunity=opportunity,
+        overall_status=snapshot.overall_status,
+        total_weekly_revenue=snapshot.total_weekly_revenue,
+        magic_stats=snapshot.magic_stats
+    )
+    validated = adapter.validate_python(response, from_attributes=True)
+    content = adapter.dump_python(validated, mode='json')
+    return json.dumps(content, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def per_second(fn, rounds: int) -> float:
+    best = 0.0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        best = max(best, 1 / (time.perf_counter() - started))
+    return best
+
+
+def main(rounds: int = 30):
+    service = MVPBackendService()
+    snapshot = synthetic_snapshot(PORTFOLIO_SIZE)
+    adapter = TypeAdapter(DashboardResponse)
+
+    fast_payload = dashboard_serializer.encode_dashboard(snapshot)
+
+    orjson_module = dashboard_serializer.orjson
+    dashboard_serializer.orjson = None
+    try:
+        fallback_rate = per_second(lambda: dashboard_serializer.encode_dashboard(snapshot), rounds)
+    finally:
+        dashboard_serializer.orjson = orjson_module
+
+    legacy_rate = per_second(lambda: legacy_encode(service, snapshot, adapter), rounds)
+    fast_rate = per_second(lambda: dashboard_serializer.encode_dashboard(snapshot), rounds)
+
+    print("📊 Dashboard serialization benchmark")
+    print("=" * 50)
+    print(f"Properties:                {PORTFOLIO_SIZE:,} ({len(fast_payload) / 1024:.0f} KB payload)")
+    print(f"Legacy triple conversion:  {1000 / legacy_rate:.2f} ms")
+    print(f"One-pass ({'orjson' if orjson_module else 'json'}):         {1000 / fast_rate:.2f} ms ({fast_rate / legacy_rate:.1f}x)")
+    print(f"One-pass (json fallback):  {1000 / fallback_rate:.2f} ms ({fallback_rate / legacy_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
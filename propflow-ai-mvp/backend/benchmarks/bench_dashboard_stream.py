@@ -0,0 +1,96 @@
+"""
+Benchmark: pushed dashboard updates for 10k idle connections on one worker
+Memory per open stream, publish cost, fan-out latency and the heartbeat sweep
+
+Each connection is a consumer task iterating the hub's stream generator,
+exactly as StreamingResponse drives it.
+
+Run with: python -m benchmarks.bench_dashboard_stream
+"""
+
+import asyncio
+import time
+import tracemalloc
+
+from dashboard_stream import DashboardStreamHub
+
+
+IDLE_STREAMS = 10_000
+FANOUT = 1_000
+EVENTS = 2_000
+
+DASHBOARD = b'{"properties":[],"money_opportunity":null,"overall_status":"good","total_weekly_revenue":0.0}'
+
+
+async def dashboard() -> bytes:
+    return DASHBOARD
+
+
+async def consume(hub, host_id, received):
+    async for chunk in hub.stream(host_id, dashboard):
+        received.append(time.perf_counter())
+
+
+async def open_streams(hub, host_ids):
+    received = {host_id: [] for host_id in set(host_ids)}
+    tasks = [asyncio.create_task(consume(hub, host_id, received[host_id])) for host_id in host_ids]
+    while sum(len(r) for r in received.values()) < len(host_ids):  # Everyone has the initial dashboard
+        await asyncio.sleep(0.01)
+    return tasks, received
+
+
+async def main():
+    hub = DashboardStreamHub(heartbeat_seconds=3600)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks, received = await open_streams(hub, [f"host_{i}" for i in range(IDLE_STREAMS)])
+    per_stream = (tracemalloc.get_traced_memory()[0] - before) / IDLE_STREAMS
+    tracemalloc.stop()
+    print(f"{IDLE_STREAMS:,} idle streams (one per host): {per_stream / 1024:.1f} KiB each, "
+          f"{len(asyncio.all_tasks()) - 1:,} tasks waiting, no per-stream timers")
+
+    started = time.perf_counter()
+    for i in range(EVENTS):
+        hub.publish('nobody_watching', 'property', {'id': str(i), 'status': 'good'})
+    print(f"  publish to an unwatched host:     {(time.perf_counter() - started) / EVENTS * 1e6:7.2f} µs")
+
+    latencies = []
+    for i in range(EVENTS):
+        target = received[f"host_{i % IDLE_STREAMS}"]
+        count = len(target)
+        sent = time.perf_counter()
+        hub.publish(f"host_{i % IDLE_STREAMS}", 'property', {'id': str(i), 'status': 'needs-attention'})
+        while len(target) == count:
+            await asyncio.sleep(0)
+        latencies.append(target[-1] - sent)
+    latencies.sort()
+    print(f"  one event -> its host's stream:   p50 {latencies[len(latencies) // 2] * 1e6:7.1f} µs   "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:7.1f} µs")
+
+    started = time.perf_counter()
+    for subscribers in hub._subscribers.values():
+        for subscriber in subscribers:
+            subscriber.pending.append(b": ping\n\n")
+            subscriber.wakeup.set()
+    sweep = time.perf_counter() - started
+    await asyncio.sleep(0.5)
+    print(f"  heartbeat sweep over all streams: {sweep * 1000:7.2f} ms")
+
+    fanout_tasks, fanout_received = await open_streams(hub, ['popular_host'] * FANOUT)
+    target = fanout_received['popular_host']
+    count = len(target)
+    sent = time.perf_counter()
+    hub.publish('popular_host', 'opportunity', {'money_opportunity': {'id': 'f1', 'extra_money': 850.0}})
+    while len(target) < count + FANOUT:
+        await asyncio.sleep(0)
+    print(f"  one event -> {FANOUT:,} streams of a host: {(target[-1] - sent) * 1000:7.2f} ms until the last has it "
+          f"(encoded once)")
+
+    await hub.stop()
+    await asyncio.gather(*tasks, *fanout_tasks)
+    print(f"  after stop(): {hub.get_stats()['open_streams']} streams open")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
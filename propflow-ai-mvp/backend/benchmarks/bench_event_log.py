@@ -0,0 +1,97 @@
+"""
+Benchmark: logging cost on the event loop
+print() on every auto-reply vs the queued, sampled JSON-lines event log
+
+Run with: python -m benchmarks.bench_event_log
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+
+from event_log import EventLog, correlate
+
+
+EVENTS = 20000
+SLOW_WRITE_SECONDS = 0.0002  # A busy terminal / log-shipping pipe
+
+
+class SlowSink:
+    """stdout that takes a while to accept each write, like a full pipe"""
+
+    def __init__(self, f):
+        self.f = f
+        self.mode = getattr(f, 'mode', 'w')
+
+    def write(self, data):
+        time.sleep(SLOW_WRITE_SECONDS)
+        return self.f.write(data)
+
+    def flush(self):
+        self.f.flush()
+
+
+async def handle_messages(log_one) -> tuple:
+    """Simulated auto-replies; a ticker measures how long the loop was blocked"""
+    worst_lag = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst_lag
+        while not done:
+            expected = time.perf_counter() + 0.001
+            await asyncio.sleep(0.001)
+            worst_lag = max(worst_lag, time.perf_counter() - expected)
+
+    tick = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    for i in range(EVENTS):
+        with correlate(property_id=str(i % 50), message_id=f"m{i}"):
+            log_one(i)
+        if i % 100 == 0:
+            await asyncio.sleep(0)  # Other requests get a turn
+    loop_seconds = time.perf_counter() - started
+    done = True
+    await tick
+    return loop_seconds, worst_lag
+
+
+def report(label: str, loop_seconds: float, worst_lag: float):
+    print(f"  {label:30s} {loop_seconds / EVENTS * 1e6:8.1f} µs/event on the loop, "
+          f"worst loop stall {worst_lag * 1000:7.1f} ms")
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{EVENTS:,} auto-reply events:")
+        report("no logging (baseline)", *await handle_messages(lambda i: None))
+        for slow in (False, True):
+            label = 'slow stdout' if slow else 'file'
+            with open(os.path.join(tmp, 'print.log'), 'w', buffering=1) as f:
+                sink = SlowSink(f) if slow else f
+
+                def print_one(i):
+                    print(f"🤖 Auto-sent response: Hi! The WiFi password is: Guest2024!. Network ...", file=sink)
+
+                report(f"print() -> {label}", *await handle_messages(print_one))
+
+            with open(os.path.join(tmp, 'events.log'), 'wb') as f:
+                for rate in (1.0, 0.1):
+                    log = EventLog(sink=SlowSink(f) if slow else f, sample_rates={'message.auto_replied': rate})
+
+                    def emit_one(i):
+                        log.emit('message.auto_replied', message_id=f"m{i}", response_chars=71)
+
+                    loop_seconds, worst_lag = await handle_messages(emit_one)
+                    started = time.perf_counter()
+                    await asyncio.to_thread(log.flush)
+                    drain = time.perf_counter() - started
+                    report(f"event log {rate:.0%} -> {label}", loop_seconds, worst_lag)
+                    print(f"  {'':30s} {log.stats['written']:,} written, "
+                          f"{log.stats['sampled_out']:,} sampled out, writer drained in {drain * 1000:.0f} ms more")
+                    log.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+"""
+Benchmark: streaming ingest of a 200 MB synthetic iCal feed
+Whole-file parsing vs the streaming parser, then incremental re-syncs
+
+Run with: python -m benchmarks.bench_ical_ingest [size_mb]
+"""
+
+from datetime import date, timedelta
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from calendar_sync import CalendarSync
+from ical_parser import iter_file_events, ical_date
+
+
+def write_feed(path: str, size_mb: int, bump_every: int = 0) -> int:
+    """Airbnb-style export with folded DESCRIPTION lines; returns the event count"""
+    rng = random.Random(11)
+    day = date(2000, 1, 1)
+    target = size_mb * 1024 * 1024
+    events = 0
+    with open(path, 'w', newline='') as f:
+        f.write('BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Airbnb Inc//Hosting Calendar 1.0//EN\r\n')
+        while f.tell() < target:
+            nights = rng.randint(1, 3)
+            sequence = 1 if bump_every and events % bump_every == 0 else 0
+            f.write(
+                'BEGIN:VEVENT\r\n'
+                f'DTSTAMP:20261001T120000Z\r\n'
+                f'DTSTART;VALUE=DATE:{day:%Y%m%d}\r\n'
+                f'DTEND;VALUE=DATE:{day + timedelta(days=nights):%Y%m%d}\r\n'
+                f'SUMMARY:Reserved - Guest {events}\r\n'
+                f'UID:{events:08d}-{rng.getrandbits(64):016x}@airbnb.com\r\n'
+                f'SEQUENCE:{sequence}\r\n'
+                'DESCRIPTION:Reservation URL: https://www.airbnb.com/hosting/reservations/\r\n'
+                f' details/HM{rng.getrandbits(40):010X}\\nPhone Number (Last 4 Digits): {rng.randint(0, 9999):04d}\r\n'
+                ' \\nGuests: 2 adults\\nNotes: Early check-in requested if possible. Arriving by\r\n'
+                ' train from the airport - please send door code the morning of arrival.\r\n'
+                'END:VEVENT\r\n'
+            )
+            day += timedelta(days=nights)
+            events += 1
+        f.write('END:VCALENDAR\r\n')
+    return events
+
+
+def whole_file_parse(path: str) -> int:
+    """Old approach: read the feed into memory, unfold, split, then parse"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    events, event = [], None
+    for line in text.replace('\n ', '').splitlines():
+        if line == 'BEGIN:VEVENT':
+            event = {}
+        elif line == 'END:VEVENT':
+            events.append((event['UID'], ical_date(event['DTSTART']), ical_date(event['DTEND'])))
+            event = None
+        elif event is not None:
+            name, _, value = line.partition(':')
+            event[name.split(';', 1)[0]] = value
+    return len(events)
+
+
+def measure(fn, *args):
+    """Timed on its own, then run again under tracemalloc for the peak"""
+    started = time.perf_counter()
+    result = fn(*args)
+    seconds = time.perf_counter() - started
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak / 1024
+
+
+def main(size_mb: int = 200):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'feed.ics')
+        events = write_feed(path, size_mb)
+        file_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"Feed: {file_mb:,.0f} MB, {events:,} events")
+
+        streamed, stream_seconds, stream_peak = measure(lambda: sum(1 for _ in iter_file_events(path)))
+        loaded, load_seconds, load_peak = measure(whole_file_parse, path)
+        assert streamed == loaded == events
+        print(f"  whole-file parse: {load_seconds:6.1f} s  peak {load_peak / 1024:8.1f} MB")
+        print(f"  streaming parse:  {stream_seconds:6.1f} s  peak {stream_peak:8.1f} KB  "
+              f"({file_mb / stream_seconds:,.0f} MB/s)")
+
+        # Incremental ingest into the booking index (which holds every booking it keeps)
+        feeds_path = os.path.join(tmp, 'feeds.json')
+        with open(feeds_path, 'w') as f:
+            json.dump([{'property_id': '1', 'channel': 'airbnb', 'url': path}], f)
+        sync = CalendarSync(feeds_path=feeds_path)
+
+        def timed_sync():
+            started = time.perf_counter()
+            result = asyncio.run(sync.sync())
+            return result['bookings_changed'], time.perf_counter() - started
+
+        changed, seconds = timed_sync()
+        print("Ingest:")
+        print(f"  first sync:           {seconds:6.1f} s  {changed:,} bookings written")
+        changed, seconds = timed_sync()
+        print(f"  unchanged file:       {seconds * 1000:6.1f} ms {changed:,} bookings written (stat check)")
+
+        write_feed(path, size_mb, bump_every=100)  # 1% of events get a new SEQUENCE
+        changed, seconds = timed_sync()
+        print(f"  1% SEQUENCE bumps:    {seconds:6.1f} s  {changed:,} bookings written, "
+              f"{sync.stats['events_unchanged']:,} skipped")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
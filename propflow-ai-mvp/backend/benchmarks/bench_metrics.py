@@ -0,0 +1,67 @@
+"""
+Benchmark: magic stats from daily rollups vs rescanning an event history
+Cost of recording an event, and of reading today / this week for one host
+
+Run with: python -m benchmarks.bench_metrics
+"""
+
+from datetime import date
+import random
+import time
+
+from metrics import MetricsRegistry
+
+
+HOSTS = 1000
+EVENTS = 1_000_000  # One week of activity across all hosts
+KINDS = ('messages_auto_handled', 'messages_escalated', 'revenue_optimizations', 'cleaners_auto_booked')
+
+
+def main():
+    rng = random.Random(2)
+    today = date.today().toordinal()
+    events = [(f"host_{rng.randrange(HOSTS)}", rng.choice(KINDS), today - rng.randrange(7))
+              for _ in range(EVENTS)]
+
+    registry = MetricsRegistry()
+    counter = registry.counter('propflow_events_total', 'Events', ('kind',))
+    started = time.perf_counter()
+    for host_id, kind, day in events:
+        counter.inc(kind)
+        registry.record(kind, 1, (host_id,), day)
+    record_us = (time.perf_counter() - started) / EVENTS * 1e6
+    print(f"Recording: {record_us:.2f} µs/event (counter + all-hosts and per-host daily rollups)")
+
+    def rescan(host_id: str):
+        """Old approach: count the host's events from the raw history"""
+        today_totals, week_totals = {}, {}
+        for event_host, kind, day in events:
+            if event_host == host_id:
+                week_totals[kind] = week_totals.get(kind, 0) + 1
+                if day == today:
+                    today_totals[kind] = today_totals.get(kind, 0) + 1
+        return today_totals, week_totals
+
+    host = 'host_7'
+    started = time.perf_counter()
+    scanned = rescan(host)
+    scan_ms = (time.perf_counter() - started) * 1000
+
+    reads = 10000
+    started = time.perf_counter()
+    for _ in range(reads):
+        rolled = (registry.today(host), registry.this_week(host))
+    rollup_us = (time.perf_counter() - started) / reads * 1e6
+    assert rolled == tuple({k: float(v) for k, v in totals.items()} for totals in scanned)
+
+    print(f"Reading today + this week for one host ({EVENTS:,} events in the week):")
+    print(f"  rescan event history: {scan_ms:8.1f} ms")
+    print(f"  daily rollups:        {rollup_us / 1000:8.3f} ms ({scan_ms * 1000 / rollup_us:,.0f}x faster)")
+
+    started = time.perf_counter()
+    text = registry.render_prometheus()
+    print(f"Prometheus exposition: {len(text):,} bytes in {(time.perf_counter() - started) * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: property info lookups with a 10k-property portfolio
+Old build-the-whole-dict-per-call lookup vs the indexed PropertyInfoStore
+
+Run with: python -m benchmarks.bench_property_store
+"""
+
+from typing import Dict, Any
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from property_store import PropertyInfoStore
+
+
+PORTFOLIO_SIZE = 10000
+
+
+def synthetic_record(i: int) -> Dict[str, Any]:
+    return {
+        'name': f'Property {i}',
+        'wifi_password': f'Guest{i:05d}!',
+        'wifi_network': f'Property_{i}_Guest',
+        'checkin_time': '3:00 PM' if i % 2 else '4:00 PM',
+        'lockbox_code': f'{i % 10000:04d}',
+        'amenities': ['Full kitchen', 'WiFi', 'AC'] + (['Parking'] if i % 3 == 0 else [])
+    }
+
+
+def main(lookups: int = 200000):
+    raw = {str(i): synthetic_record(i) for i in range(PORTFOLIO_SIZE)}
+    property_ids = [str(i % PORTFOLIO_SIZE) for i in range(lookups)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'property_info.json')
+        with open(path, 'w') as f:
+            json.dump(raw, f)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        store = PropertyInfoStore(path=path)
+        load_seconds = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        started = time.perf_counter()
+        for pid in property_ids:
+            store.get(pid)
+        indexed_rate = lookups / (time.perf_counter() - started)
+
+        # Old approach: the whole portfolio dict is rebuilt on every lookup
+        legacy_lookups = 200
+        started = time.perf_counter()
+        for pid in property_ids[:legacy_lookups]:
+            {key: dict(value) for key, value in raw.items()}.get(pid)
+        legacy_rate = legacy_lookups / (time.perf_counter() - started)
+
+        # Hot reload with one edited entry
+        raw['42']['wifi_password'] = 'Changed!'
+        with open(path, 'w') as f:
+            json.dump(raw, f)
+        os.utime(path, (time.time() + 1, time.time() + 1))
+        changed = []
+        store.on_change = changed.append
+        started = time.perf_counter()
+        store.reload()
+        reload_seconds = time.perf_counter() - started
+
+    print("🏠 Property info store benchmark")
+    print("=" * 50)
+    print(f"Properties:               {len(store):,}")
+    print(f"Initial load:             {load_seconds * 1000:.1f} ms (peak {peak / 1e6:.1f} MB)")
+    print(f"Legacy dict-per-call:     {legacy_rate:,.0f} lookups/s")
+    print(f"Indexed store:            {indexed_rate:,.0f} lookups/s")
+    print(f"Speed-up:                 {indexed_rate / legacy_rate:,.0f}x")
+    print(f"Hot reload (1 changed):   {reload_seconds * 1000:.1f} ms, changed={changed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: dashboard queries against the repository
+One batched query per dashboard vs one query per property (N+1), by portfolio size
+
+Also checks that a small host's dashboard costs the same whether the
+database holds 1k or 100k other properties.
+
+Run with: python -m benchmarks.bench_repository
+"""
+
+from datetime import date
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+
+from repository import SQLiteRepository
+from seed_db import seed
+
+
+SIZES = (10, 1000, 100_000)
+
+
+def n_plus_one(path: str, host_id: str, today: date) -> int:
+    """The per-property approach: list the host's properties, then two queries each"""
+    connection = sqlite3.connect(path)
+    try:
+        rows = 0
+        for (property_id,) in connection.execute("SELECT id FROM properties WHERE host_id = ?", (host_id,)):
+            connection.execute("SELECT guest, check_in FROM bookings WHERE property_id = ? AND check_in >= ? "
+                               "ORDER BY check_in LIMIT 1", (property_id, today.isoformat())).fetchone()
+            connection.execute("SELECT COUNT(*) FROM messages WHERE property_id = ? AND status = 'needs_human'",
+                               (property_id,)).fetchone()
+            rows += 1
+        return rows
+    finally:
+        connection.close()
+
+
+async def best_of(fn, rounds: int) -> float:
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def main():
+    today = date.today()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        url = f"sqlite:///{path}"
+        repository = SQLiteRepository(path)
+        small_host_ms = {}
+
+        for size in SIZES:
+            await seed(url, f"host_{size}", size)
+            small_host_ms[size] = await best_of(lambda: repository.dashboard_rows('host_10', today), 20)
+
+        print("Dashboard rows per host (best of N):")
+        for size in SIZES:
+            host_id = f"host_{size}"
+            rounds = 20 if size < 100_000 else 3
+            rows = await repository.dashboard_rows(host_id, today)
+            batched = await best_of(lambda: repository.dashboard_rows(host_id, today), rounds)
+            per_property = await best_of(lambda: asyncio.to_thread(n_plus_one, path, host_id, today), rounds)
+            print(f"  {size:>7,} properties: one query {batched:9.2f} ms ({batched * 1000 / len(rows):5.1f} µs/row)   "
+                  f"N+1 {per_property:9.2f} ms ({2 * size + 1:,} queries)")
+
+        print("10-property host as the database grows:")
+        for size, ms in small_host_ms.items():
+            print(f"  after seeding the {size:>7,}-property host: {ms:6.3f} ms")
+
+        # Concurrent dashboards share the bounded pool
+        started = time.perf_counter()
+        await asyncio.gather(*(repository.dashboard_rows('host_1000', today) for _ in range(64)))
+        elapsed = time.perf_counter() - started
+        print(f"64 concurrent 1k-property dashboards: {elapsed * 1000:.0f} ms total, pool {repository.get_stats()}")
+        await repository.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
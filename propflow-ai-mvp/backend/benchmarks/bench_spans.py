@@ -0,0 +1,50 @@
+"""
+Benchmark: cost and accuracy of the latency spans
+Overhead of @spans.timed per call, and histogram percentiles vs exact ones
+
+Run with: python -m benchmarks.bench_spans
+"""
+
+import random
+import time
+
+from spans import LatencyHistogram, SpanRecorder
+
+
+CALLS = 200_000
+SAMPLES = 1_000_000
+
+
+def main():
+    recorder = SpanRecorder()
+
+    def classify(text):
+        return 'wifi' in text
+
+    timed = recorder.timed('message.classify')(classify)
+
+    for label, fn in (('plain call', classify), ('@spans.timed', timed)):
+        started = time.perf_counter()
+        for _ in range(CALLS):
+            fn('what is the wifi password?')
+        print(f"  {label:14s} {(time.perf_counter() - started) / CALLS * 1e6:6.2f} µs/call")
+
+    # Log-normal latencies around 20 ms with a long tail, like a real endpoint
+    rng = random.Random(3)
+    values = sorted(rng.lognormvariate(-4, 1.0) for _ in range(SAMPLES))
+    histogram = LatencyHistogram()
+    started = time.perf_counter()
+    for value in values:
+        histogram.record(value)
+    record_us = (time.perf_counter() - started) / SAMPLES * 1e6
+
+    print(f"Histogram: {record_us:.2f} µs/record, {len(histogram.counts):,} buckets")
+    for pct in (50, 90, 99, 99.9):
+        exact = values[int(SAMPLES * pct / 100) - 1]
+        estimate = histogram.percentile(pct)
+        print(f"  p{pct:<5} exact {exact * 1000:9.3f} ms  histogram {estimate * 1000:9.3f} ms  "
+              f"error {abs(estimate - exact) / exact:6.2%}")
+
+
+if __name__ == '__main__':
+    main()
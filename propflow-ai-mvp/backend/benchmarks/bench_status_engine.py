@@ -0,0 +1,89 @@
+"""
+Benchmark: keeping dashboard status current for a 100k-property host
+Rescan every property per request vs O(1) status-engine updates per event
+
+Run with: python -m benchmarks.bench_status_engine
+"""
+
+import random
+import time
+
+from benchmarks.portfolio import synthetic_properties
+from status_engine import StatusEngine, derive_status, NEEDS_ATTENTION
+
+
+PORTFOLIO_SIZE = 100_000
+EVENTS = 100_000
+
+
+def rescan(properties, conflicts):
+    """What every dashboard request used to do"""
+    for prop in properties:
+        prop.status = derive_status(prop.unhandled_messages, prop.id in conflicts, prop.is_clean)
+    needs_attention = [p for p in properties if p.status == NEEDS_ATTENTION]
+    return ('good' if not needs_attention else NEEDS_ATTENTION), sum(p.weekly_revenue for p in properties)
+
+
+def main():
+    properties = synthetic_properties(PORTFOLIO_SIZE)
+    conflicts = set()
+    rng = random.Random(4)
+
+    started = time.perf_counter()
+    rounds = 5
+    for _ in range(rounds):
+        overall, revenue = rescan(properties, conflicts)
+    rescan_ms = (time.perf_counter() - started) / rounds * 1000
+
+    engine = StatusEngine()
+    started = time.perf_counter()
+    engine.load_host('host', properties, lambda property_id: property_id in conflicts)
+    load_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    engine.load_host('host', properties, lambda property_id: property_id in conflicts)
+    reload_ms = (time.perf_counter() - started) * 1000
+    assert (engine.totals('host').overall_status, round(engine.totals('host').total_weekly_revenue, 2)) == \
+        (overall, round(revenue, 2))
+
+    ids = [p.id for p in properties]
+    events = [(rng.randrange(4), rng.choice(ids)) for _ in range(EVENTS)]
+    started = time.perf_counter()
+    for index, (kind, property_id) in enumerate(events):
+        if kind == 0:
+            engine.message_escalated(property_id, f"msg_{index}")
+        elif kind == 1:
+            engine.messages_resolved(property_id)
+        elif kind == 2:
+            engine.cleaning_changed(property_id, rng.random() < 0.5)
+        else:
+            engine.conflict_changed(property_id, rng.random() < 0.1)
+    event_us = (time.perf_counter() - started) / EVENTS * 1e6
+
+    started = time.perf_counter()
+    for _ in range(10000):
+        totals = engine.totals('host')
+        totals.overall_status, totals.total_weekly_revenue
+    read_us = (time.perf_counter() - started) / 10000 * 1e6
+
+    # The running totals must match a from-scratch recount after all those events
+    by_id = {p.id: p for p in properties}
+    for property_id in ids:
+        state = engine._properties[property_id]
+        by_id[property_id].unhandled_messages, by_id[property_id].is_clean = state.unhandled_messages, state.is_clean
+        if state.has_conflict:
+            conflicts.add(property_id)
+    recount = sum(1 for p in properties if derive_status(p.unhandled_messages, p.id in conflicts, p.is_clean) == NEEDS_ATTENTION)
+    assert recount == engine.totals('host').needs_attention_count
+
+    print(f"{PORTFOLIO_SIZE:,}-property host:")
+    print(f"  rescan per dashboard request:   {rescan_ms:9.2f} ms")
+    print(f"  status engine, one-time load:   {load_ms:9.2f} ms")
+    print(f"  status engine, unchanged reload:{reload_ms:9.2f} ms")
+    print(f"  status engine, per event:       {event_us:9.2f} µs")
+    print(f"  status engine, read totals:     {read_us:9.2f} µs")
+    print(f"  totals after {EVENTS:,} events match a full recount "
+          f"({recount:,} properties need attention)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: webhook acknowledgement latency with a slow downstream
+Processing inline in the handler vs persist-and-acknowledge through the queue
+
+Run with: python -m benchmarks.bench_webhook_ingest
+"""
+
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from webhook_queue import WebhookQueue
+
+
+WEBHOOKS = 2000
+CONCURRENCY = 50         # Webhooks arriving at once
+DUPLICATE_RATE = 0.1     # Channel retries of an event already received
+DOWNSTREAM_SECONDS = (0.02, 0.3)  # Channel send / notification latency
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def webhook_stream():
+    rng = random.Random(5)
+    ids = []
+    for i in range(WEBHOOKS):
+        if ids and rng.random() < DUPLICATE_RATE:
+            yield rng.choice(ids)
+        else:
+            ids.append(f"msg_{i}")
+            yield ids[-1]
+
+
+async def fire(ack, label: str):
+    """CONCURRENCY clients sending webhooks; returns per-webhook ack latencies"""
+    stream = webhook_stream()
+    latencies = []
+
+    async def client():
+        for message_id in stream:
+            started = time.perf_counter()
+            await ack(message_id)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(CONCURRENCY)))
+    seconds = time.perf_counter() - started
+    print(f"  {label:9s} p50 {percentile(latencies, 0.5):7.2f} ms  p99 {percentile(latencies, 0.99):7.2f} ms  "
+          f"({len(latencies) / seconds:,.0f} webhooks/s acknowledged)")
+
+
+async def main():
+    processed = []
+
+    async def downstream(payload):
+        await asyncio.sleep(random.uniform(*DOWNSTREAM_SECONDS))
+        processed.append(payload['message_id'])
+
+    print(f"{WEBHOOKS:,} webhooks, {CONCURRENCY} concurrent, {DUPLICATE_RATE:.0%} retried by the channel:")
+
+    # Old: the handler does the work before responding, duplicates included
+    async def inline_ack(message_id):
+        await downstream({'message_id': message_id})
+
+    await fire(inline_ack, 'inline')
+    inline_processed = len(processed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'queue.db')
+        processed.clear()
+        queue = WebhookQueue({'message': downstream}, path=path, workers=32)
+        queue.start()
+
+        async def queued_ack(message_id):
+            queue.enqueue('message', {'message_id': message_id}, f"message:{message_id}")
+
+        await fire(queued_ack, 'queued')
+        await queue.drain()
+        stats = queue.get_stats()
+        print(f"  processed: inline {inline_processed:,}, queued {len(processed):,} "
+              f"({stats['duplicates']:,} duplicates dropped, lag p99 {stats['processing_lag_ms_p99']:,.0f} ms)")
+        await queue.stop()
+
+        # Restart with work still pending: nothing is lost, nothing runs twice
+        queue = WebhookQueue({'message': downstream}, path=path, workers=32)
+        for i in range(500):
+            queue.enqueue('message', {'message_id': f"late_{i}"}, f"message:late_{i}")
+        queue.close()  # Process died before any worker ran
+        processed.clear()
+        queue = WebhookQueue({'message': downstream}, path=path, workers=32)
+        queue.start()
+        await queue.drain()
+        print(f"  restart: {queue.stats['replayed']:,} pending webhooks replayed, {len(processed):,} processed")
+        await queue.stop()
+        queue.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+"""
+Benchmark: throughput by gunicorn worker count, with shared state
+Dashboard polls and guest messages over real HTTP against 1, 2 ... N workers
+
+Each run starts gunicorn (gunicorn.conf.py) on a scratch database and
+shared-state file, then checks that every worker reports the same totals
+for work done by the others. The load generator runs in this process, so
+on small machines it competes with the workers for CPU.
+
+Run with: python -m benchmarks.bench_workers [--workers 1 2 4] [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.loadgen import run_load
+from repository import create_repository, PropertyRecord
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def seed_host(database_url: str):
+    """Two properties for demo_host - the real data source has no demo fallback"""
+    repository = create_repository(database_url)
+    await repository.start()
+    try:
+        await repository.upsert_properties('demo_host', [PropertyRecord('1', 'Manhattan Loft', 2847.0),
+                                                         PropertyRecord('2', 'Brooklyn House', 1923.0)])
+    finally:
+        await repository.close()
+
+
+def start_server(workers: int, scratch: str, shared_state_url: str) -> tuple:
+    asyncio.run(seed_host(f"sqlite:///{scratch}/propflow.db"))
+    port = free_port()
+    env = {
+        **os.environ,
+        'PORT': str(port),
+        'PROPFLOW_WORKERS': str(workers),
+        'PROPFLOW_SHARED_STATE_URL': shared_state_url or f"sqlite:///{scratch}/shared_state.db",
+        'PROPFLOW_DATABASE_URL': f"sqlite:///{scratch}/propflow.db",
+        'PROPFLOW_WEBHOOK_QUEUE_PATH': f"{scratch}/webhook_queue.db",
+        'PROPFLOW_EVENT_LOG_PATH': f"{scratch}/events.jsonl",
+    }
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f"127.0.0.1:{port}", 'mvp_main:app'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=open(f"{scratch}/gunicorn.log", 'wb')
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/").status_code == 200:
+                return process, port
+        except httpx.TransportError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"gunicorn did not start - see {scratch}/gunicorn.log")
+
+
+async def measure(port: int, workers: int, requests: int, concurrency: int) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+        # Warm every worker's dashboard cache before timing
+        await run_load(client, lambda c, n: c.get('/api/dashboard/demo_host'), workers * 20, concurrency)
+        dashboard = await run_load(client, lambda c, n: c.get('/api/dashboard/demo_host'), requests, concurrency)
+
+        def guest_message(c, n):
+            return c.post('/api/guest-message', json={
+                'message_id': f"bench-{workers}-{n}", 'property_id': str(1 + n % 2),
+                'message_text': 'The heater is broken, I want a refund' if n % 10 == 0 else "What's the WiFi password?",
+                'guest_name': 'Bench'
+            })
+        messages = await run_load(client, guest_message, requests // 4, concurrency)
+
+        # Escalations handled by any worker show up on every worker's dashboard
+        await asyncio.sleep(0.5)
+        views = set()
+        for _ in range(workers * 10):
+            data = (await client.get('/api/dashboard/demo_host')).json()
+            views.add(sum(p['unhandled_messages'] for p in data['properties']))
+        stats = (await client.get('/api/magic-stats')).json()['today_stats']
+    return {'dashboard': dashboard, 'messages': messages, 'views': views,
+            'escalated': stats['messages_escalated'], 'auto_handled': stats['messages_auto_handled']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    cores = multiprocessing.cpu_count()
+    parser.add_argument('--workers', type=int, nargs='+', default=sorted({1, 2, cores}))
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--shared-state-url', default='', help='Default: a scratch SQLite file')
+    args = parser.parse_args()
+
+    print(f"{cores} cores; {args.requests:,} dashboard polls + {args.requests // 4:,} guest messages per run, "
+          f"concurrency {args.concurrency}")
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as scratch:
+            process, port = start_server(workers, scratch, args.shared_state_url)
+            try:
+                result = asyncio.run(measure(port, workers, args.requests, args.concurrency))
+            finally:
+                process.terminate()
+                process.wait(30)
+        dashboard, messages = result['dashboard'], result['messages']
+        print(f"  {workers:>2} workers: dashboard {dashboard['rps']:8.1f} req/s (p99 {dashboard['p99_ms']:7.1f} ms)   "
+              f"guest messages {messages['rps']:7.1f} req/s (p99 {messages['p99_ms']:7.1f} ms)   "
+              f"errors {dashboard['errors'] or messages['errors'] or 0}")
+        print(f"             every worker's dashboard shows {sorted(result['views'])} unhandled; "
+              f"magic-stats: {result['auto_handled']} auto-handled + {result['escalated']} escalated "
+              f"of {args.requests // 4}")
+
+
+if __name__ == '__main__':
+    main()
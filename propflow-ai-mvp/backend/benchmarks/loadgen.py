@@ -0,0 +1,66 @@
+"""
+In-process ASGI load generator
+Drive the FastAPI app at a fixed concurrency - no server, no sockets
+
+Requests go through httpx's ASGITransport straight into the app, so the
+numbers are the app's own cost (routing, validation, service work,
+serialization) without network noise. Latencies land in the same
+HDR-style histogram the service uses for its spans.
+"""
+
+from typing import Any, Awaitable, Callable, Dict
+import asyncio
+import time
+
+import httpx
+
+from spans import LatencyHistogram
+
+
+RequestFactory = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+def asgi_client(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://propflow.bench', timeout=120.0)
+
+
+async def run_load(client: httpx.AsyncClient, make_request: RequestFactory, total: int,
+                   concurrency: int = 16, warmup: int = 0) -> Dict[str, Any]:
+    """
+    Send `total` requests from `concurrency` workers; make_request(client, n)
+    builds request n. Non-2xx responses and exceptions count as errors.
+    """
+    for n in range(warmup):
+        await make_request(client, -1 - n)
+
+    histogram = LatencyHistogram()
+    errors: Dict[str, int] = {}
+    next_request = iter(range(total))
+
+    async def worker():
+        for n in next_request:  # Shared iterator - each request is taken once
+            started = time.perf_counter()
+            try:
+                response = await make_request(client, n)
+                if response.status_code >= 300:
+                    errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+            except Exception as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+            histogram.record(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, max(total, 1)))))
+    elapsed = time.perf_counter() - started
+
+    summary = histogram.summary()
+    return {
+        'requests': total,
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'rps': round(total / elapsed, 1) if elapsed else None,
+        'p50_ms': summary['p50_ms'],
+        'p90_ms': summary['p90_ms'],
+        'p99_ms': summary['p99_ms'],
+        'max_ms': summary['max_ms'],
+        'errors': errors,
+    }
@@ -0,0 +1,75 @@
+"""
+Synthetic host portfolios for the benchmark suite
+Deterministic properties (10 / 1k / 100k per host) served through the real service
+
+install_portfolios() replaces the service's two-property mock with generated
+portfolios for the benchmark hosts only. Everything after the property list
+(calendar arrivals, cleaner assignments, status detection, opportunities,
+caching, serialization) still runs the service's own code.
+"""
+
+from dataclasses import replace
+from datetime import date
+from typing import Dict, List
+import random
+
+from MVP_BackendService import MVPBackendService, Property
+
+
+PORTFOLIO_SIZES = (10, 1000, 100_000)
+
+_NAMES = ('Loft', 'House', 'Studio', 'Villa', 'Cottage', 'Penthouse', 'Cabin', 'Suite')
+_AREAS = ('Manhattan', 'Brooklyn', 'Queens', 'Harlem', 'SoHo', 'Astoria', 'Williamsburg', 'Chelsea')
+_CLEANERS = ('Maria', 'Carlos', 'Ana', 'James', None)
+_GUESTS = ('Jake & Sarah', 'The Millers', 'Priya', 'Tom', 'Ready for guests')
+
+
+def host_id_for(size: int) -> str:
+    return f"bench_{size}"
+
+
+def synthetic_properties(size: int, seed: int = 0) -> List[Property]:
+    """size properties with ids '<size>-<n>' - the same list for the same seed"""
+    rng = random.Random(seed * 1_000_003 + size)
+    properties = []
+    for i in range(size):
+        cleaning = rng.random() < 0.15
+        properties.append(Property(
+            id=f"{size}-{i}",
+            name=f"{rng.choice(_AREAS)} {rng.choice(_NAMES)} {i}",
+            weekly_revenue=float(rng.randrange(800, 4200)),
+            status='good',
+            cleaner_name=rng.choice(_CLEANERS),
+            cleaning_time='3:00 PM' if cleaning else None,
+            next_guest=rng.choice(_GUESTS),
+            guest_arrival_time='4:00 PM',
+            unhandled_messages=int(rng.random() < 0.05),
+            is_clean=not cleaning,
+        ))
+    return properties
+
+
+def install_portfolios(service: MVPBackendService, sizes=PORTFOLIO_SIZES) -> Dict[str, List[Property]]:
+    """
+    Serve a synthetic portfolio for each benchmark host (bench_<size>)
+    Other hosts keep the service's normal data
+    """
+    portfolios = {host_id_for(size): synthetic_properties(size) for size in sizes}
+    original = service._get_properties_with_smart_status
+
+    @service.spans.timed('dashboard.properties')
+    async def properties_with_smart_status(host_id: str) -> List[Property]:
+        portfolio = portfolios.get(host_id)
+        if portfolio is None:
+            return await original(host_id)
+        # Fresh copies each build, like rows coming back from a database
+        properties = [replace(p) for p in portfolio]
+        today = date.today()
+        for prop in properties:
+            service._apply_next_arrival(prop, today)
+            service._apply_cleaner_assignment(prop, today)
+        service.status_engine.load_host(host_id, properties, service.calendar_sync.has_conflicts)
+        return properties
+
+    service._get_properties_with_smart_status = properties_with_smart_status
+    return portfolios
@@ -0,0 +1,285 @@
+"""
+Benchmark suite: microbenchmarks + in-process load against the FastAPI app
+JSON results, optionally compared against a stored baseline
+
+Micro: _classify_message, _generate_smart_response, _property_to_dict.
+Load: /api/dashboard/{host_id} (cached polls and full rebuilds) for synthetic
+10 / 1k / 100k-property portfolios, /api/guest-message, /api/apply-pricing
+and both webhooks, at a configurable concurrency.
+
+Run with: python -m benchmarks.suite [--quick] [--output results.json]
+          python -m benchmarks.suite --save-baseline        # Store this run as the baseline
+          python -m benchmarks.suite --compare              # Exit 1 on regressions vs the baseline
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import asyncio
+import atexit
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+
+# The app's durable state goes to a scratch directory - set before the app is imported
+_SCRATCH = tempfile.mkdtemp(prefix='propflow-bench-')
+atexit.register(shutil.rmtree, _SCRATCH, True)
+os.environ.setdefault('PROPFLOW_WEBHOOK_QUEUE_PATH', os.path.join(_SCRATCH, 'webhook_queue.db'))
+os.environ.setdefault('PROPFLOW_EVENT_LOG_PATH', os.path.join(_SCRATCH, 'events.jsonl'))
+os.environ.setdefault('PROPFLOW_DATABASE_URL', 'sqlite:///' + os.path.join(_SCRATCH, 'propflow.db'))
+
+from benchmarks.loadgen import asgi_client, run_load  # noqa: E402
+from benchmarks.portfolio import PORTFOLIO_SIZES, host_id_for, install_portfolios, synthetic_properties  # noqa: E402
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+DEFAULT_OUTPUT = os.path.join(RESULTS_DIR, 'latest.json')
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, 'baseline.json')
+
+# Which numbers are compared against the baseline, and which direction is better
+COMPARED = {'us_per_op': 'lower', 'rps': 'higher', 'p50_ms': 'lower', 'p99_ms': 'lower'}
+
+SAMPLE_MESSAGES = [
+    "What's the WiFi password?",
+    "How do I check in?",
+    "Is there parking near the house?",
+    "The air conditioning isn't working properly",
+    "Help! I'm locked out",
+    "Can you recommend restaurants nearby?",
+    "We will arrive around 6pm, is that ok? Also do you have towels?",
+]
+
+
+# ===== MICROBENCHMARKS =====
+
+def _time_per_op(fn: Callable[[int], Any], ops: int, rounds: int) -> Dict[str, Any]:
+    """Best round's µs per call - steadier on a noisy machine than the mean"""
+    per_round = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for i in range(ops):
+            fn(i)
+        per_round.append((time.perf_counter() - started) / ops * 1e6)
+    return {'us_per_op': round(min(per_round), 3), 'us_per_op_median': round(sorted(per_round)[rounds // 2], 3),
+            'ops': ops, 'rounds': rounds}
+
+
+def run_micro(service, ops: int, rounds: int) -> Dict[str, Dict[str, Any]]:
+    messages = SAMPLE_MESSAGES
+    classifications = [service._classify_message(m) for m in messages]
+    properties = synthetic_properties(1000)
+    property_ids = [p.id for p in properties]
+
+    return {
+        'micro.classify_message': _time_per_op(
+            lambda i: service._classify_message(messages[i % len(messages)]), ops, rounds),
+        'micro.generate_smart_response': _time_per_op(
+            lambda i: service._generate_smart_response(classifications[i % len(classifications)],
+                                                       property_ids[i % len(property_ids)]), ops, rounds),
+        'micro.property_to_dict': _time_per_op(
+            lambda i: service._property_to_dict(properties[i % len(properties)]), ops, rounds),
+    }
+
+
+# ===== LOAD =====
+
+async def run_loads(app, service, sizes: List[int], requests: int, concurrency: int) -> Dict[str, Dict[str, Any]]:
+    install_portfolios(service, sizes)
+    results: Dict[str, Dict[str, Any]] = {}
+    await service.startup()
+    try:
+        async with asgi_client(app) as client:
+            for size in sizes:
+                host_id = host_id_for(size)
+
+                async def dashboard(client, n, host_id=host_id):
+                    return await client.get(f'/api/dashboard/{host_id}')
+
+                async def dashboard_rebuild(client, n, host_id=host_id):
+                    service.invalidate_dashboard(host_id=host_id)
+                    return await client.get(f'/api/dashboard/{host_id}')
+
+                results[f'load.dashboard.{size}'] = await run_load(
+                    client, dashboard, requests, concurrency, warmup=1)
+                # Rebuilds are measured one at a time; fewer of them for big portfolios
+                rebuilds = max(5, min(requests, 200_000 // size))
+                results[f'load.dashboard_rebuild.{size}'] = await run_load(
+                    client, dashboard_rebuild, rebuilds, 1, warmup=1)
+                print(f"  dashboard {size:>7,} properties done", file=sys.stderr)
+
+            property_ids = [p.id for p in synthetic_properties(1000)]
+            run_id = int(time.time() * 1000)
+
+            async def guest_message(client, n):
+                return await client.post('/api/guest-message', json={
+                    'message_id': f'bench_{run_id}_{n}',
+                    'property_id': property_ids[n % len(property_ids)],
+                    'message_text': SAMPLE_MESSAGES[n % len(SAMPLE_MESSAGES)],
+                    'guest_name': 'Bench Guest',
+                })
+
+            async def apply_pricing(client, n):
+                start = (n * 10) % len(property_ids)
+                return await client.post('/api/apply-pricing', json={
+                    'opportunity_id': 'competitor_market_rate',
+                    'property_ids': property_ids[start:start + 10],
+                })
+
+            async def airbnb_webhook(client, n):
+                return await client.post('/api/webhooks/airbnb-message', json={
+                    'message_id': f'bench_{run_id}_{n}',
+                    'property_id': property_ids[n % len(property_ids)],
+                    'message': {'content': SAMPLE_MESSAGES[n % len(SAMPLE_MESSAGES)]},
+                })
+
+            check_in = date.today() + timedelta(days=30)
+
+            async def booking_webhook(client, n):
+                stay = check_in + timedelta(days=(n // len(property_ids)) * 3)
+                return await client.post('/api/webhooks/booking-update', json={
+                    'event_id': f'bench_{run_id}_{n}',
+                    'event_type': 'new_booking',
+                    'property_id': property_ids[n % len(property_ids)],
+                    'check_in': stay.isoformat(),
+                    'check_out': (stay + timedelta(days=2)).isoformat(),
+                    'guest_name': 'Bench Guest',
+                })
+
+            for name, make_request in (('guest_message', guest_message), ('apply_pricing', apply_pricing),
+                                       ('webhook_airbnb_message', airbnb_webhook),
+                                       ('webhook_booking_update', booking_webhook)):
+                results[f'load.{name}'] = await run_load(client, make_request, requests, concurrency)
+                print(f"  {name} done", file=sys.stderr)
+
+            # Let the webhook workers finish what the load left behind
+            await asyncio.wait_for(service.webhook_queue.drain(), timeout=120)
+    finally:
+        await service.shutdown()
+    return results
+
+
+# ===== RESULTS =====
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Every compared number that got worse than the baseline by more than threshold (0.1 = 10%)"""
+    regressions = []
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        for metric, better in COMPARED.items():
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change > threshold) if better == 'lower' else (change < -threshold):
+                regressions.append({'benchmark': name, 'metric': metric, 'baseline': old,
+                                    'current': new, 'change': round(change, 3)})
+    return regressions
+
+
+def print_table(results: Dict[str, Dict[str, Any]], baseline: Optional[Dict[str, Any]]):
+    before = baseline['results'] if baseline else {}
+    for name, result in results.items():
+        shown = []
+        for metric in COMPARED:
+            if metric in result and result[metric] is not None:
+                text = f"{metric}={result[metric]}"
+                old = before.get(name, {}).get(metric)
+                if old:
+                    text += f" ({(result[metric] - old) / old:+.0%})"
+                shown.append(text)
+        if result.get('errors'):
+            shown.append(f"errors={result['errors']}")
+        print(f"  {name:36s} {'  '.join(shown)}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(str(s) for s in PORTFOLIO_SIZES),
+                        help='Portfolio sizes for the dashboard load (comma separated)')
+    parser.add_argument('--requests', type=int, default=500, help='Requests per load scenario')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--ops', type=int, default=20000, help='Calls per microbenchmark round')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--only', choices=('micro', 'load'))
+    parser.add_argument('--quick', action='store_true', help='10 and 1k portfolios, fewer requests')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="JSON results path ('-' for stdout)")
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, metavar='PATH')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, metavar='PATH')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed slowdown before failing (0.2 = 20%%)')
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    if args.quick:
+        sizes = [s for s in sizes if s <= 1000]
+        args.requests, args.ops, args.rounds = min(args.requests, 200), min(args.ops, 5000), min(args.rounds, 3)
+
+    from mvp_main import app
+    backend_service = app.state.backend_service
+
+    results: Dict[str, Dict[str, Any]] = {}
+    if args.only != 'load':
+        print("Microbenchmarks...", file=sys.stderr)
+        results.update(run_micro(backend_service, args.ops, args.rounds))
+    if args.only != 'micro':
+        print(f"Load (concurrency {args.concurrency}, {args.requests} requests per scenario)...", file=sys.stderr)
+        results.update(asyncio.run(run_loads(app, backend_service, sizes, args.requests, args.concurrency)))
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'config': {'sizes': sizes, 'requests': args.requests, 'concurrency': args.concurrency,
+                       'ops': args.ops, 'rounds': args.rounds, 'only': args.only},
+        },
+        'results': results,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        report['baseline'] = {'path': args.compare, 'git_commit': baseline['meta'].get('git_commit')}
+        report['regressions'] = compare(report, baseline, args.threshold)
+
+    print_table(results, baseline)
+
+    encoded = json.dumps(report, indent=2)
+    targets = [args.output] + ([args.save_baseline] if args.save_baseline else [])
+    for path in targets:
+        if path == '-':
+            print(encoded)
+            continue
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(encoded + '\n')
+        print(f"Results written to {path}", file=sys.stderr)
+
+    if report.get('regressions'):
+        print(f"{len(report['regressions'])} regression(s) beyond {args.threshold:.0%}:", file=sys.stderr)
+        for r in report['regressions']:
+            print(f"  {r['benchmark']} {r['metric']}: {r['baseline']} -> {r['current']} ({r['change']:+.0%})",
+                  file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,444 @@
+"""
+PropFlow AI Calendar Sync
+Channel calendars merged into one booking index per property - double bookings caught on insert
+
+Bookings from the Airbnb, VRBO and direct iCal feeds go into a sorted interval
+index per property. Every insert finds its overlaps with two binary searches,
+so a conflict check stays O(log n) however long the booking history gets.
+A reservation reported by both a booking webhook and the channel's feed is
+kept once - same channel and dates under another id is an alias, not a clash.
+Feeds are only re-read when their ETag or content hash changes, are streamed
+event by event, and only events with a new SEQUENCE or dates are applied.
+httpx is imported with the first HTTP feed - file feeds never need it.
+"""
+
+from typing import TYPE_CHECKING, Dict, Any, Callable, Iterable, List, Optional, Tuple
+from dataclasses import dataclass
+from datetime import date
+from bisect import bisect_left, bisect_right
+from itertools import islice
+import asyncio
+import hashlib
+import json
+import os
+
+from event_log import EventLog, event_log
+from ical_parser import CalendarEvent, aiter_events, iter_file_events
+
+if TYPE_CHECKING:
+    import httpx
+
+
+DEFAULT_FEEDS_PATH = os.environ.get(
+    'PROPFLOW_CALENDAR_FEEDS_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'calendar_feeds.json')
+)
+
+
+@dataclass
+class Booking:
+    property_id: str
+    channel: str     # 'airbnb', 'vrbo', 'direct'
+    uid: str         # Channel's booking / iCal event id
+    check_in: date
+    check_out: date  # Checkout day - free for the next guest
+    summary: str = ''
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.channel, self.uid)
+
+    @property
+    def guest(self) -> str:
+        """Guest name from summaries like 'Reserved - Jake & Sarah' (often absent)"""
+        _, separator, name = self.summary.partition(' - ')
+        return name if separator else ''
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'channel': self.channel,
+            'uid': self.uid,
+            'check_in': self.check_in.isoformat(),
+            'check_out': self.check_out.isoformat(),
+            'summary': self.summary,
+        }
+
+
+@dataclass
+class BookingConflict:
+    booking: Booking
+    overlaps: List[Booking]  # Bookings already holding those nights
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'property_id': self.booking.property_id,
+            'booking': self.booking.to_dict(),
+            'overlaps': [b.to_dict() for b in self.overlaps],
+        }
+
+
+@dataclass
+class CalendarFeed:
+    property_id: str
+    channel: str
+    url: str  # http(s) URL or local .ics path
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.property_id, self.channel)
+
+
+class BookingIndex:
+    """
+    One property's bookings as disjoint [check_in, check_out) intervals
+    Sorted by check_in (and so by check_out too) - overlaps are a bisect away.
+    Lookups and conflict checks are O(log n); an insert or removal also shifts
+    the sorted lists, an O(n) memmove that stays cheap at a property's few
+    hundred bookings
+    """
+
+    def __init__(self):
+        self._starts: List[date] = []
+        self._ends: List[date] = []
+        self._bookings: List[Booking] = []
+        self._by_key: Dict[Tuple[str, str], Booking] = {}
+        self._aliases: Dict[Tuple[str, str], Tuple[str, str]] = {}  # Other source's key -> indexed booking's key
+        self.conflicts: Dict[Tuple[str, str], BookingConflict] = {}
+
+    def __len__(self) -> int:
+        return len(self._bookings) + len(self.conflicts)
+
+    def get(self, key: Tuple[str, str]) -> Optional[Booking]:
+        conflict = self.conflicts.get(key)
+        return conflict.booking if conflict is not None else self._by_key.get(self._aliases.get(key, key))
+
+    def next_arrival(self, day: date) -> Optional[Booking]:
+        """First booking checking in on or after day"""
+        position = bisect_left(self._starts, day)
+        return self._bookings[position] if position < len(self._bookings) else None
+
+    def overlapping(self, check_in: date, check_out: date) -> List[Booking]:
+        """Bookings holding any night in [check_in, check_out)"""
+        first = bisect_right(self._ends, check_in)
+        last = bisect_left(self._starts, check_out, lo=first)
+        return self._bookings[first:last]
+
+    def add(self, booking: Booking) -> List[Booking]:
+        """
+        Insert a booking; returns the bookings it overlaps (empty = no conflict)
+        Overlapping bookings are held as conflicts until the other side goes away
+        """
+        if booking.check_out <= booking.check_in:
+            raise ValueError(f"Booking {booking.uid} checks out on or before check-in")
+        overlaps = self.overlapping(booking.check_in, booking.check_out)
+        for other in overlaps:
+            if (other.channel, other.check_in, other.check_out) == (booking.channel, booking.check_in, booking.check_out):
+                # The same reservation from its other source (webhook booking id vs feed UID)
+                if other.key != booking.key:
+                    self._aliases[booking.key] = other.key
+                return []
+        if overlaps:
+            self.conflicts[booking.key] = BookingConflict(booking, overlaps)
+            return overlaps
+
+        position = bisect_left(self._starts, booking.check_in)
+        self._starts.insert(position, booking.check_in)
+        self._ends.insert(position, booking.check_out)
+        self._bookings.insert(position, booking)
+        self._by_key[booking.key] = booking
+        return []
+
+    def remove(self, key: Tuple[str, str]) -> Optional[Booking]:
+        """
+        Drop a booking (cancelled or moved) by any of its keys; waiting conflicts may now fit
+        The reservation goes as a whole - a source that still has it re-adds it when it changes
+        """
+        conflict = self.conflicts.pop(key, None)
+        if conflict is not None:
+            return conflict.booking
+
+        key = self._aliases.pop(key, key)
+        booking = self._by_key.pop(key, None)
+        if booking is None:
+            return None
+        if self._aliases:
+            for alias in [alias for alias, target in self._aliases.items() if target == key]:
+                del self._aliases[alias]
+        # Find this exact booking, not just the first one starting that day
+        position = bisect_left(self._starts, booking.check_in)
+        while self._bookings[position] is not booking:
+            position += 1
+        del self._starts[position], self._ends[position], self._bookings[position]
+
+        # Nights were freed - retry anything that was waiting on them
+        waiting = sorted(self.conflicts.values(), key=lambda c: c.booking.check_in)
+        self.conflicts.clear()
+        for pending in waiting:
+            self.add(pending.booking)
+        return booking
+
+
+class CalendarSync:
+    """
+    property_id -> BookingIndex, fed by channel iCal feeds and booking webhooks
+    on_change(property_id) fires whenever a property's bookings change
+    """
+
+    def __init__(self,
+                 feeds_path: str = DEFAULT_FEEDS_PATH,
+                 on_change: Optional[Callable[[str], None]] = None,
+                 transport: Optional['httpx.AsyncBaseTransport'] = None,
+                 timeout: float = 10.0,
+                 event_log: EventLog = event_log):
+        self.on_change = on_change
+        self.transport = transport
+        self.timeout = timeout
+        self.event_log = event_log
+        self.indexes: Dict[str, BookingIndex] = {}
+        self.feeds: List[CalendarFeed] = self._load_feeds(feeds_path)
+
+        # Per feed: last ETag, file stat + content hash, and uid -> (SEQUENCE, dates) of its events
+        self._etags: Dict[Tuple[str, str], str] = {}
+        self._file_stats: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self._hashes: Dict[Tuple[str, str], str] = {}
+        self._feed_events: Dict[Tuple[str, str], Dict[str, Tuple[int, date, date]]] = {}
+
+        self._client: Optional['httpx.AsyncClient'] = None
+        self._sync_task: Optional[asyncio.Task] = None
+        self.stats = {'syncs': 0, 'feeds_fetched': 0, 'feeds_unchanged': 0, 'events_unchanged': 0,
+                      'bookings_added': 0, 'bookings_updated': 0, 'bookings_removed': 0, 'bookings_rejected': 0,
+                      'conflicts_detected': 0, 'errors': 0}
+
+    @staticmethod
+    def _load_feeds(path: str) -> List[CalendarFeed]:
+        """Feed list from JSON - relative .ics paths resolve next to the file"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                raw = json.load(f)
+        except FileNotFoundError:
+            return []
+        base = os.path.dirname(os.path.abspath(path))
+        feeds = []
+        for entry in raw:
+            url = entry['url']
+            if '://' not in url and not os.path.isabs(url):
+                url = os.path.join(base, url)
+            feeds.append(CalendarFeed(str(entry['property_id']), entry['channel'], url))
+        return feeds
+
+    def _index(self, property_id: str) -> BookingIndex:
+        index = self.indexes.get(property_id)
+        if index is None:
+            index = self.indexes[property_id] = BookingIndex()
+        return index
+
+    def booking_count(self, property_id: str) -> int:
+        index = self.indexes.get(property_id)
+        return len(index) if index is not None else 0
+
+    def next_arrival(self, property_id: str, day: date) -> Optional[Booking]:
+        index = self.indexes.get(property_id)
+        return index.next_arrival(day) if index is not None else None
+
+    def has_conflicts(self, property_id: str) -> bool:
+        index = self.indexes.get(property_id)
+        return index is not None and bool(index.conflicts)
+
+    def get_conflicts(self, property_id: Optional[str] = None) -> List[BookingConflict]:
+        indexes = [self.indexes.get(property_id)] if property_id is not None else list(self.indexes.values())
+        return [conflict for index in indexes if index is not None for conflict in index.conflicts.values()]
+
+    def add_booking(self, booking: Booking) -> List[Booking]:
+        """
+        Insert or move one booking (feeds and booking webhooks)
+        Returns the bookings it double-books, if any
+        """
+        if booking.check_out <= booking.check_in:
+            # An empty or inverted stay would break the index's sort order - skip it
+            self.stats['bookings_rejected'] += 1
+            self.event_log.warning('calendar.invalid_booking', property_id=booking.property_id, channel=booking.channel,
+                              uid=booking.uid, check_in=booking.check_in, check_out=booking.check_out)
+            return []
+        index = self._index(booking.property_id)
+        existing = index.get(booking.key)
+        if existing is not None:
+            if existing == booking or (existing.key != booking.key and (existing.check_in, existing.check_out)
+                                       == (booking.check_in, booking.check_out)):
+                return []  # Unchanged - or unchanged as reported by the reservation's other source
+            index.remove(booking.key)
+            self.stats['bookings_updated'] += 1
+        else:
+            self.stats['bookings_added'] += 1
+
+        overlaps = index.add(booking)
+        if overlaps:
+            self.stats['conflicts_detected'] += 1
+            self.event_log.warning('calendar.double_booking', property_id=booking.property_id,
+                              channel=booking.channel, check_in=booking.check_in, check_out=booking.check_out,
+                              conflicts_with=[b.uid for b in overlaps])
+        if self.on_change is not None:
+            self.on_change(booking.property_id)
+        return overlaps
+
+    def remove_booking(self, property_id: str, channel: str, uid: str) -> Optional[Booking]:
+        index = self.indexes.get(property_id)
+        booking = index.remove((channel, uid)) if index is not None else None
+        if booking is not None:
+            self.stats['bookings_removed'] += 1
+            if self.on_change is not None:
+                self.on_change(property_id)
+        return booking
+
+    def apply_feed(self, feed: CalendarFeed, events: Iterable[CalendarEvent]) -> int:
+        """
+        Apply a feed's current events as a diff against its previous contents
+        Returns how many bookings were added, moved or removed
+        """
+        previous = self._feed_events.get(feed.key, {})
+        current: Dict[str, Tuple[int, date, date]] = {}
+        changed = sum(self._apply_event(feed, previous, current, event) for event in events)
+        return changed + self._finish_feed(feed, previous, current)
+
+    def _apply_event(self, feed: CalendarFeed, previous: Dict[str, Tuple[int, date, date]],
+                     current: Dict[str, Tuple[int, date, date]], event: CalendarEvent) -> bool:
+        if event.cancelled or event.dtend <= event.dtstart:
+            return False  # Missing from current -> removed when the feed finishes
+        # SEQUENCE alone isn't trusted - some channels export every event as SEQUENCE:0
+        fingerprint = (event.sequence, event.dtstart, event.dtend)
+        current[event.uid] = fingerprint
+        if previous.get(event.uid) == fingerprint:
+            self.stats['events_unchanged'] += 1
+            return False
+        self.add_booking(Booking(feed.property_id, feed.channel, event.uid,
+                                 event.dtstart, event.dtend, event.summary))
+        return True
+
+    def _finish_feed(self, feed: CalendarFeed, previous: Dict[str, Tuple[int, date, date]],
+                     current: Dict[str, Tuple[int, date, date]]) -> int:
+        removed = previous.keys() - current.keys()
+        for uid in removed:
+            self.remove_booking(feed.property_id, feed.channel, uid)
+        self._feed_events[feed.key] = current
+        return len(removed)
+
+    def _file_fingerprint(self, feed: CalendarFeed, path: str) -> Optional[Tuple[Tuple[int, int], str]]:
+        """
+        (stat, content hash) if the file changed since the last sync, else None
+        Cheap stat check first, then a chunked hash - runs in a worker thread
+        """
+        stat = os.stat(path)
+        file_stat = (stat.st_mtime_ns, stat.st_size)
+        if self._file_stats.get(feed.key) == file_stat:
+            return None
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        if self._hashes.get(feed.key) == digest.hexdigest():
+            self._file_stats[feed.key] = file_stat  # Touched, not edited
+            return None
+        return file_stat, digest.hexdigest()
+
+    async def _sync_file_feed(self, feed: CalendarFeed, path: str, batch_size: int = 2000) -> Optional[int]:
+        fingerprint = await asyncio.to_thread(self._file_fingerprint, feed, path)
+        if fingerprint is None:
+            return None
+        # Parse in a worker thread a batch at a time; apply on the event loop
+        events = iter_file_events(path)
+        previous = self._feed_events.get(feed.key, {})
+        current: Dict[str, Tuple[int, date, date]] = {}
+        changed = 0
+        while True:
+            batch = await asyncio.to_thread(list, islice(events, batch_size))
+            if not batch:
+                break
+            changed += sum(self._apply_event(feed, previous, current, event) for event in batch)
+        changed += self._finish_feed(feed, previous, current)
+        # Only remembered once fully applied - a failed read is retried next sync
+        self._file_stats[feed.key], self._hashes[feed.key] = fingerprint
+        return changed
+
+    async def _sync_http_feed(self, feed: CalendarFeed) -> Optional[int]:
+        import httpx
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout, transport=self.transport)
+        headers = {'If-None-Match': self._etags[feed.key]} if feed.key in self._etags else {}
+        async with self._client.stream('GET', feed.url, headers=headers) as response:
+            if response.status_code == 304:
+                return None
+            response.raise_for_status()
+            # Streamed straight off the socket; unchanged events are skipped as they arrive
+            previous = self._feed_events.get(feed.key, {})
+            current: Dict[str, Tuple[int, date, date]] = {}
+            changed = 0
+            async for event in aiter_events(response.aiter_lines()):
+                changed += self._apply_event(feed, previous, current, event)
+            changed += self._finish_feed(feed, previous, current)
+            if response.headers.get('ETag'):
+                self._etags[feed.key] = response.headers['ETag']
+        return changed
+
+    async def _sync_feed(self, feed: CalendarFeed) -> int:
+        remote = '://' in feed.url and not feed.url.startswith('file://')
+        if remote:
+            import httpx
+            skippable = (OSError, httpx.HTTPError)
+        else:
+            skippable = (OSError,)
+        try:
+            if remote:
+                changed = await self._sync_http_feed(feed)
+            else:
+                path = feed.url[len('file://'):] if feed.url.startswith('file://') else feed.url
+                changed = await self._sync_file_feed(feed, path)
+        except skippable as e:
+            self.stats['errors'] += 1
+            self.event_log.warning('calendar.feed_skipped', property_id=feed.property_id, channel=feed.channel, error=str(e))
+            return 0
+        if changed is None:
+            self.stats['feeds_unchanged'] += 1
+            return 0
+        self.stats['feeds_fetched'] += 1
+        return changed
+
+    async def sync(self) -> Dict[str, Any]:
+        """Fetch every feed concurrently; only changed feeds are parsed and applied"""
+        changes = await asyncio.gather(*(self._sync_feed(feed) for feed in self.feeds))
+        self.stats['syncs'] += 1
+        return {'feeds': len(self.feeds), 'bookings_changed': sum(changes)}
+
+    async def _sync_forever(self, interval: float):
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                # One bad sync must not stop calendar sync for the life of the process
+                self.stats['errors'] += 1
+                self.event_log.warning('calendar.sync_failed', error=str(e) or type(e).__name__)
+            await asyncio.sleep(interval)
+
+    def start_syncing(self, interval: float = 900.0):
+        """Sync now, then every interval seconds (default: every 15 minutes)"""
+        if self.feeds and (self._sync_task is None or self._sync_task.done()):
+            self._sync_task = asyncio.create_task(self._sync_forever(interval))
+
+    async def stop_syncing(self):
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'feeds': len(self.feeds),
+            'properties': len(self.indexes),
+            'bookings': sum(len(index) for index in self.indexes.values()),
+            'open_conflicts': sum(len(index.conflicts) for index in self.indexes.values()),
+        }
@@ -0,0 +1,175 @@
+"""
+PropFlow AI Channel Client
+One pooled, keep-alive HTTP client for every outbound channel call
+
+Airbnb, VRBO, direct booking sites and host notifications all go through
+the same httpx.AsyncClient, so fan-out reuses open connections instead of
+paying the connect + TLS cost on every request. httpx itself is imported
+when the pool opens on the first real request - simulated channels never
+pay for it.
+"""
+
+from typing import TYPE_CHECKING, Dict, Any, Optional
+from urllib.parse import urlsplit
+import asyncio
+import os
+import random
+
+if TYPE_CHECKING:
+    import httpx
+
+
+# Channels without a configured URL are simulated (MVP mode)
+CHANNEL_URL_ENV = {
+    'airbnb': 'PROPFLOW_AIRBNB_API_URL',
+    'vrbo': 'PROPFLOW_VRBO_API_URL',
+    'direct': 'PROPFLOW_DIRECT_API_URL',
+    'notifications': 'PROPFLOW_NOTIFY_API_URL',
+}
+
+# Responses worth retrying - the channel is busy, not wrong
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+# Safe to send twice. Anything else (a POSTed reply or alert) is only retried
+# when it never left us - a timeout or 5xx after sending may have been applied
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (httpx[http2])"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ChannelClient:
+    """
+    Shared outbound HTTP client with smart defaults
+    HTTP/2, connection pooling, per-host limits, timeouts and retries built in
+    """
+
+    def __init__(self,
+                 base_urls: Optional[Dict[str, str]] = None,
+                 transport: Optional['httpx.AsyncBaseTransport'] = None,
+                 max_connections: int = 100,
+                 max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 30.0,
+                 per_host_limit: int = 20,
+                 timeout: float = 10.0,
+                 connect_timeout: float = 3.0,
+                 max_retries: int = 3,
+                 backoff_base: float = 0.2,
+                 backoff_max: float = 5.0):
+        if base_urls is None:
+            base_urls = {
+                channel: os.environ[env_var]
+                for channel, env_var in CHANNEL_URL_ENV.items()
+                if os.environ.get(env_var)
+            }
+        self.base_urls = {channel: url.rstrip('/') for channel, url in base_urls.items()}
+        self.transport = transport
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.per_host_limit = per_host_limit
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._client: Optional['httpx.AsyncClient'] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.stats = {'requests': 0, 'retries': 0, 'failures': 0}
+
+    @property
+    def is_open(self) -> bool:
+        return self._client is not None and not self._client.is_closed
+
+    def is_configured(self, channel: str) -> bool:
+        """True when the channel has a real API URL (otherwise we simulate)"""
+        return channel in self.base_urls
+
+    async def start(self):
+        """Open the shared client (on the first request, or ahead of time)"""
+        if self.is_open:
+            return
+        import httpx
+        self._client = httpx.AsyncClient(
+            http2=self.transport is None and _http2_available(),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            transport=self.transport,
+            headers={'User-Agent': 'PropFlow-AI/1.0'}
+        )
+
+    async def close(self):
+        """Close the shared client and all pooled connections (shutdown hook)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        # httpx only limits the pool as a whole - cap each channel host separately
+        host = urlsplit(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Exponential backoff with full jitter, honouring Retry-After when given"""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def request(self, channel: str, method: str, path: str,
+                      json: Optional[Dict[str, Any]] = None) -> 'httpx.Response':
+        """
+        Send a request to a channel API with retry-with-backoff
+        Non-idempotent methods are retried only if the connection never opened.
+        Raises httpx.HTTPStatusError / httpx.TransportError once retries run out
+        """
+        if not self.is_open:
+            await self.start()
+        import httpx
+
+        url = f"{self.base_urls[channel]}/{path.lstrip('/')}"
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        # Nothing was sent for these, so even a POST can go again
+        not_sent = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+        attempt = 0
+
+        async with self._host_semaphore(url):
+            while True:
+                self.stats['requests'] += 1
+                try:
+                    response = await self._client.request(method, url, json=json)
+                except httpx.TransportError as error:
+                    if attempt >= self.max_retries or not (idempotent or isinstance(error, not_sent)):
+                        self.stats['failures'] += 1
+                        raise
+                    retry_after = None
+                else:
+                    if (response.status_code not in RETRYABLE_STATUS_CODES or not idempotent
+                            or attempt >= self.max_retries):
+                        if response.is_error:
+                            self.stats['failures'] += 1
+                        response.raise_for_status()
+                        return response
+                    retry_after = response.headers.get('Retry-After')
+                    await response.aclose()
+
+                self.stats['retries'] += 1
+                await asyncio.sleep(self._backoff_delay(attempt, retry_after))
+                attempt += 1
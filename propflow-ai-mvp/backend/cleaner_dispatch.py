@@ -0,0 +1,336 @@
+"""
+PropFlow AI Cleaner Dispatch
+Server-side cleaner matching - spatial candidates, vectorized scoring, batch optimization
+
+Cleaners are bucketed into a lat/lng grid, so a job only looks at cleaners in
+nearby cells instead of the whole roster. Candidates are scored in one NumPy
+pass with the same weights the dashboard uses (quality 40%, reliability 30%,
+proximity 20%, cost 10%). A whole day's checkouts can be assigned together
+with an auction, so one job can't grab the cleaner another job needed more.
+"""
+
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+from collections import deque
+from datetime import datetime
+import json
+import math
+import os
+
+import numpy as np
+
+
+DEFAULT_CLEANERS_PATH = os.environ.get(
+    'PROPFLOW_CLEANERS_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'cleaners.json')
+)
+
+EARTH_RADIUS_MILES = 3959.0
+MILES_PER_DEGREE = 69.0
+
+# Composite score weights (same as the frontend CleanerDispatchService)
+QUALITY_WEIGHT = 0.4
+RELIABILITY_WEIGHT = 0.3
+PROXIMITY_WEIGHT = 0.2
+COST_WEIGHT = 0.1
+
+
+@dataclass
+class Cleaner:
+    id: str
+    name: str
+    lat: float
+    lng: float
+    radius_miles: float = 15.0
+    quality_score: float = 8.0       # 0-10
+    on_time_percentage: float = 90.0
+    cancellation_rate: float = 5.0   # Percent
+    response_minutes: float = 30.0
+    hourly_rate: float = 25.0
+    emergency_rate: float = 0.0      # 0 = doesn't take emergency jobs
+
+    @property
+    def reliability(self) -> float:
+        """0-1: punctual, rarely cancels, answers fast"""
+        return min(1.0, (self.on_time_percentage / 100) * 0.4
+                   + ((100 - self.cancellation_rate) / 100) * 0.4
+                   + (1 - min(self.response_minutes, 60) / 60) * 0.2)
+
+
+@dataclass
+class CleaningJob:
+    id: str
+    property_id: str
+    lat: float
+    lng: float
+    checkout: datetime
+    next_arrival: Optional[datetime] = None  # Cleaning must be done by then
+    duration_minutes: int = 120
+    job_type: str = 'standard'               # 'standard' or 'emergency'
+
+
+@dataclass
+class CleanerAssignment:
+    job_id: str
+    property_id: str
+    cleaner: Cleaner
+    backups: List[Cleaner]
+    score: float
+    distance_miles: float
+    estimated_cost: float
+    start: datetime
+    end: datetime
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.job_id,
+            'property_id': self.property_id,
+            'cleaner_id': self.cleaner.id,
+            'cleaner_booked': self.cleaner.name,
+            'backup_cleaners': [backup.name for backup in self.backups],
+            'score': round(self.score, 3),
+            'distance_miles': round(self.distance_miles, 1),
+            'estimated_cost': round(self.estimated_cost, 2),
+            'start': self.start.isoformat(),
+            'end': self.end.isoformat(),
+        }
+
+
+def load_cleaners(path: str = DEFAULT_CLEANERS_PATH) -> List[Cleaner]:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return [Cleaner(**entry) for entry in json.load(f)]
+    except FileNotFoundError:
+        return []
+
+
+class CleanerDispatcher:
+    """
+    Cleaner roster as columns + a grid index over their locations
+    assign() books one job; assign_batch() optimizes a whole set of jobs at once
+    """
+
+    def __init__(self,
+                 cleaners: Sequence[Cleaner] = (),
+                 cell_miles: float = 5.0,
+                 candidates_per_job: int = 25,
+                 batch_candidates_per_job: int = 300,
+                 min_score: float = 0.5,
+                 market_rate: float = 25.0,
+                 backups: int = 2):
+        self.cell_deg = cell_miles / MILES_PER_DEGREE
+        self.candidates_per_job = candidates_per_job
+        self.batch_candidates_per_job = batch_candidates_per_job
+        self.min_score = min_score
+        self.market_rate = market_rate
+        self.backups = backups
+        self.stats = {'jobs': 0, 'assigned': 0, 'unassigned': 0, 'batches': 0,
+                      'cleaners_scored': 0, 'auction_bids': 0}
+        self.load_cleaners(cleaners)
+
+    def __len__(self) -> int:
+        return len(self.cleaners)
+
+    def load_cleaners(self, cleaners: Sequence[Cleaner]):
+        """Replace the roster - columns and the grid are rebuilt once here"""
+        self.cleaners = list(cleaners)
+        self._index_by_id = {c.id: index for index, c in enumerate(self.cleaners)}
+        self._lat = np.array([c.lat for c in self.cleaners], dtype=np.float64)
+        self._lng = np.array([c.lng for c in self.cleaners], dtype=np.float64)
+        self._radius = np.array([c.radius_miles for c in self.cleaners], dtype=np.float64)
+        self._static_score = np.array(
+            [QUALITY_WEIGHT * c.quality_score / 10 + RELIABILITY_WEIGHT * c.reliability for c in self.cleaners],
+            dtype=np.float64
+        )
+        self._hourly_rate = np.array([c.hourly_rate for c in self.cleaners], dtype=np.float64)
+        self._emergency_rate = np.array([c.emergency_rate for c in self.cleaners], dtype=np.float64)
+        self._free_at = np.zeros(len(self.cleaners), dtype=np.float64)  # Epoch seconds each cleaner is next free
+        self._max_radius = float(self._radius.max()) if len(self.cleaners) else 0.0
+
+        cells: Dict[Tuple[int, int], List[int]] = {}
+        for index, (lat, lng) in enumerate(zip(self._lat.tolist(), self._lng.tolist())):
+            cells.setdefault(self._cell(lat, lng), []).append(index)
+        self._cells = {cell: np.array(indices, dtype=np.int64) for cell, indices in cells.items()}
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg))
+
+    def _nearby(self, lat: float, lng: float) -> np.ndarray:
+        """Cleaners in grid cells that could reach (lat, lng) - never the whole roster"""
+        reach_lat = self._max_radius / MILES_PER_DEGREE
+        reach_lng = reach_lat / max(math.cos(math.radians(lat)), 0.01)
+        row, col = self._cell(lat, lng)
+        rows = math.ceil(reach_lat / self.cell_deg)
+        cols = math.ceil(reach_lng / self.cell_deg)
+        found = [self._cells[cell] for cell in
+                 ((r, c) for r in range(row - rows, row + rows + 1) for c in range(col - cols, col + cols + 1))
+                 if cell in self._cells]
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def candidates(self, job: CleaningJob,
+                   limit: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Top candidates for a job, best first: (cleaner indices, scores, distances, start times)
+        Only cleaners in range, free in time and above the quality bar are returned
+        """
+        limit = limit or self.candidates_per_job
+        nearby = self._nearby(job.lat, job.lng)
+        self.stats['cleaners_scored'] += len(nearby)
+        if len(nearby) == 0:
+            return nearby, np.empty(0), np.empty(0), np.empty(0)
+
+        # Haversine distance to every nearby cleaner at once
+        lat1, lng1 = math.radians(job.lat), math.radians(job.lng)
+        lat2, lng2 = np.radians(self._lat[nearby]), np.radians(self._lng[nearby])
+        a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+        distance = 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        radius = self._radius[nearby]
+
+        emergency = job.job_type == 'emergency'
+        rate = self._hourly_rate[nearby]
+        if emergency:
+            rate = np.where(self._emergency_rate[nearby] > 0, self._emergency_rate[nearby], rate)
+        proximity = np.clip(1 - distance / radius, 0.0, 1.0)
+        cost = np.clip(self.market_rate / np.maximum(rate, 1e-9), 0.5, 1.0)
+        score = self._static_score[nearby] + PROXIMITY_WEIGHT * proximity + COST_WEIGHT * cost
+        if emergency:
+            score = np.where(self._emergency_rate[nearby] > 0, score * 1.15, score)  # Emergency specialists
+        score = np.minimum(score, 1.0)
+
+        # Must be free in time to finish before the next guest arrives
+        start = np.maximum(self._free_at[nearby], job.checkout.timestamp())
+        ok = (distance <= radius) & (score >= self.min_score)
+        if job.next_arrival is not None:
+            ok &= start + job.duration_minutes * 60 <= job.next_arrival.timestamp()
+
+        keep = np.flatnonzero(ok)
+        if len(keep) > limit:
+            keep = keep[np.argpartition(-score[keep], limit - 1)[:limit]]
+        keep = keep[np.argsort(-score[keep], kind='stable')]
+        return nearby[keep], score[keep], distance[keep], start[keep]
+
+    def _book(self, job: CleaningJob, index: int, score: float, distance: float, start: float,
+              backup_indices: Sequence[int]) -> CleanerAssignment:
+        end = start + job.duration_minutes * 60
+        self._free_at[index] = end
+        cleaner = self.cleaners[index]
+        rate = cleaner.emergency_rate if job.job_type == 'emergency' and cleaner.emergency_rate > 0 else cleaner.hourly_rate
+        self.stats['assigned'] += 1
+        return CleanerAssignment(
+            job_id=job.id,
+            property_id=job.property_id,
+            cleaner=cleaner,
+            backups=[self.cleaners[b] for b in backup_indices[:self.backups]],
+            score=score,
+            distance_miles=distance,
+            estimated_cost=job.duration_minutes / 60 * rate,
+            start=datetime.fromtimestamp(start),
+            end=datetime.fromtimestamp(end)
+        )
+
+    def assign(self, job: CleaningJob) -> Optional[CleanerAssignment]:
+        """Book the best available cleaner (plus backups) for one job"""
+        self.stats['jobs'] += 1
+        indices, scores, distances, starts = self.candidates(job)
+        if len(indices) == 0:
+            self.stats['unassigned'] += 1
+            return None
+        return self._book(job, int(indices[0]), float(scores[0]), float(distances[0]), float(starts[0]),
+                          indices[1:].tolist())
+
+    def assign_batch(self, jobs: Sequence[CleaningJob], epsilon: float = 1e-3) -> List[Optional[CleanerAssignment]]:
+        """
+        Assign a day's checkouts together instead of first come, first served
+        Each round auctions the open jobs over their top candidates (jobs covered
+        first, then total score). Jobs that lost out bid again over a wider
+        candidate list - only cleaners still free in time for them.
+        """
+        self.stats['jobs'] += len(jobs)
+        self.stats['batches'] += 1
+        results: List[Optional[CleanerAssignment]] = [None] * len(jobs)
+        last_candidates: Dict[int, List[int]] = {}
+        booked = set()
+        open_jobs = list(range(len(jobs)))
+        limit = self.batch_candidates_per_job
+
+        while open_jobs:
+            options = {j: self.candidates(jobs[j], limit) for j in open_jobs}
+            open_jobs = [j for j in open_jobs if len(options[j][0])]
+            # Covering a job is worth more than any score difference
+            won = self._auction([(options[j][0], options[j][1] + 1.0) for j in open_jobs], epsilon)
+            for bidder, position in won.items():
+                job_index = open_jobs[bidder]
+                indices, scores, distances, starts = options[job_index]
+                cleaner_index = int(indices[position])
+                results[job_index] = self._book(jobs[job_index], cleaner_index, float(scores[position]),
+                                                float(distances[position]), float(starts[position]), [])
+                last_candidates[job_index] = indices.tolist()
+                booked.add(cleaner_index)
+            if not won and all(len(options[j][0]) < limit for j in open_jobs):
+                break  # Nobody left who could take the remaining jobs
+            open_jobs = [j for i, j in enumerate(open_jobs) if i not in won]
+            limit *= 2
+
+        # Backups: the job's other candidates that weren't booked elsewhere in this batch
+        for job_index, assignment in enumerate(results):
+            if assignment is None:
+                self.stats['unassigned'] += 1
+                continue
+            backups = [i for i in last_candidates[job_index] if i not in booked][:self.backups]
+            assignment.backups = [self.cleaners[i] for i in backups]
+        return results
+
+    def _auction(self, bids: List[Tuple[np.ndarray, np.ndarray]], epsilon: float) -> Dict[int, int]:
+        """
+        Forward auction (Bertsekas) on sparse candidate lists
+        Jobs bid for cleaners; staying unassigned is always an option worth 0.
+        Returns bidder -> position of the won cleaner in its candidate list.
+        """
+        # No epsilon scaling: with more cleaners than jobs, prices carried over
+        # between phases strand cleaners and cost a few percent of total score
+        prices = np.zeros(len(self.cleaners), dtype=np.float64)
+        owner: Dict[int, int] = {}   # cleaner -> bidder
+        won: Dict[int, int] = {}     # bidder -> candidate position
+        queue = deque(i for i, (indices, _) in enumerate(bids) if len(indices))
+        while queue:
+            bidder = queue.popleft()
+            indices, values = bids[bidder]
+            net = values - prices[indices]
+            if len(net) > 1:
+                top_two = np.argpartition(-net, 1)[:2]
+                best, second = (top_two[0], top_two[1]) if net[top_two[0]] >= net[top_two[1]] else (top_two[1], top_two[0])
+                second_value = max(float(net[second]), 0.0)
+            else:
+                best, second_value = 0, 0.0
+            best_value = float(net[best])
+            if best_value <= 0:
+                continue  # Every candidate now costs more than it's worth here
+            self.stats['auction_bids'] += 1
+            cleaner = int(indices[best])
+            prices[cleaner] += best_value - second_value + epsilon
+            previous = owner.get(cleaner)
+            if previous is not None:
+                del won[previous]
+                queue.append(previous)
+            owner[cleaner] = bidder
+            won[bidder] = int(best)
+        return won
+
+    def cleaner(self, cleaner_id: str) -> Optional[Cleaner]:
+        index = self._index_by_id.get(cleaner_id)
+        return self.cleaners[index] if index is not None else None
+
+    def reserve(self, cleaner_id: str, until: datetime):
+        """Booked elsewhere (another worker) - not free again before `until`"""
+        index = self._index_by_id.get(cleaner_id)
+        if index is not None:
+            self._free_at[index] = max(self._free_at[index], until.timestamp())
+
+    def release(self, cleaner_id: str):
+        """Cleaner cancelled or finished early - free them for new jobs"""
+        index = self._index_by_id.get(cleaner_id)
+        if index is not None:
+            self._free_at[index] = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'cleaners': len(self.cleaners), 'grid_cells': len(self._cells)}
@@ -0,0 +1,139 @@
+"""
+PropFlow AI Competitor Pricing
+Columnar, NumPy-backed underpricing analysis for whole portfolios
+
+Competitor comps are stored as arrays grouped by market. Market percentiles
+are computed once when comps load; a portfolio is then analysed in one
+vectorized pass - no per-property Python loop, however many comps there are.
+"""
+
+from typing import Dict, List, Optional, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class PricingAnalysis:
+    """Per-property results, one array entry per property (same order as input)"""
+    market_reference: np.ndarray   # Market weekly revenue we compare against
+    gap: np.ndarray                # market_reference - your weekly revenue
+    underpriced: np.ndarray        # bool
+    extra_money: np.ndarray        # Weekly revenue you're leaving on the table
+    confidence: np.ndarray         # Share of comps earning more than you
+    comps_count: np.ndarray        # Comps behind each reference (0 = fallback rule)
+
+
+class CompetitorPricingEngine:
+    """
+    Compares every property against its market's comps at once
+    Markets without enough comps fall back to the simple MVP threshold rule
+    """
+
+    def __init__(self,
+                 reference_percentile: float = 50.0,
+                 min_comps: int = 5,
+                 fallback_threshold: float = 2500.0,
+                 fallback_extra_money: float = 450.0,
+                 fallback_confidence: float = 0.87):
+        self.reference_percentile = reference_percentile
+        self.min_comps = min_comps
+        self.fallback_threshold = fallback_threshold
+        self.fallback_extra_money = fallback_extra_money
+        self.fallback_confidence = fallback_confidence
+
+        self.property_markets: Dict[str, str] = {}
+        self._market_index: Dict[str, int] = {}
+        self._sorted_values = np.empty(0)       # Comps sorted by (market, revenue)
+        self._market_start = np.empty(0, dtype=np.int64)
+        self._market_count = np.empty(0, dtype=np.int64)
+        self._market_reference = np.empty(0)
+        self._banded_values = np.empty(0)       # Sorted comps offset into one band per market
+        self._band = 1.0
+
+    @property
+    def comps_loaded(self) -> int:
+        return len(self._sorted_values)
+
+    def set_property_markets(self, property_markets: Dict[str, str]):
+        """Which market each property competes in (property_id -> market)"""
+        self.property_markets.update(property_markets)
+
+    def load_comps(self, markets: Sequence[str], weekly_revenues: Sequence[float]):
+        """
+        Load comparable listings as two parallel columns
+        Percentiles per market are precomputed here, once
+        """
+        # Factorize market names to integer codes (dict lookups beat sorting strings)
+        market_index: Dict[str, int] = {}
+        codes = np.fromiter((market_index.setdefault(m, len(market_index)) for m in markets),
+                            dtype=np.int64, count=len(markets))
+        values = np.asarray(weekly_revenues, dtype=np.float64)
+
+        order = np.lexsort((values, codes))
+        self._sorted_values = values[order]
+        self._market_index = market_index
+        self._market_count = np.bincount(codes, minlength=len(market_index)).astype(np.int64)
+        self._market_start = np.concatenate(([0], np.cumsum(self._market_count)[:-1])).astype(np.int64)
+
+        # Linear-interpolated percentile inside each market's sorted slice
+        position = (self._market_count - 1) * (self.reference_percentile / 100.0)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, self._market_count - 1)
+        fraction = position - lower
+        self._market_reference = (
+            self._sorted_values[self._market_start + lower] * (1 - fraction)
+            + self._sorted_values[self._market_start + upper] * fraction
+        )
+
+        # Offset each market into its own value band so the whole comp set is one
+        # globally sorted array - a single searchsorted then ranks every property
+        self._band = float(np.abs(values).max()) * 2 + 1.0 if len(values) else 1.0
+        self._banded_values = self._sorted_values + np.repeat(
+            np.arange(len(market_index)) * self._band, self._market_count
+        )
+
+    def analyze(self, property_ids: Sequence[str], weekly_revenues: Sequence[float],
+                markets: Optional[Sequence[Optional[str]]] = None) -> PricingAnalysis:
+        """Analyse a whole portfolio in one vectorized pass"""
+        revenue = np.asarray(weekly_revenues, dtype=np.float64)
+        if markets is None:
+            markets = [self.property_markets.get(pid) for pid in property_ids]
+        codes = np.fromiter((self._market_index.get(m, -1) for m in markets), dtype=np.int64, count=len(revenue))
+
+        known = codes >= 0
+        safe_codes = np.where(known, codes, 0)
+        has_market_data = len(self._market_count) > 0
+        comps_count = np.where(known, self._market_count[safe_codes], 0) if has_market_data else np.zeros(len(revenue), dtype=np.int64)
+        use_comps = comps_count >= self.min_comps
+
+        reference = np.full(len(revenue), self.fallback_threshold)
+        if has_market_data:
+            reference = np.where(use_comps, self._market_reference[safe_codes], reference)
+        gap = reference - revenue
+        underpriced = gap > 0
+
+        extra_money = np.where(use_comps, np.maximum(gap, 0.0), np.where(underpriced, self.fallback_extra_money, 0.0))
+
+        # Confidence = share of the market's comps earning more than this property
+        confidence = np.full(len(revenue), self.fallback_confidence)
+        if has_market_data and use_comps.any():
+            banded_revenue = safe_codes * self._band + np.clip(revenue, -self._band / 2, self._band / 2)
+            below = np.searchsorted(self._banded_values, banded_revenue, side='right') - self._market_start[safe_codes]
+            share_above = 1.0 - below / np.maximum(comps_count, 1)
+            confidence = np.where(use_comps, np.clip(share_above, 0.5, 0.95), confidence)
+
+        return PricingAnalysis(
+            market_reference=reference,
+            gap=gap,
+            underpriced=underpriced,
+            extra_money=extra_money,
+            confidence=confidence,
+            comps_count=comps_count
+        )
+
+    def underpriced_indices(self, analysis: PricingAnalysis) -> List[int]:
+        """Underpriced properties, biggest money left on the table first"""
+        indices = np.flatnonzero(analysis.underpriced)
+        order = np.argsort(-analysis.extra_money[indices], kind='stable')
+        return indices[order].tolist()
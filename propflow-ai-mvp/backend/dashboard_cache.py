@@ -0,0 +1,71 @@
+"""
+PropFlow AI Dashboard Cache
+Per-host dashboard snapshots with TTL, LRU eviction and event-driven invalidation
+
+The React dashboard polls constantly. Most polls see exactly the same data,
+so we keep the last snapshot per host and only rebuild it when it expires
+or when something actually changed for that host.
+"""
+
+from typing import Dict, Any, Optional
+from collections import OrderedDict
+import time
+
+
+class DashboardCache:
+    """
+    host_id -> dashboard snapshot
+    Entries expire after ttl_seconds; least recently used hosts are evicted first
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_hosts: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_hosts = max_hosts
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'invalidations': 0, 'evictions': 0}
+
+    def get(self, host_id: str) -> Optional[Any]:
+        entry = self._entries.get(host_id)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+
+        expires_at, snapshot = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[host_id]
+            self.stats['expired'] += 1
+            self.stats['misses'] += 1
+            return None
+
+        self._entries.move_to_end(host_id)
+        self.stats['hits'] += 1
+        return snapshot
+
+    def peek(self, host_id: str) -> Optional[Any]:
+        """The cached snapshot, if any - no hit/miss counting, no LRU bump"""
+        entry = self._entries.get(host_id)
+        return entry[1] if entry is not None else None
+
+    def put(self, host_id: str, snapshot: Any):
+        self._entries[host_id] = (time.monotonic() + self.ttl_seconds, snapshot)
+        self._entries.move_to_end(host_id)
+        while len(self._entries) > self.max_hosts:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def invalidate(self, host_id: str):
+        """Drop a host's snapshot - the next dashboard load rebuilds it"""
+        if self._entries.pop(host_id, None) is not None:
+            self.stats['invalidations'] += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'cached_hosts': len(self._entries),
+            'hit_rate': round(self.stats['hits'] / lookups, 3) if lookups else None,
+            'ttl_seconds': self.ttl_seconds,
+        }
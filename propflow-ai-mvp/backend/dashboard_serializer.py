@@ -0,0 +1,48 @@
+"""
+PropFlow AI Dashboard Serializer
+Dataclasses straight to JSON bytes - one pass, no intermediate dicts or models
+
+Uses orjson when installed (it encodes dataclasses natively), otherwise the
+standard json module with a tiny dataclass hook. The output matches the
+published DashboardResponse schema field for field.
+"""
+
+from typing import Any
+import dataclasses
+import json
+
+try:
+    import orjson  # Optional - several times faster than json
+except ImportError:
+    orjson = None
+
+
+def _encode_dataclass(obj: Any) -> Any:
+    if dataclasses.is_dataclass(obj) and hasattr(obj, '__dict__'):
+        # Plain dataclasses keep their fields in __dict__ (in field order) -
+        # dataclasses.asdict() would deep-copy everything instead
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode any payload (dicts, lists, dataclasses) to compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(
+        obj, default=_encode_dataclass, ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+def encode_dashboard(snapshot: Any) -> bytes:
+    """
+    Encode a DashboardSnapshot in the DashboardResponse shape
+    Property and MoneyOpportunity dataclasses are written directly
+    """
+    return dumps({
+        'properties': snapshot.properties,
+        'money_opportunity': snapshot.money_opportunity,
+        'overall_status': snapshot.overall_status,
+        'total_weekly_revenue': snapshot.total_weekly_revenue,
+        'magic_stats': snapshot.magic_stats,
+    })
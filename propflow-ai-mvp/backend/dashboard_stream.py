@@ -0,0 +1,184 @@
+"""
+PropFlow AI Dashboard Stream
+Server-Sent Events per host - the dashboard is pushed, not polled
+
+A connection gets the full dashboard once, then only compact diffs as
+events fire: a property's status changed, a new money opportunity, a
+message escalated. Each event is encoded once and the same bytes are
+handed to every subscriber of that host, so fan-out costs an append per
+connection. Idle connections hold no task or timer of their own - one
+hub-wide heartbeat keeps them all alive - so one worker holds 10k+.
+Streams are closed after a jittered max age; EventSource reconnects on
+its own, which spreads clients across workers and lets deploys drain.
+"""
+
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Set
+from collections import deque
+import asyncio
+import random
+import time
+
+from dashboard_serializer import dumps
+from event_log import EventLog, event_log
+
+_PING = b": ping\n\n"
+
+
+class StreamFull(Exception):
+    """Too many open dashboard streams - the client should retry later"""
+
+
+class Subscriber:
+    """One open stream: pending event bytes plus a wakeup for its response task"""
+
+    __slots__ = ('host_id', 'expires_at', 'pending', 'wakeup', 'resync', 'closed')
+
+    def __init__(self, host_id: str, max_pending: int, expires_at: float):
+        self.host_id = host_id
+        self.expires_at = expires_at
+        self.pending: deque = deque(maxlen=max_pending)
+        self.wakeup = asyncio.Event()
+        self.resync = False  # Send the full dashboard again instead of diffs
+        self.closed = False
+
+
+def sse_event(event_type: str, data: bytes) -> bytes:
+    return b"event: " + event_type.encode() + b"\ndata: " + data + b"\n\n"
+
+
+class DashboardStreamHub:
+    """
+    host_id -> open streams
+    publish() is a no-op for hosts nobody is watching
+    """
+
+    def __init__(self, heartbeat_seconds: float = 15.0, max_age_seconds: float = 600.0,
+                 max_pending: int = 256, max_subscribers: int = 20000, event_log: EventLog = event_log):
+        self.heartbeat_seconds = heartbeat_seconds
+        self.event_log = event_log
+        self.max_age_seconds = max_age_seconds
+        self.max_pending = max_pending
+        self.max_subscribers = max_subscribers
+        self._subscribers: Dict[str, Set[Subscriber]] = {}
+        self._count = 0
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {'connections': 0, 'rejected': 0, 'events': 0, 'deliveries': 0,
+                      'resyncs': 0, 'overflows': 0, 'expired': 0}
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._heartbeat())
+
+    async def stop(self):
+        """Stop the heartbeat and end every open stream so the server can shut down"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for subscribers in list(self._subscribers.values()):
+            for subscriber in subscribers:
+                subscriber.closed = True
+                subscriber.wakeup.set()
+
+    def check_capacity(self):
+        """Raise StreamFull before a response is started for a stream we can't take"""
+        if self._count >= self.max_subscribers:
+            self.stats['rejected'] += 1
+            raise StreamFull(f"{self._count} dashboard streams already open")
+
+    def subscribe(self, host_id: str) -> Subscriber:
+        self.check_capacity()
+        max_age = self.max_age_seconds * random.uniform(0.9, 1.1)  # Don't reconnect everyone at once
+        subscriber = Subscriber(host_id, self.max_pending, time.monotonic() + max_age)
+        self._subscribers.setdefault(host_id, set()).add(subscriber)
+        self._count += 1
+        self.stats['connections'] += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        subscribers = self._subscribers.get(subscriber.host_id)
+        if subscribers is None or subscriber not in subscribers:
+            return
+        subscribers.discard(subscriber)
+        self._count -= 1
+        if not subscribers:
+            del self._subscribers[subscriber.host_id]
+
+    def publish(self, host_id: str, event_type: str, data: Any) -> int:
+        """Encode once, queue for every stream of this host; returns how many got it"""
+        subscribers = self._subscribers.get(host_id)
+        if not subscribers:
+            return 0
+        message = sse_event(event_type, dumps(data))
+        self.stats['events'] += 1
+        for subscriber in subscribers:
+            if len(subscriber.pending) == self.max_pending:
+                # Too far behind to catch up diff by diff - start over from a full dashboard
+                subscriber.pending.clear()
+                subscriber.resync = True
+                self.stats['overflows'] += 1
+            else:
+                subscriber.pending.append(message)
+            subscriber.wakeup.set()
+        self.stats['deliveries'] += len(subscribers)
+        return len(subscribers)
+
+    def resync(self, host_id: str):
+        """The host's dashboard changed in a way diffs don't cover - push it whole"""
+        for subscriber in self._subscribers.get(host_id, ()):
+            subscriber.pending.clear()
+            subscriber.resync = True
+            subscriber.wakeup.set()
+
+    async def stream(self, host_id: str,
+                     dashboard: Callable[[], Awaitable[bytes]]) -> AsyncIterator[bytes]:
+        """
+        Response body for one connection: the full dashboard, then diffs as they come
+        dashboard() returns the host's dashboard JSON (usually straight from cache).
+        Subscribes on the first iteration, so a response that never starts holds no slot
+        """
+        try:
+            subscriber = self.subscribe(host_id)
+        except StreamFull:
+            yield b"retry: 30000\n\n"  # Filled up since check_capacity() - EventSource comes back later
+            return
+        try:
+            yield b"retry: 5000\n\n" + sse_event('dashboard', await dashboard())
+            while not subscriber.closed:
+                await subscriber.wakeup.wait()
+                subscriber.wakeup.clear()
+                if subscriber.resync:
+                    subscriber.resync = False
+                    subscriber.pending.clear()
+                    self.stats['resyncs'] += 1
+                    yield sse_event('dashboard', await dashboard())
+                elif subscriber.pending:
+                    chunk = b"".join(subscriber.pending)
+                    subscriber.pending.clear()
+                    yield chunk
+        finally:
+            self.unsubscribe(subscriber)
+
+    async def _heartbeat(self):
+        """
+        One timer for every connection - comment lines keep proxies from
+        closing idle streams, and streams past their max age are ended
+        """
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                now = time.monotonic()
+                for subscribers in list(self._subscribers.values()):
+                    for subscriber in subscribers:
+                        if now >= subscriber.expires_at and not subscriber.closed:
+                            subscriber.closed = True
+                            subscriber.wakeup.set()
+                            self.stats['expired'] += 1
+                        elif not subscriber.pending:
+                            subscriber.pending.append(_PING)
+                            subscriber.wakeup.set()
+            except Exception as e:
+                self.event_log.warning('stream.heartbeat_failed', error=str(e))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'open_streams': self._count, 'hosts_watched': len(self._subscribers)}
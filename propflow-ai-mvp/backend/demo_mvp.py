@@ -15,7 +15,7 @@ Run with: python demo_mvp.py
 import asyncio
 import json
 from datetime import datetime
-from MVP_BackendService import MVPBackendService
+from MVP_BackendService import MVPBackendService, DATA_SOURCES
 
 class PropFlowMVPDemo:
     """
@@ -24,7 +24,7 @@ class PropFlowMVPDemo:
     """
     
     def __init__(self):
-        self.service = MVPBackendService()
+        self.service = MVPBackendService(DATA_SOURCES['mock'])  # Demo portfolio, simulated channels
         self.demo_host_id = "demo_host_123"
     
     async def run_complete_demo(self):
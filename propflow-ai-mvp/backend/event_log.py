@@ -0,0 +1,205 @@
+"""
+PropFlow AI Event Log
+Structured JSON-lines events written off the event loop, sampled per event type
+
+emit() only builds a small dict and drops it on a queue - a writer thread
+encodes and writes in batches, so a slow stdout or disk never stalls a
+request. Every event carries the correlation ids (request, host, property)
+bound for the current request or task, so one request's trail can be
+grepped out of the log.
+"""
+
+from typing import Dict, Any, Callable, IO, Iterator, List, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+import atexit
+import functools
+import inspect
+import io
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+
+try:
+    import orjson  # Optional - several times faster than json
+except ImportError:
+    orjson = None
+
+
+DEFAULT_LOG_PATH = os.environ.get('PROPFLOW_EVENT_LOG_PATH')  # Unset = stdout
+
+# High-volume, low-value events are sampled; anything not listed is kept.
+# Warnings and errors are never sampled out.
+DEFAULT_SAMPLE_RATES: Dict[str, float] = {
+    'message.auto_replied': 0.1,
+}
+
+_LEVELS_NEVER_SAMPLED = ('warning', 'error')
+
+_context: ContextVar[Dict[str, Any]] = ContextVar('propflow_log_context', default={})
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """'message.auto_replied=0.1,pricing.updated=1' -> {event: rate}"""
+    rates = {}
+    for part in filter(None, (p.strip() for p in spec.split(','))):
+        event, _, rate = part.partition('=')
+        rates[event.strip()] = float(rate)
+    return rates
+
+
+@contextmanager
+def correlate(**ids: Any) -> Iterator[None]:
+    """Attach correlation ids to every event emitted inside the block (this task only)"""
+    token = _context.set({**_context.get(), **{k: v for k, v in ids.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def correlated(*names: str) -> Callable:
+    """
+    Decorator for async methods: bind the named arguments as correlation ids
+    @correlated('property_id') tags every event logged during the call
+    """
+    def decorate(fn: Callable) -> Callable:
+        parameters = list(inspect.signature(fn).parameters)
+        positions = [(name, parameters.index(name)) for name in names]
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            ids = {name: kwargs[name] if name in kwargs else args[index] if index < len(args) else None
+                   for name, index in positions}
+            with correlate(**ids):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def current_context() -> Dict[str, Any]:
+    return _context.get()
+
+
+def _encode(record: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record, default=str)
+    return json.dumps(record, default=str, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class EventLog:
+    """
+    Non-blocking JSON-lines logger
+    emit() is safe to call from the event loop; the writer thread does the I/O
+    """
+
+    def __init__(self,
+                 sink: Optional[IO] = None,
+                 path: Optional[str] = DEFAULT_LOG_PATH,
+                 sample_rates: Optional[Dict[str, float]] = None,
+                 max_queue: int = 10000,
+                 batch_size: int = 512):
+        self._sink = sink
+        self.path = path
+        self.sample_rates = dict(DEFAULT_SAMPLE_RATES if sample_rates is None else sample_rates)
+        self.sample_rates.update(parse_sample_rates(os.environ.get('PROPFLOW_EVENT_SAMPLING', '')))
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        # SimpleQueue: a lock-free put in C, ~20x cheaper than queue.Queue on the hot path
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.stats = {'emitted': 0, 'sampled_out': 0, 'dropped': 0, 'written': 0, 'write_errors': 0}
+
+    def emit(self, event: str, level: str = 'info', **fields: Any):
+        """Queue one event - never blocks; drops (and counts) if the writer is far behind"""
+        rate = self.sample_rates.get(event, 1.0)
+        if rate < 1.0 and level not in _LEVELS_NEVER_SAMPLED and random.random() >= rate:
+            self.stats['sampled_out'] += 1
+            return
+        record = {'ts': time.time(), 'event': event, 'level': level, **_context.get(), **fields}
+        if rate < 1.0:
+            record['sample_rate'] = rate  # Multiply counts back up when querying
+        if self._thread is None:
+            self.start()
+        if self._queue.qsize() >= self.max_queue:
+            self.stats['dropped'] += 1
+            return
+        self._queue.put(record)
+        self.stats['emitted'] += 1
+
+    def warning(self, event: str, **fields: Any):
+        self.emit(event, 'warning', **fields)
+
+    def start(self):
+        """Start the writer thread (also started by the first emit)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._write_loop, name='propflow-event-log', daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _open_sink(self) -> IO:
+        if self._sink is not None:
+            return self._sink
+        if self.path:
+            return open(self.path, 'ab')
+        return sys.stdout.buffer if hasattr(sys.stdout, 'buffer') else sys.stdout
+
+    def _write_loop(self):
+        sink = self._open_sink()
+        binary = not isinstance(sink, io.TextIOBase)
+        running = True
+        while running:
+            batch: List[Any] = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = [record for record in batch if isinstance(record, dict)]
+            markers = [item for item in batch if not isinstance(item, dict)]
+            if records:
+                data = b'\n'.join(_encode(record) for record in records) + b'\n'
+                try:
+                    sink.write(data if binary else data.decode('utf-8'))
+                    sink.flush()
+                    self.stats['written'] += len(records)
+                except (OSError, ValueError):
+                    self.stats['write_errors'] += 1
+            for marker in markers:
+                if marker is None:
+                    running = False  # close()
+                else:
+                    marker.set()     # flush()
+        if self._sink is None and self.path:
+            sink.close()
+
+    def flush(self, timeout: float = 5.0):
+        """Block (off the event loop!) until everything queued so far is written"""
+        if self._thread is not None:
+            written = threading.Event()
+            self._queue.put(written)
+            written.wait(timeout)
+
+    def close(self):
+        """Write everything still queued and stop the writer thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout=5.0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'queued': self._queue.qsize(), 'sample_rates': self.sample_rates}
+
+
+# Default log for subsystems built on their own (benchmarks, scripts) -
+# the service gives itself and everything it builds a log of its own
+event_log = EventLog()
@@ -0,0 +1,30 @@
+"""
+PropFlow AI Gunicorn Config
+One uvicorn worker per core behind a single port
+
+Workers share state through PROPFLOW_SHARED_STATE_URL. With more than one
+worker and nothing configured, the workers on this machine share
+data/shared_state.db. Set redis://... to share across machines.
+
+Run with: gunicorn -c gunicorn.conf.py main:app  (what the Procfile and railway.json start)
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('PROPFLOW_WORKERS', 0)) or multiprocessing.cpu_count()
+worker_class = 'uvicorn.workers.UvicornWorker'
+keepalive = 5
+timeout = 60
+graceful_timeout = 10  # Live dashboard streams never finish on their own
+
+# Set before the workers fork and import the app
+if workers > 1:
+    shared_state_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'shared_state.db')
+    os.environ.setdefault('PROPFLOW_SHARED_STATE_URL', f"sqlite:///{shared_state_path}")
+
+
+def on_starting(server):
+    server.log.info("PropFlow AI: %d workers, shared state %s", workers,
+                    os.environ.get('PROPFLOW_SHARED_STATE_URL', 'local'))
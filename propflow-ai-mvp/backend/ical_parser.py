@@ -0,0 +1,143 @@
+"""
+PropFlow AI iCal Parser
+Streaming ICS reader - yields one event at a time, never holds the whole feed
+
+Multi-year channel calendars can run to hundreds of megabytes. The parser
+works through the feed in small batches of lines, unfolding continuation
+lines as it goes and dropping properties we never use, so memory stays flat
+whatever the feed size - from a file or straight off an HTTP response.
+"""
+
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, NamedTuple, Optional
+from datetime import date, timedelta
+from itertools import islice
+
+
+# Only these properties are kept - DESCRIPTION, ATTENDEE etc. are skipped unread
+_KEPT_PREFIXES = ('BEGIN:', 'END:', 'UID', 'SEQUENCE', 'DTSTART', 'DTEND', 'SUMMARY', 'STATUS')
+
+
+class CalendarEvent(NamedTuple):
+    uid: str
+    sequence: int    # Bumped by the channel whenever the event changes
+    dtstart: date
+    dtend: date      # Exclusive - the checkout day
+    summary: str = ''
+    status: str = 'CONFIRMED'
+
+    @property
+    def cancelled(self) -> bool:
+        return self.status == 'CANCELLED'
+
+
+def ical_date(value: str) -> date:
+    """DATE (20240614) or DATE-TIME (20240614T150000Z) - the night is what matters"""
+    return date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+
+
+class ICalStreamParser:
+    """
+    Incremental VEVENT parser
+    feed() raw lines a batch at a time; completed events come back as they close
+    """
+
+    def __init__(self):
+        self._pending: Optional[str] = None  # Last logical line - may still get continuations
+        self._event: Optional[Dict[str, str]] = None
+        self.events_parsed = 0
+        self.events_invalid = 0
+
+    def feed(self, lines: Iterable[str]) -> List[CalendarEvent]:
+        # One tight loop per batch - parser state lives in locals until the batch ends
+        pending, fields = self._pending, self._event
+        events: List[CalendarEvent] = []
+        for line in lines:
+            first = line[:1]
+            if first == ' ' or first == '\t':
+                # Folded continuation - only kept properties are ever unfolded
+                if pending is not None:
+                    pending += line[1:].rstrip('\r\n')
+                continue
+            if pending is not None:
+                if pending == 'BEGIN:VEVENT':
+                    fields = {}
+                elif pending == 'END:VEVENT':
+                    if fields is not None:
+                        event = self._build(fields)
+                        if event is not None:
+                            events.append(event)
+                    fields = None
+                elif fields is not None:
+                    name, _, value = pending.partition(':')
+                    fields[name.split(';', 1)[0]] = value
+            pending = line.rstrip('\r\n') if line.startswith(_KEPT_PREFIXES) else None
+        self._pending, self._event = pending, fields
+        return events
+
+    def close(self) -> List[CalendarEvent]:
+        """Flush the last line once the input ends"""
+        return self.feed(('END:VCALENDAR',)) if self._pending is not None else []
+
+    def _build(self, fields: Dict[str, str]) -> Optional[CalendarEvent]:
+        try:
+            dtstart = ical_date(fields['DTSTART'])
+            # All-day events without DTEND last one day (RFC 5545)
+            dtend = ical_date(fields['DTEND']) if 'DTEND' in fields else dtstart + timedelta(days=1)
+            event = CalendarEvent(
+                fields['UID'],
+                int(fields.get('SEQUENCE') or 0),
+                dtstart,
+                dtend,
+                fields.get('SUMMARY', ''),
+                fields['STATUS'].upper() if 'STATUS' in fields else 'CONFIRMED'
+            )
+        except (KeyError, ValueError):
+            self.events_invalid += 1  # One broken event never stops the feed
+            return None
+        self.events_parsed += 1
+        return event
+
+
+def iter_events(lines: Iterable[str], batch_size: int = 4096) -> Iterator[CalendarEvent]:
+    """Stream events out of any line iterable (an open file, a list, a socket reader)"""
+    parser = ICalStreamParser()
+    lines = iter(lines)
+    while True:
+        batch = list(islice(lines, batch_size))
+        if not batch:
+            break
+        yield from parser.feed(batch)
+    yield from parser.close()
+
+
+def iter_file_events(path: str, chunk_size: int = 1 << 20) -> Iterator[CalendarEvent]:
+    """Stream events from an .ics file, chunk_size characters at a time"""
+    parser = ICalStreamParser()
+    carry = ''
+    with open(path, encoding='utf-8', errors='replace') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            text = carry + chunk
+            cut = text.rfind('\n') + 1
+            text, carry = text[:cut], text[cut:]
+            # Unfold inside the chunk in C; folds across chunk edges are unfolded by feed()
+            yield from parser.feed(text.replace('\n ', '').replace('\n\t', '').splitlines())
+    if carry:
+        yield from parser.feed((carry,))
+    yield from parser.close()
+
+
+async def aiter_events(lines: AsyncIterator[str], batch_size: int = 4096) -> AsyncIterator[CalendarEvent]:
+    """Stream events from an async line source (e.g. httpx response.aiter_lines())"""
+    parser = ICalStreamParser()
+    batch: List[str] = []
+    async for line in lines:
+        batch.append(line)
+        if len(batch) >= batch_size:
+            for event in parser.feed(batch):
+                yield event
+            batch = []
+    for event in parser.feed(batch) + parser.close():
+        yield event
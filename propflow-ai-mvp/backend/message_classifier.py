@@ -0,0 +1,230 @@
+"""
+PropFlow AI Message Classifier
+Single-pass keyword classification for guest messages
+
+All category keywords are compiled once at startup into an Aho-Corasick
+automaton (pyahocorasick) - or a prefix-factored regex when that package isn't
+installed. Each message is scanned a single time, and the highest-priority
+category found wins - same answers as the old per-category keyword scans.
+"""
+
+from typing import List, Dict, Any, Optional
+import re
+
+try:
+    import ahocorasick  # Optional C automaton - much faster on long messages
+except ImportError:
+    ahocorasick = None
+
+
+# Declarative category table - earlier entries take priority over later ones
+MESSAGE_CATEGORIES: List[Dict[str, Any]] = [
+    {
+        # WiFi questions (very common)
+        'keywords': ['wifi', 'password', 'internet', 'connection'],
+        'result': {
+            'type': 'wifi_question',
+            'auto_respondable': True,
+            'confidence': 0.95
+        }
+    },
+    {
+        # Check-in questions (very common)
+        'keywords': ['check in', 'checkin', 'key', 'access', 'lockbox'],
+        'result': {
+            'type': 'checkin_question',
+            'auto_respondable': True,
+            'confidence': 0.92
+        }
+    },
+    {
+        # Amenities questions (common)
+        'keywords': ['amenities', 'kitchen', 'towels', 'parking', 'gym'],
+        'result': {
+            'type': 'amenities_question',
+            'auto_respondable': True,
+            'confidence': 0.88
+        }
+    },
+    {
+        # Complaints (need human attention)
+        'keywords': ['problem', 'issue', 'broken', 'dirty', 'complaint'],
+        'result': {
+            'type': 'complaint',
+            'auto_respondable': False,
+            'escalation_reason': 'Guest complaint detected',
+            'priority': 'high',
+            'suggested_response': 'I apologize for the inconvenience. Let me personally look into this right away.'
+        }
+    },
+    {
+        # Emergency (immediate human attention)
+        'keywords': ['emergency', 'urgent', 'help', 'stuck', 'locked out'],
+        'result': {
+            'type': 'emergency',
+            'auto_respondable': False,
+            'escalation_reason': 'Emergency situation detected',
+            'priority': 'critical'
+        }
+    },
+]
+
+# Default: escalate unclear messages
+UNCLEAR_RESULT: Dict[str, Any] = {
+    'type': 'unclear',
+    'auto_respondable': False,
+    'escalation_reason': 'Message unclear - human review needed',
+    'priority': 'medium'
+}
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def _ends_word(text: str, after: int) -> bool:
+    """A keyword ending just before text[after] ends a word - plural 's' / 'es' allowed ('keys', 'lockboxes')"""
+    if text.startswith('es', after):
+        after += 2
+    elif text.startswith('s', after):
+        after += 1
+    return after >= len(text) or not _is_word_char(text[after])
+
+
+def _trie_pattern(keywords: List[str]) -> str:
+    """
+    Build a prefix-factored regex from keywords, longest match first
+    e.g. ['check in', 'checkin'] -> 'check(?:\\ in|in)'
+    """
+    trie: Dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End of a keyword
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        optional = '' in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if optional else group
+
+    return build(trie)
+
+
+class MessageClassifier:
+    """
+    Compiled multi-keyword matcher built from a category table
+    word_boundary=True stops 'help' matching inside 'helpful' - plurals
+('keys', 'problems') still match, like the old substring scans
+    """
+
+    def __init__(self,
+                 categories: Optional[List[Dict[str, Any]]] = None,
+                 word_boundary: bool = True,
+                 use_automaton: bool = True):
+        self.categories = categories if categories is not None else MESSAGE_CATEGORIES
+        self.word_boundary = word_boundary
+
+        # keyword -> category rank (lower rank = higher priority)
+        self._keyword_rank: Dict[str, int] = {}
+        for rank, category in enumerate(self.categories):
+            for keyword in category['keywords']:
+                self._keyword_rank.setdefault(keyword.lower(), rank)
+
+        self._automaton = None
+        if use_automaton and ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword, rank in self._keyword_rank.items():
+                self._automaton.add_word(keyword, (rank, len(keyword)))
+            self._automaton.make_automaton()
+            self.best_rank = self._best_rank_automaton
+        else:
+            # Regex fallback - one compiled alternation per priority level:
+            # _patterns[r] matches every keyword ranked above r
+            self._patterns = [self._compile(rank) for rank in range(len(self.categories) + 1)]
+            self.best_rank = self._best_rank_regex
+
+    def _compile(self, max_rank: int) -> Optional[re.Pattern]:
+        keywords = [k for k, rank in self._keyword_rank.items() if rank < max_rank]
+        if not keywords:
+            return None
+        pattern = _trie_pattern(keywords)
+        # The leading word boundary is checked by hand in best_rank - a pattern
+        # that starts with a literal lets the regex engine skip ahead quickly.
+        # Group 1 is the keyword itself, without a plural ending
+        return re.compile(f"({pattern})(?:e?s)?\\b" if self.word_boundary else f"({pattern})")
+
+    def _best_rank_automaton(self, message_text: str) -> Optional[int]:
+        """
+        Rank of the highest-priority category in the message, or None
+        One pass of the automaton reports every keyword occurrence
+        """
+        text = message_text.lower()
+        word_boundary = self.word_boundary
+        best = None
+        for end, (rank, length) in self._automaton.iter(text):
+            if best is not None and rank >= best:
+                continue
+            if word_boundary:
+                start = end - length + 1
+                if start and _is_word_char(text[start - 1]):
+                    continue  # Inside a longer word, e.g. 'un|help|ful'
+                if not _ends_word(text, end + 1):
+                    continue  # e.g. 'help|ful' - a plural ending is fine
+            best = rank
+            if rank == 0:
+                break  # Nothing can beat the top category
+        return best
+
+    def _best_rank_regex(self, message_text: str) -> Optional[int]:
+        """
+        Rank of the highest-priority category in the message, or None
+        The scan only ever moves forward: after each hit we keep searching from
+        that position with a smaller pattern that holds only higher-priority
+        keywords, so the text is still read once
+        """
+        text = message_text.lower()
+        keyword_rank = self._keyword_rank
+        word_boundary = self.word_boundary
+        pattern = self._patterns[-1]
+        best = None
+        position = 0
+        while pattern is not None:
+            match = pattern.search(text, position)
+            if match is None:
+                break
+            start = match.start()
+            if word_boundary and start and _is_word_char(text[start - 1]):
+                position = start + 1  # Inside a longer word, e.g. 'un|help|ful'
+                continue
+            best = keyword_rank[match.group(1)]
+            position = start
+            pattern = self._patterns[best]
+        return best
+
+    def classify(self, message_text: str) -> Dict[str, Any]:
+        """Classify one message in a single pass over its text"""
+        rank = self.best_rank(message_text)
+        if rank is None:
+            return dict(UNCLEAR_RESULT)
+        return dict(self.categories[rank]['result'])
+
+    def classify_many(self, message_texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Classify a whole batch in one pass
+        Repeated texts (common when a channel replays a backlog) are scanned once
+        """
+        ranks: Dict[str, Optional[int]] = {}
+        best_rank = self.best_rank
+        results = []
+        for text in message_texts:
+            if text not in ranks:
+                ranks[text] = best_rank(text)
+            rank = ranks[text]
+            results.append(dict(UNCLEAR_RESULT) if rank is None else dict(self.categories[rank]['result']))
+        return results
@@ -0,0 +1,343 @@
+"""
+PropFlow AI Metrics
+In-process counters and histograms, rolled up per host into daily ring buffers
+
+Updates are a dict increment on the event loop thread - no locks, no I/O.
+Per-host totals live in an 8-day ring of daily buckets, so "today" and
+"this week" are read straight from the buckets instead of rescanning events.
+Everything renders in Prometheus text format for scraping at /metrics.
+
+With several worker processes, start_sharing() pushes each worker's deltas
+to the shared state once a second, and the *_shared() reads return totals
+across all workers.
+"""
+
+from typing import Dict, Any, Callable, Iterable, List, Optional, Sequence, Tuple, Union
+from bisect import bisect_left
+from datetime import date
+import asyncio
+import json
+import math
+
+from event_log import EventLog, event_log
+
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic total per label set"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        self.values[label_values] = self.values.get(label_values, 0.0) + amount
+
+    def get(self, *label_values: str) -> float:
+        return self.values.get(label_values, 0.0)
+
+    def total(self) -> float:
+        return sum(self.values.values())
+
+    def render(self, values: Optional[Dict[LabelValues, float]] = None) -> Iterable[str]:
+        for labels, value in sorted((self.values if values is None else values).items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram:
+    """Fixed-bucket distribution per label set - observe() is one bisect"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [count per bucket..., +Inf count, sum, count]
+        self.values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *label_values: str):
+        row = self.values.get(label_values)
+        if row is None:
+            row = self.values[label_values] = [0.0] * (len(self.buckets) + 3)
+        row[bisect_left(self.buckets, value)] += 1
+        row[-2] += value
+        row[-1] += 1
+
+    def count(self, *label_values: str) -> int:
+        row = self.values.get(label_values)
+        return int(row[-1]) if row else 0
+
+    def mean(self, *label_values: str) -> Optional[float]:
+        row = self.values.get(label_values)
+        return row[-2] / row[-1] if row and row[-1] else None
+
+    def render(self, values: Optional[Dict[LabelValues, List[float]]] = None) -> Iterable[str]:
+        for labels, row in sorted((self.values if values is None else values).items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), row):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {_format_value(cumulative)}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(row[-2])}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {_format_value(row[-1])}"
+
+
+class Gauge:
+    """Current value read on demand from a callback (queue depth, cache size...)"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, help: str, read: Callable[[], Union[float, Dict[LabelValues, float]]],
+                 labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.read = read
+
+    def render(self) -> Iterable[str]:
+        value = self.read()
+        values = value if isinstance(value, dict) else {(): value}
+        for labels, v in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(v)}"
+
+
+class DailyRollup:
+    """
+    Ring of per-day totals for one host
+    A slot is reset the first time a new day lands on it - nothing to expire
+    """
+
+    def __init__(self, days: int = 8):
+        self._days = [-1] * days
+        self._totals: List[Dict[str, float]] = [{} for _ in range(days)]
+
+    def add(self, metric: str, amount: float, day: int):
+        slot = day % len(self._days)
+        if self._days[slot] != day:
+            self._days[slot] = day
+            self._totals[slot] = {}
+        totals = self._totals[slot]
+        totals[metric] = totals.get(metric, 0.0) + amount
+
+    def window(self, day: int, days: int = 1) -> Dict[str, float]:
+        """Totals for the `days` days ending on `day` (1 = just that day, 7 = trailing week)"""
+        result: Dict[str, float] = {}
+        for d in range(day - min(days, len(self._days)) + 1, day + 1):
+            slot = d % len(self._days)
+            if self._days[slot] == d:
+                for metric, value in self._totals[slot].items():
+                    result[metric] = result.get(metric, 0.0) + value
+        return result
+
+
+ALL_HOSTS = '*'
+
+
+def _series_key(name: str, labels: LabelValues, cell: Optional[int] = None) -> str:
+    return json.dumps([name, list(labels), cell], separators=(',', ':'))
+
+
+class MetricsRegistry:
+    """
+    Named metrics + per-host daily rollups
+    counter()/histogram() return the existing metric when the name is taken
+    """
+
+    def __init__(self, rollup_days: int = 8, event_log: EventLog = event_log):
+        self.rollup_days = rollup_days
+        self.event_log = event_log
+        self._metrics: Dict[str, Any] = {}
+        self._rollups: Dict[str, DailyRollup] = {}
+        # Multi-worker mode: what this worker has pushed, and rollup additions not pushed yet
+        self.shared: Any = None
+        self._pushed: Dict[str, float] = {}
+        self._unpushed_rollups: Dict[Tuple[str, int], Dict[str, float]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, *args, **kwargs)
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets)
+
+    def gauge(self, name: str, help: str, read: Callable, labelnames: Sequence[str] = ()) -> Gauge:
+        """Register (or re-point) a callback gauge"""
+        gauge = self._metrics[name] = Gauge(name, help, read, labelnames)
+        return gauge
+
+    def record(self, metric: str, amount: float = 1.0, host_ids: Iterable[str] = (), day: Optional[int] = None):
+        """Add to today's rollup for every given host and for the all-hosts total"""
+        day = date.today().toordinal() if day is None else day
+        for host_id in (ALL_HOSTS, *host_ids):
+            rollup = self._rollups.get(host_id)
+            if rollup is None:
+                rollup = self._rollups[host_id] = DailyRollup(self.rollup_days)
+            rollup.add(metric, amount, day)
+            if self.shared is not None:
+                totals = self._unpushed_rollups.setdefault((host_id, day), {})
+                totals[metric] = totals.get(metric, 0.0) + amount
+
+    def today(self, host_id: str = ALL_HOSTS) -> Dict[str, float]:
+        return self.window(host_id, 1)
+
+    def this_week(self, host_id: str = ALL_HOSTS) -> Dict[str, float]:
+        return self.window(host_id, 7)
+
+    def window(self, host_id: str, days: int) -> Dict[str, float]:
+        rollup = self._rollups.get(host_id)
+        return rollup.window(date.today().toordinal(), days) if rollup is not None else {}
+
+    def render_prometheus(self, merged: Optional[Dict[str, Dict[LabelValues, Any]]] = None) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines: List[str] = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            if merged is not None and metric.kind != 'gauge':
+                lines.extend(metric.render(merged.get(name, {})))
+            else:
+                lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    # ===== MULTI-WORKER SHARING =====
+
+    def start_sharing(self, shared: Any, interval: float = 1.0):
+        """Push this worker's counters, histograms and rollups to the shared state every interval"""
+        if self._task is None:
+            self.shared = shared
+            self._task = asyncio.create_task(self._push_loop(interval))
+
+    async def stop_sharing(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            await self.push()  # Don't lose the last second
+        self.shared = None
+
+    def _series(self) -> Dict[str, float]:
+        """Every counter value and histogram cell, keyed for the shared store"""
+        series: Dict[str, float] = {}
+        for name, metric in self._metrics.items():
+            if metric.kind == 'counter':
+                for labels, value in metric.values.items():
+                    series[_series_key(name, labels)] = value
+            elif metric.kind == 'histogram':
+                for labels, row in metric.values.items():
+                    for cell, value in enumerate(row):
+                        series[_series_key(name, labels, cell)] = value
+        return series
+
+    async def push(self):
+        """Add what changed since the last push to the shared totals"""
+        series = self._series()
+        deltas = {key: value - self._pushed.get(key, 0.0) for key, value in series.items()
+                  if value != self._pushed.get(key, 0.0)}
+        if deltas:
+            await self.shared.incr_many('metrics', deltas)
+            self._pushed.update(series)
+        rollups, self._unpushed_rollups = self._unpushed_rollups, {}
+        try:
+            while rollups:
+                (host_id, day), totals = next(iter(rollups.items()))
+                await self.shared.incr_many(f"rollup:{day}:{host_id}", totals, ttl=(self.rollup_days + 1) * 86400)
+                del rollups[(host_id, day)]
+        finally:
+            for key, totals in rollups.items():  # Not pushed - try again next time
+                pending = self._unpushed_rollups.setdefault(key, {})
+                for metric, value in totals.items():
+                    pending[metric] = pending.get(metric, 0.0) + value
+
+    async def _push_loop(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.push()
+            except Exception as e:
+                self.event_log.warning('metrics.push_failed', error=str(e))
+
+    async def window_shared(self, host_id: str, days: int) -> Dict[str, float]:
+        """window() summed across every worker"""
+        if self.shared is None:
+            return self.window(host_id, days)
+        today = date.today().toordinal()
+        result: Dict[str, float] = {}
+        for day in range(today - min(days, self.rollup_days) + 1, today + 1):
+            for totals in (await self.shared.get_counters(f"rollup:{day}:{host_id}"),
+                           self._unpushed_rollups.get((host_id, day), {})):
+                for metric, value in totals.items():
+                    result[metric] = result.get(metric, 0.0) + value
+        return result
+
+    async def merged_values(self) -> Optional[Dict[str, Dict[LabelValues, Any]]]:
+        """Counter and histogram values across every worker (None with one worker)"""
+        if self.shared is None:
+            return None
+        totals = await self.shared.get_counters('metrics')
+        for key, value in self._series().items():
+            totals[key] = totals.get(key, 0.0) + value - self._pushed.get(key, 0.0)
+        merged: Dict[str, Dict[LabelValues, Any]] = {}
+        for key, value in totals.items():
+            name, labels, cell = json.loads(key)
+            metric = self._metrics.get(name)
+            if metric is None:
+                continue
+            values = merged.setdefault(name, {})
+            if cell is None:
+                values[tuple(labels)] = value
+            else:
+                row = values.setdefault(tuple(labels), [0.0] * (len(metric.buckets) + 3))
+                row[cell] = value
+        return merged
+
+    async def render_prometheus_shared(self) -> str:
+        return self.render_prometheus(await self.merged_values())
+
+    async def mean_shared(self, histogram: Histogram, *label_values: str) -> Optional[float]:
+        """Histogram.mean() across every worker"""
+        merged = await self.merged_values()
+        if merged is None:
+            return histogram.mean(*label_values)
+        row = merged.get(histogram.name, {}).get(label_values)
+        return row[-2] / row[-1] if row and row[-1] else None
+
+
+# Default registry for subsystems built on their own (benchmarks, scripts) -
+# the service gives itself and everything it builds a registry of its own
+metrics = MetricsRegistry()
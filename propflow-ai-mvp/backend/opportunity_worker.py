@@ -0,0 +1,156 @@
+"""
+PropFlow AI Opportunity Worker
+Money opportunities precomputed in the background, read by the dashboard in O(1)
+
+Each known host is refreshed on a jittered schedule so thousands of hosts
+never refresh at the same moment. Booking events can ask for an immediate
+refresh. The dashboard just reads the latest result and its timestamp.
+"""
+
+from typing import Dict, Any, Callable, Awaitable, List, Optional, Tuple
+from dataclasses import dataclass
+import asyncio
+import heapq
+import random
+import time
+
+from event_log import EventLog, event_log
+
+
+@dataclass
+class OpportunityResult:
+    opportunity: Any  # Optional[MoneyOpportunity]
+    computed_at: float  # time.time()
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.computed_at
+
+
+class OpportunityPrecomputer:
+    """
+    Background scheduler that keeps a host_id -> OpportunityResult table fresh
+    compute(host_id) does the actual detection work
+    """
+
+    def __init__(self,
+                 compute: Callable[[str], Awaitable[Any]],
+                 refresh_interval: float = 300.0,
+                 jitter: float = 0.2,
+                 max_age: float = 900.0,
+                 concurrency: int = 8,
+                 on_update: Optional[Callable[[str], None]] = None,
+                 event_log: EventLog = event_log):
+        self.compute = compute
+        self.refresh_interval = refresh_interval
+        self.jitter = jitter
+        self.max_age = max_age
+        self.concurrency = concurrency
+        self.on_update = on_update
+        self.event_log = event_log
+
+        self.results: Dict[str, OpportunityResult] = {}
+        # Min-heap of (due time, host_id); _due holds each host's current due time,
+        # so entries superseded by an on-demand refresh are skipped when popped
+        self._schedule: List[Tuple[float, str]] = []
+        self._due: Dict[str, float] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: set = set()  # Strong refs so refresh tasks aren't garbage-collected
+        self.stats = {'refreshes': 0, 'on_demand': 0, 'errors': 0}
+
+    def get(self, host_id: str) -> Optional[OpportunityResult]:
+        """Latest result if it's still fresh enough to show, else None"""
+        result = self.results.get(host_id)
+        if result is None or result.age_seconds > self.max_age:
+            return None
+        return result
+
+    def store(self, host_id: str, opportunity: Any):
+        """Save a result computed elsewhere (e.g. inline on a first dashboard load)"""
+        self.results[host_id] = OpportunityResult(opportunity, time.time())
+        self.register_host(host_id)
+
+    def _next_delay(self) -> float:
+        spread = self.refresh_interval * self.jitter
+        return self.refresh_interval + random.uniform(-spread, spread)
+
+    def _schedule_at(self, host_id: str, due: float):
+        self._due[host_id] = due
+        heapq.heappush(self._schedule, (due, host_id))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def register_host(self, host_id: str):
+        """Start refreshing this host in the background (spread across one interval)"""
+        if host_id not in self._due:
+            self._schedule_at(host_id, time.monotonic() + random.uniform(0, self.refresh_interval))
+
+    def request_refresh(self, host_id: str):
+        """Recompute this host as soon as possible (e.g. a new booking arrived)"""
+        self.stats['on_demand'] += 1
+        self._schedule_at(host_id, time.monotonic())
+
+    async def refresh(self, host_id: str):
+        try:
+            opportunity = await self.compute(host_id)
+        except Exception as e:
+            self.stats['errors'] += 1
+            self.event_log.warning('opportunity.refresh_failed', host_id=host_id, error=str(e))
+            return
+        previous = self.results.get(host_id)
+        self.results[host_id] = OpportunityResult(opportunity, time.time())
+        self.stats['refreshes'] += 1
+        if self.on_update is not None and (previous is None or previous.opportunity != opportunity):
+            self.on_update(host_id)
+
+    async def _run(self):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def refresh_limited(host_id: str):
+            async with semaphore:
+                await self.refresh(host_id)
+
+        while True:
+            now = time.monotonic()
+            while self._schedule and self._schedule[0][0] <= now:
+                due, host_id = heapq.heappop(self._schedule)
+                if self._due.get(host_id) != due:
+                    continue  # Superseded by an on-demand refresh
+                self._schedule_at(host_id, now + self._next_delay())
+                task = asyncio.create_task(refresh_limited(host_id))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+
+            self._wakeup.clear()
+            timeout = self._schedule[0][0] - now if self._schedule else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """Start the background scheduler (called from the app startup hook)"""
+        if self._task is not None and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._inflight):
+            task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'hosts_tracked': len(self._due),
+            'results_cached': len(self.results),
+            'refresh_interval_seconds': self.refresh_interval,
+        }
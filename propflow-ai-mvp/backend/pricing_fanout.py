@@ -0,0 +1,133 @@
+"""
+PropFlow AI Pricing Fan-Out
+Push price updates to many properties and channels at once - safely
+
+One click can touch hundreds of listings. Instead of updating them one by one,
+this engine runs them in parallel with two limits:
+1. How many properties are in flight at the same time
+2. How many calls each platform (Airbnb, VRBO, direct) gets at the same time
+"""
+
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+from dataclasses import dataclass, field
+import asyncio
+import time
+
+
+# Smart defaults - conservative enough to stay under channel rate limits
+DEFAULT_PLATFORM_LIMITS = {
+    'airbnb': 20,
+    'vrbo': 10,
+    'direct': 50,
+}
+DEFAULT_MAX_CONCURRENT_PROPERTIES = 50
+
+
+@dataclass
+class PlatformPushResult:
+    platform: str
+    success: bool
+    elapsed_seconds: float
+    error: Optional[str] = None
+
+
+@dataclass
+class FanoutReport:
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    max_in_flight: int = 0
+
+    def timing(self) -> Dict[str, Any]:
+        """Timing stats for the whole batch"""
+        items = len(self.results) + len(self.errors)
+        return {
+            'elapsed_seconds': round(self.elapsed_seconds, 4),
+            'items': items,
+            'succeeded': len(self.results),
+            'failed': len(self.errors),
+            'max_in_flight': self.max_in_flight,
+            'items_per_second': round(items / self.elapsed_seconds, 1) if self.elapsed_seconds > 0 else None,
+        }
+
+
+class PricingFanout:
+    """
+    Bounded-concurrency fan-out engine
+    Every property and every platform call runs in parallel, within limits
+    """
+
+    def __init__(self,
+                 platform_limits: Optional[Dict[str, int]] = None,
+                 max_concurrent_properties: int = DEFAULT_MAX_CONCURRENT_PROPERTIES):
+        self.platform_limits = dict(platform_limits or DEFAULT_PLATFORM_LIMITS)
+        self.max_concurrent_properties = max_concurrent_properties
+        self._platform_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _platform_semaphore(self, platform: str) -> asyncio.Semaphore:
+        # Created lazily so the semaphores bind to the running event loop
+        semaphore = self._platform_semaphores.get(platform)
+        if semaphore is None:
+            limit = self.platform_limits.get(platform, DEFAULT_MAX_CONCURRENT_PROPERTIES)
+            semaphore = asyncio.Semaphore(limit)
+            self._platform_semaphores[platform] = semaphore
+        return semaphore
+
+    async def run(self, items: List[str],
+                  worker: Callable[[str], Awaitable[Dict[str, Any]]]) -> FanoutReport:
+        """
+        Run worker(item) for every item with bounded concurrency
+        One failing item never stops the rest - errors are reported per item
+        """
+        report = FanoutReport()
+        semaphore = asyncio.Semaphore(self.max_concurrent_properties)
+        in_flight = 0
+
+        async def run_one(item: str):
+            nonlocal in_flight
+            async with semaphore:
+                in_flight += 1
+                report.max_in_flight = max(report.max_in_flight, in_flight)
+                try:
+                    return await worker(item)
+                finally:
+                    in_flight -= 1
+
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*(run_one(item) for item in items), return_exceptions=True)
+        report.elapsed_seconds = time.perf_counter() - started
+
+        for item, outcome in zip(items, outcomes):
+            if isinstance(outcome, BaseException):
+                report.errors.append({'item': item, 'error': str(outcome) or type(outcome).__name__})
+            else:
+                report.results.append(outcome)
+
+        return report
+
+    async def push_to_platforms(self, platforms: List[str],
+                                push: Callable[[str], Awaitable[Any]]) -> List[PlatformPushResult]:
+        """
+        Call push(platform) for every platform in parallel
+        Each platform has its own concurrency limit shared across all properties
+        """
+
+        async def push_one(platform: str) -> PlatformPushResult:
+            async with self._platform_semaphore(platform):
+                started = time.perf_counter()
+                try:
+                    await push(platform)
+                except Exception as e:
+                    return PlatformPushResult(
+                        platform=platform,
+                        success=False,
+                        elapsed_seconds=time.perf_counter() - started,
+                        error=str(e) or type(e).__name__
+                    )
+                return PlatformPushResult(
+                    platform=platform,
+                    success=True,
+                    elapsed_seconds=time.perf_counter() - started
+                )
+
+        return list(await asyncio.gather(*(push_one(p) for p in platforms)))
@@ -0,0 +1,138 @@
+"""
+PropFlow AI Live Profiler
+Profile live traffic for a few seconds, on demand - for /debug/profile
+
+Two modes. 'sample' (default) looks at the event loop thread's stack every
+few milliseconds from a side thread - low overhead, safe in production - and
+returns collapsed stacks ready for flamegraph.pl / speedscope. 'cprofile'
+runs cProfile on the loop thread for the window and returns the pstats table;
+exact call counts, but it slows every call while it runs.
+
+Disabled unless PROPFLOW_ENABLE_PROFILING=1.
+"""
+
+from typing import Dict, List, Tuple
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+
+
+PROFILING_ENABLED = os.environ.get('PROPFLOW_ENABLE_PROFILING', '').lower() in ('1', 'true', 'yes')
+MAX_PROFILE_SECONDS = 60.0
+
+# Leaf frames that mean the loop was waiting for I/O, not working
+_IDLE_FUNCTIONS = {'select', 'poll', 'epoll', '_run_once'}
+
+
+class ProfilerBusy(Exception):
+    """Only one profile can run at a time"""
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class LiveProfiler:
+    """
+    One-at-a-time profiler for the thread running the event loop
+    capture() returns a plain-text report
+    """
+
+    def __init__(self):
+        self._running = False
+        self.stats = {'profiles': 0, 'rejected': 0}
+
+    async def capture(self, seconds: float = 10.0, mode: str = 'sample', limit: int = 40,
+                      interval: float = 0.005, sort: str = 'cumulative') -> str:
+        if mode not in ('sample', 'cprofile'):
+            raise ValueError("mode must be 'sample' or 'cprofile'")
+        if self._running:
+            self.stats['rejected'] += 1
+            raise ProfilerBusy("A profile is already running")
+        seconds = min(max(seconds, 0.1), MAX_PROFILE_SECONDS)
+        self._running = True
+        try:
+            self.stats['profiles'] += 1
+            if mode == 'cprofile':
+                return await self._cprofile(seconds, limit, sort)
+            return await self._sample(seconds, limit, interval)
+        finally:
+            self._running = False
+
+    async def _cprofile(self, seconds: float, limit: int, sort: str) -> str:
+        # Everything the loop runs while we sleep is attributed to this thread's profile
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profile.disable()
+        out = io.StringIO()
+        out.write(f"cProfile of the event loop thread for {seconds:.1f}s\n\n")
+        stats = pstats.Stats(profile, stream=out)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    async def _sample(self, seconds: float, limit: int, interval: float) -> str:
+        target = threading.get_ident()  # The event loop thread - we're running on it
+        stacks: Dict[Tuple[str, ...], int] = {}
+        samples = [0, 0]  # total, idle
+        done = threading.Event()
+
+        def sampler():
+            while not done.wait(interval):
+                frame = sys._current_frames().get(target)
+                if frame is None:
+                    continue
+                samples[0] += 1
+                if frame.f_code.co_name in _IDLE_FUNCTIONS:
+                    samples[1] += 1
+                    continue
+                stack: List[str] = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                key = tuple(reversed(stack))
+                stacks[key] = stacks.get(key, 0) + 1
+
+        thread = threading.Thread(target=sampler, name='propflow-profiler', daemon=True)
+        started = time.perf_counter()
+        thread.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            done.set()
+            await asyncio.to_thread(thread.join)
+        return self._format_samples(stacks, samples[0], samples[1], time.perf_counter() - started, interval, limit)
+
+    @staticmethod
+    def _format_samples(stacks: Dict[Tuple[str, ...], int], total: int, idle: int,
+                        elapsed: float, interval: float, limit: int) -> str:
+        busy = total - idle
+        own: Dict[str, int] = {}
+        for stack, count in stacks.items():
+            own[stack[-1]] = own.get(stack[-1], 0) + count
+
+        lines = [
+            f"Stack samples of the event loop thread: {total} over {elapsed:.1f}s (every {interval * 1000:.0f} ms)",
+            f"Loop busy in {busy / total:.1%} of samples" if total else "No samples taken",
+            "",
+            "Top functions (self samples):",
+        ]
+        for label, count in sorted(own.items(), key=lambda item: -item[1])[:limit]:
+            lines.append(f"  {count:7d}  {count / max(busy, 1):6.1%}  {label}")
+        lines += ["", "Collapsed stacks (flamegraph.pl / speedscope input):"]
+        for stack, count in sorted(stacks.items(), key=lambda item: -item[1])[:limit]:
+            lines.append(f"{';'.join(stack)} {count}")
+        return '\n'.join(lines) + '\n'
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
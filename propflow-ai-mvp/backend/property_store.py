@@ -0,0 +1,145 @@
+"""
+PropFlow AI Property Info Store
+Guest-facing property details (WiFi, check-in, amenities) loaded once and indexed
+
+Records live in a local JSON file keyed by property_id. Lookups are a single
+dict access that returns a shared immutable record - nothing is built per message.
+Edit the file and the store picks up just the changed entries, no restart needed.
+"""
+
+from typing import Dict, Any, Callable, List, NamedTuple, Optional, Tuple
+import asyncio
+import json
+import os
+
+from event_log import EventLog, event_log
+
+
+DEFAULT_STORE_PATH = os.environ.get(
+    'PROPFLOW_PROPERTY_INFO_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'property_info.json')
+)
+
+
+class PropertyInfo(NamedTuple):
+    wifi_password: str
+    wifi_network: str
+    checkin_time: str
+    lockbox_code: str
+    amenities: Tuple[str, ...]
+    name: str = ''
+    lat: Optional[float] = None   # Location - used to find nearby cleaners
+    lng: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PropertyInfo':
+        return cls(
+            wifi_password=data['wifi_password'],
+            wifi_network=data['wifi_network'],
+            checkin_time=data['checkin_time'],
+            lockbox_code=data['lockbox_code'],
+            amenities=tuple(data.get('amenities', ())),
+            name=data.get('name', ''),
+            lat=data.get('lat'),
+            lng=data.get('lng')
+        )
+
+
+# Smart default for properties we don't know yet
+DEFAULT_PROPERTY_INFO = PropertyInfo(
+    wifi_password='Guest2024!',
+    wifi_network='Guest_WiFi',
+    checkin_time='3:00 PM',
+    lockbox_code='Contact host',
+    amenities=('WiFi', 'Kitchen', 'Basic amenities')
+)
+
+
+class PropertyInfoStore:
+    """
+    In-memory property_id -> PropertyInfo index backed by a JSON file
+    reload() applies only changed entries and reports them via on_change
+    """
+
+    def __init__(self,
+                 path: str = DEFAULT_STORE_PATH,
+                 on_change: Optional[Callable[[str], None]] = None,
+                 event_log: EventLog = event_log):
+        self.path = path
+        self.on_change = on_change
+        self.event_log = event_log
+        self._records: Dict[str, PropertyInfo] = {}
+        self._mtime: Optional[float] = None
+        self._watch_task: Optional[asyncio.Task] = None
+        self.reload()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, property_id: str) -> PropertyInfo:
+        """O(1) lookup - unknown properties get the smart default"""
+        return self._records.get(property_id, DEFAULT_PROPERTY_INFO)
+
+    def _read_file(self) -> Dict[str, PropertyInfo]:
+        with open(self.path, encoding='utf-8') as f:
+            raw = json.load(f)
+        return {str(property_id): PropertyInfo.from_dict(data) for property_id, data in raw.items()}
+
+    def reload(self, force: bool = False) -> List[str]:
+        """
+        Re-read the file if it changed and apply only the differences
+        Returns the property_ids that were added, changed or removed
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return []
+        if not force and mtime == self._mtime:
+            return []
+
+        first_load = self._mtime is None
+        fresh = self._read_file()
+        changed = [pid for pid, record in fresh.items() if self._records.get(pid) != record]
+        removed = [pid for pid in self._records if pid not in fresh]
+
+        for pid in changed:
+            self._records[pid] = fresh[pid]
+        for pid in removed:
+            del self._records[pid]
+        self._mtime = mtime
+
+        if self.on_change is not None and not first_load:
+            for pid in changed + removed:
+                self.on_change(pid)
+        return changed + removed
+
+    def upsert(self, property_id: str, info: PropertyInfo):
+        """Update one record in memory (e.g. host edited WiFi details)"""
+        if self._records.get(property_id) == info:
+            return
+        self._records[property_id] = info
+        if self.on_change is not None:
+            self.on_change(property_id)
+
+    async def _watch(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.reload()
+            except (OSError, ValueError, KeyError) as e:
+                # A half-written or invalid file - keep serving the last good data
+                self.event_log.warning('property_info.reload_skipped', error=str(e))
+
+    def start_watching(self, interval: float = 5.0):
+        """Poll the backing file for changes in the background"""
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self._watch(interval))
+
+    async def stop_watching(self):
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
@@ -0,0 +1,169 @@
+"""
+PropFlow AI Rate Calendar
+Nightly prices for a 365-day horizon, with min-stay and availability per night
+
+One compact array per property instead of a single "price". Range updates
+("+40% for event dates") touch only those nights, and diff() returns just the
+date ranges that changed since the last publish - so channel pushes send the
+delta, not the whole calendar.
+"""
+
+from typing import List, Optional
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import numpy as np
+
+
+HORIZON_DAYS = 365
+
+
+@dataclass
+class RateChange:
+    start_date: date   # First night of the range
+    end_date: date     # Night after the range (exclusive)
+    nightly_price: float
+    min_stay: int
+    available: bool
+
+    def to_dict(self):
+        return {
+            'start_date': self.start_date.isoformat(),
+            'end_date': self.end_date.isoformat(),
+            'nightly_price': self.nightly_price,
+            'min_stay': self.min_stay,
+            'available': self.available,
+        }
+
+
+class RateCalendar:
+    """
+    Per-property nightly rate calendar
+    prices: float32 per night, min_stay: uint16 per night, availability: packed bitmap
+    """
+
+    __slots__ = ('property_id', 'start_date', 'base_price', 'prices', 'min_stay', '_available_bits',
+                 '_published_prices', '_published_min_stay', '_published_available_bits')
+
+    def __init__(self, property_id: str, base_price: float,
+                 start_date: Optional[date] = None, horizon_days: int = HORIZON_DAYS,
+                 min_stay: int = 1):
+        self.property_id = property_id
+        self.base_price = base_price
+        self.start_date = start_date or date.today()
+        self.prices = np.full(horizon_days, base_price, dtype=np.float32)
+        self.min_stay = np.full(horizon_days, min_stay, dtype=np.uint16)
+        self._available_bits = np.packbits(np.ones(horizon_days, dtype=bool))
+        self.mark_published()  # A new calendar starts in sync with the channels
+
+    @property
+    def horizon_days(self) -> int:
+        return len(self.prices)
+
+    @property
+    def available(self) -> np.ndarray:
+        return np.unpackbits(self._available_bits, count=self.horizon_days).astype(bool)
+
+    def _slice(self, start: date, end: date) -> slice:
+        """Date range [start, end) -> array slice, clipped to the horizon"""
+        first = max((start - self.start_date).days, 0)
+        last = min((end - self.start_date).days, self.horizon_days)
+        return slice(first, max(first, last))
+
+    def price_on(self, night: date) -> float:
+        return float(self.prices[(night - self.start_date).days])
+
+    def published_price_on(self, night: date) -> float:
+        """What the channels have for this night - the baseline until a push is confirmed"""
+        return float(self._published_prices[(night - self.start_date).days])
+
+    def set_price(self, start: date, end: date, price: float):
+        self.prices[self._slice(start, end)] = price
+
+    def adjust_price(self, start: date, end: date, percent: float = 0.0, amount: float = 0.0):
+        """e.g. adjust_price(fri, mon, percent=40) for +40% on event nights"""
+        nights = self._slice(start, end)
+        self.prices[nights] = self.prices[nights] * (1 + percent / 100.0) + amount
+
+    def set_min_stay(self, start: date, end: date, nights: int):
+        self.min_stay[self._slice(start, end)] = nights
+
+    def set_available(self, start: date, end: date, available: bool):
+        bits = self.available
+        bits[self._slice(start, end)] = available
+        self._available_bits = np.packbits(bits)
+
+    def roll_forward(self, today: date):
+        """Slide the horizon so it starts today; new nights get the base price"""
+        shift = (today - self.start_date).days
+        if shift <= 0:
+            return
+        shift = min(shift, self.horizon_days)
+        keep = self.horizon_days - shift
+        available = self.available
+        published_available = np.unpackbits(self._published_available_bits, count=self.horizon_days).astype(bool)
+        for current, published, fill in ((self.prices, self._published_prices, self.base_price),
+                                         (self.min_stay, self._published_min_stay, 1),
+                                         (available, published_available, True)):
+            current[:keep] = current[shift:]
+            current[keep:] = fill
+            published[:keep] = published[shift:]
+            published[keep:] = fill
+        self._available_bits = np.packbits(available)
+        self._published_available_bits = np.packbits(published_available)
+        self.start_date = today
+
+    def diff(self) -> List[RateChange]:
+        """
+        Date ranges that changed since the last publish
+        Consecutive changed nights with identical values are merged into one range
+        """
+        available = self.available
+        published_available = np.unpackbits(self._published_available_bits, count=self.horizon_days).astype(bool)
+        changed = ((self.prices != self._published_prices)
+                   | (self.min_stay != self._published_min_stay)
+                   | (available != published_available))
+        nights = np.flatnonzero(changed)
+        if len(nights) == 0:
+            return []
+
+        # A new range starts wherever nights aren't consecutive or any value changes
+        breaks = np.ones(len(nights), dtype=bool)
+        breaks[1:] = ((np.diff(nights) != 1)
+                      | (self.prices[nights[1:]] != self.prices[nights[:-1]])
+                      | (self.min_stay[nights[1:]] != self.min_stay[nights[:-1]])
+                      | (available[nights[1:]] != available[nights[:-1]]))
+        starts = np.flatnonzero(breaks)
+        ends = np.append(starts[1:], len(nights))
+
+        return [
+            RateChange(
+                start_date=self.start_date + timedelta(days=int(nights[s])),
+                end_date=self.start_date + timedelta(days=int(nights[e - 1]) + 1),
+                nightly_price=round(float(self.prices[nights[s]]), 2),
+                min_stay=int(self.min_stay[nights[s]]),
+                available=bool(available[nights[s]])
+            )
+            for s, e in zip(starts, ends)
+        ]
+
+    def apply_published(self, changes: List[RateChange]):
+        """
+        Ranges someone else already pushed to the channels - set and mark them
+        published, leaving any other unpublished nights as they are
+        """
+        available = self.available
+        published_available = np.unpackbits(self._published_available_bits, count=self.horizon_days).astype(bool)
+        for change in changes:
+            nights = self._slice(change.start_date, change.end_date)
+            self.prices[nights] = self._published_prices[nights] = change.nightly_price
+            self.min_stay[nights] = self._published_min_stay[nights] = change.min_stay
+            available[nights] = published_available[nights] = change.available
+        self._available_bits = np.packbits(available)
+        self._published_available_bits = np.packbits(published_available)
+
+    def mark_published(self):
+        """Remember the current calendar as what the channels now have"""
+        self._published_prices = self.prices.copy()
+        self._published_min_stay = self.min_stay.copy()
+        self._published_available_bits = self._available_bits.copy()
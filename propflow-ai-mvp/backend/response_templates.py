@@ -0,0 +1,91 @@
+"""
+PropFlow AI Response Templates
+Auto-response templates compiled once, rendered on demand, cached per property
+
+Common questions (WiFi, check-in, amenities) get the same answer every time
+for a given property, so after the first render a reply is a dictionary lookup.
+"""
+
+from typing import Dict, Any, Callable, Optional, Tuple
+from string import Formatter
+
+
+RESPONSE_TEMPLATES = {
+    'wifi_question': "Hi! The WiFi password is: {wifi_password}. Network name: {wifi_network}. Enjoy your stay! 😊",
+
+    'checkin_question': "Welcome! Check-in is at {checkin_time}. The lockbox code is: {lockbox_code}. Key is inside the black lockbox by the door. Let me know if you need anything! 🗝️",
+
+    'amenities_question': "You have access to: {amenities}. Everything you need should be there. Have a wonderful stay! 🏠"
+}
+
+FALLBACK_RESPONSE = "Thanks for your message! I'll get back to you shortly. 😊"
+
+
+class CompiledTemplate:
+    """A response template parsed once into the property fields it needs"""
+
+    __slots__ = ('text', 'fields')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.fields = tuple(field for _, field, _, _ in Formatter().parse(text) if field)
+
+    def render(self, property_info: Any) -> str:
+        values = {}
+        for field in self.fields:
+            value = getattr(property_info, field)
+            # Lists (e.g. amenities) read naturally as "a, b, c"
+            values[field] = ', '.join(value) if isinstance(value, (list, tuple)) else value
+        return self.text.format_map(values)
+
+
+class TemplateRegistry:
+    """
+    Compiled auto-response templates with a per-(property, category) reply cache
+    Call invalidate(property_id) whenever that property's info changes
+    """
+
+    def __init__(self,
+                 templates: Optional[Dict[str, str]] = None,
+                 fallback: str = FALLBACK_RESPONSE,
+                 max_cached_replies: int = 50000):
+        self.templates = {
+            category: CompiledTemplate(text)
+            for category, text in (templates or RESPONSE_TEMPLATES).items()
+        }
+        self.fallback = fallback
+        self.max_cached_replies = max_cached_replies
+        self._replies: Dict[Tuple[str, str], str] = {}
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def render(self, category: str, property_id: str,
+               load_property_info: Callable[[str], Any]) -> str:
+        """
+        Rendered reply for this property and category
+        Property info is only loaded on a cache miss
+        """
+        key = (property_id, category)
+        reply = self._replies.get(key)
+        if reply is not None:
+            self.stats['hits'] += 1
+            return reply
+
+        self.stats['misses'] += 1
+        template = self.templates.get(category)
+        if template is None:
+            return self.fallback
+
+        reply = template.render(load_property_info(property_id))
+        if len(self._replies) >= self.max_cached_replies:
+            # Evict the oldest entry - dicts keep insertion order
+            del self._replies[next(iter(self._replies))]
+        self._replies[key] = reply
+        return reply
+
+    def invalidate(self, property_id: Optional[str] = None):
+        """Drop cached replies for one property (or all when property_id is None)"""
+        if property_id is None:
+            self._replies.clear()
+            return
+        for category in self.templates:
+            self._replies.pop((property_id, category), None)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+PropFlow AI Seed Data
+Synthetic properties, bookings and guest messages for one host - up to 100k+ properties
+
+Writes through the repository in batched transactions, so the same command
+seeds the local SQLite file or a PostgreSQL database (PROPFLOW_DATABASE_URL
+or --database-url). The same seed always produces the same rows.
+
+Run with: python seed_db.py --host host_100k --properties 100000
+"""
+
+from datetime import date, timedelta
+from typing import Iterator, List, Tuple
+import argparse
+import asyncio
+import random
+import time
+
+from repository import (create_repository, PropertyRecord, DEFAULT_DATABASE_URL,
+                        MESSAGE_AUTO_REPLIED, MESSAGE_NEEDS_HUMAN)
+
+
+_NAMES = ('Loft', 'House', 'Studio', 'Villa', 'Cottage', 'Penthouse', 'Cabin', 'Suite')
+_AREAS = ('Manhattan', 'Brooklyn', 'Queens', 'Harlem', 'SoHo', 'Astoria', 'Williamsburg', 'Chelsea')
+_CLEANERS = ('Maria', 'Carlos', 'Ana', 'James', None)
+_GUESTS = ('Jake & Sarah', 'The Millers', 'Priya', 'Tom', 'Lena', 'Omar & Family')
+_CHANNELS = ('airbnb', 'vrbo', 'direct')
+
+
+def synthetic_rows(host_id: str, properties: int, bookings_per_property: int, messages_per_property: int,
+                   open_message_rate: float, seed: int = 0) -> Iterator[Tuple[PropertyRecord, List[tuple], List[tuple]]]:
+    """(property, its bookings, its messages) for each synthetic property"""
+    rng = random.Random(f"{seed}:{host_id}")
+    today = date.today()
+    for i in range(properties):
+        property_id = f"{host_id}-{i}"
+        cleaning = rng.random() < 0.15
+        record = PropertyRecord(
+            id=property_id,
+            name=f"{rng.choice(_AREAS)} {rng.choice(_NAMES)} {i}",
+            weekly_revenue=float(rng.randrange(800, 4200)),
+            is_clean=not cleaning,
+            cleaner_name=rng.choice(_CLEANERS),
+            cleaning_time='3:00 PM' if cleaning else None,
+        )
+        bookings = []
+        check_in = today - timedelta(days=rng.randrange(0, 14))  # Some stays are already over
+        for n in range(bookings_per_property):
+            nights = rng.randrange(1, 8)
+            bookings.append((property_id, rng.choice(_CHANNELS), f"{property_id}-b{n}",
+                             check_in, check_in + timedelta(days=nights), rng.choice(_GUESTS)))
+            check_in += timedelta(days=nights + rng.randrange(0, 5))
+        messages = [
+            (f"{property_id}-m{n}", property_id,
+             MESSAGE_NEEDS_HUMAN if rng.random() < open_message_rate else MESSAGE_AUTO_REPLIED)
+            for n in range(messages_per_property)
+        ]
+        yield record, bookings, messages
+
+
+async def seed(database_url: str, host_id: str, properties: int, bookings_per_property: int = 3,
+               messages_per_property: int = 2, open_message_rate: float = 0.05, batch_size: int = 5000,
+               seed_value: int = 0):
+    repository = create_repository(database_url)
+    await repository.start()
+    started = time.perf_counter()
+    try:
+        batch: List[Tuple[PropertyRecord, List[tuple], List[tuple]]] = []
+
+        async def flush():
+            await repository.upsert_properties(host_id, [record for record, _, _ in batch])
+            await repository.upsert_bookings([b for _, bookings, _ in batch for b in bookings])
+            await repository.record_messages([m for _, _, messages in batch for m in messages])
+            batch.clear()
+
+        rows = synthetic_rows(host_id, properties, bookings_per_property, messages_per_property,
+                              open_message_rate, seed_value)
+        for written, row in enumerate(rows, 1):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                await flush()
+                print(f"  {written:,}/{properties:,} properties", end='\r', flush=True)
+        await flush()
+        if properties >= batch_size:
+            print()  # Past the progress line
+        counts = await repository.counts()
+    finally:
+        await repository.close()
+
+    print(f"Seeded {properties:,} properties for {host_id} in {time.perf_counter() - started:.1f}s "
+          f"(database now has {counts['properties']:,} properties, {counts['bookings']:,} bookings, "
+          f"{counts['messages']:,} messages)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed synthetic PropFlow data for one host")
+    parser.add_argument('--host', default='host_100k', help='Host id that owns the properties')
+    parser.add_argument('--properties', type=int, default=100_000)
+    parser.add_argument('--bookings', type=int, default=3, help='Bookings per property')
+    parser.add_argument('--messages', type=int, default=2, help='Guest messages per property')
+    parser.add_argument('--open-rate', type=float, default=0.05, help='Share of messages still needing a human')
+    parser.add_argument('--batch', type=int, default=5000, help='Properties per transaction')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--database-url', default=DEFAULT_DATABASE_URL)
+    args = parser.parse_args()
+
+    asyncio.run(seed(args.database_url, args.host, args.properties, args.bookings, args.messages,
+                     args.open_rate, args.batch, args.seed))
+
+
+if __name__ == '__main__':
+    main()
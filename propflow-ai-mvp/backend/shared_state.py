@@ -0,0 +1,373 @@
+"""
+PropFlow AI Shared State
+Claims, counters and a message bus shared by every worker process
+
+With one process everything stays in memory (LocalState). Under gunicorn
+with several workers, the workers on one machine share a SQLite (WAL)
+file, or any number of machines share a Redis-compatible server:
+- claim(key, ttl): idempotency keys - exactly one worker owns a webhook
+- incr_many / get_counters: metric and rollup totals summed across workers
+- send(message) / subscribe(callback): cache invalidations and dashboard
+  diffs fanned out to the other workers, batched per tick
+PROPFLOW_SHARED_STATE_URL picks the backend: local (default),
+sqlite:///path/to/shared_state.db or redis://host:6379/0.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+
+from event_log import EventLog, event_log
+
+
+DEFAULT_SHARED_STATE_URL = os.environ.get('PROPFLOW_SHARED_STATE_URL', 'local')
+
+DEFAULT_SHARED_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'shared_state.db')
+
+Subscriber = Callable[[Dict[str, Any]], None]
+
+
+def worker_id() -> str:
+    """Unique per process - messages a worker sent itself are skipped"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class LocalState:
+    """
+    Single-process state - the default
+    Nobody else to tell, so send() is a no-op
+    """
+
+    shared = False
+
+    def __init__(self):
+        self.origin = worker_id()
+        self._claims: Dict[str, tuple] = {}
+        self._counters: Dict[str, Dict[str, float]] = {}
+        self.stats = {'claims': 0, 'claims_lost': 0, 'sent': 0, 'received': 0}
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    def subscribe(self, callback: Subscriber):
+        pass
+
+    def send(self, message: Dict[str, Any]):
+        pass
+
+    async def claim(self, key: str, ttl: float) -> bool:
+        now = time.monotonic()
+        owner, expires_at = self._claims.get(key, (None, 0.0))
+        if owner not in (None, self.origin) and expires_at > now:
+            self.stats['claims_lost'] += 1
+            return False
+        self._claims[key] = (self.origin, now + ttl)
+        self.stats['claims'] += 1
+        return True
+
+    async def incr_many(self, key: str, deltas: Dict[str, float], ttl: Optional[float] = None):
+        counters = self._counters.setdefault(key, {})
+        for field_name, amount in deltas.items():
+            counters[field_name] = counters.get(field_name, 0.0) + amount
+
+    async def get_counters(self, key: str) -> Dict[str, float]:
+        return dict(self._counters.get(key, {}))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'backend': 'local', **self.stats}
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS claims (
+    key        TEXT PRIMARY KEY,
+    owner      TEXT NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS counters (
+    key        TEXT NOT NULL,
+    field      TEXT NOT NULL,
+    value      REAL NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (key, field)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS bus (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+    origin     TEXT NOT NULL,
+    message    TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class SQLiteState:
+    """
+    Shared state for the workers on one machine - one WAL file
+    The bus is an append-only table each worker polls every poll_interval
+    """
+
+    shared = True
+
+    def __init__(self, path: str = DEFAULT_SHARED_STATE_PATH, poll_interval: float = 0.05,
+                 keep_messages_seconds: float = 60.0, event_log: EventLog = event_log):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.keep_messages_seconds = keep_messages_seconds
+        self.event_log = event_log
+        self.origin = worker_id()
+        self._db: Optional[sqlite3.Connection] = None  # Opened by start(), not at construction
+        self._subscribers: List[Subscriber] = []
+        self._outbox: List[str] = []
+        self._last_seq = 0
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {'claims': 0, 'claims_lost': 0, 'sent': 0, 'received': 0, 'polls': 0}
+
+    def _open(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(_SQLITE_SCHEMA)
+
+    async def start(self):
+        if self._db is None:
+            self._open()
+        if self._task is None:
+            # Only messages sent from now on - a restarted worker rebuilds from storage anyway
+            self._last_seq = self._db.execute('SELECT COALESCE(MAX(seq), 0) FROM bus').fetchone()[0]
+            self._task = asyncio.create_task(self._poll())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            self._flush()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def subscribe(self, callback: Subscriber):
+        self._subscribers.append(callback)
+
+    def send(self, message: Dict[str, Any]):
+        """Queued - written with everything else sent this tick in one transaction"""
+        self._outbox.append(json.dumps(message, separators=(',', ':')))
+
+    async def claim(self, key: str, ttl: float) -> bool:
+        now = time.time()
+        cursor = self._db.execute(
+            "INSERT INTO claims (key, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+            "WHERE claims.owner = excluded.owner OR claims.expires_at < ?",
+            (key, self.origin, now + ttl, now)
+        )
+        won = cursor.rowcount == 1
+        self.stats['claims' if won else 'claims_lost'] += 1
+        return won
+
+    async def incr_many(self, key: str, deltas: Dict[str, float], ttl: Optional[float] = None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._db:
+            self._db.execute('BEGIN')
+            self._db.executemany(
+                "INSERT INTO counters (key, field, value, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key, field) DO UPDATE SET value = value + excluded.value, expires_at = excluded.expires_at",
+                [(key, field_name, amount, expires_at) for field_name, amount in deltas.items()]
+            )
+
+    async def get_counters(self, key: str) -> Dict[str, float]:
+        return dict(self._db.execute('SELECT field, value FROM counters WHERE key = ?', (key,)).fetchall())
+
+    def _flush(self):
+        if not self._outbox:
+            return
+        now = time.time()
+        rows = [(self.origin, message, now) for message in self._outbox]
+        self._outbox = []
+        with self._db:
+            self._db.execute('BEGIN')
+            self._db.executemany('INSERT INTO bus (origin, message, created_at) VALUES (?, ?, ?)', rows)
+        self.stats['sent'] += len(rows)
+
+    def _receive(self):
+        rows = self._db.execute(
+            'SELECT seq, origin, message FROM bus WHERE seq > ? ORDER BY seq', (self._last_seq,)
+        ).fetchall()
+        for seq, origin, message in rows:
+            self._last_seq = seq
+            if origin == self.origin:
+                continue
+            self.stats['received'] += 1
+            _deliver(self._subscribers, json.loads(message), self.event_log)
+
+    def _expire(self):
+        now = time.time()
+        with self._db:
+            self._db.execute('BEGIN')
+            self._db.execute('DELETE FROM bus WHERE created_at < ?', (now - self.keep_messages_seconds,))
+            self._db.execute('DELETE FROM claims WHERE expires_at < ?', (now,))
+            self._db.execute('DELETE FROM counters WHERE expires_at < ?', (now,))
+
+    async def _poll(self):
+        expire_every = max(1, int(self.keep_messages_seconds / self.poll_interval))
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                self._flush()
+                self._receive()
+                self.stats['polls'] += 1
+                if self.stats['polls'] % expire_every == 0:
+                    self._expire()
+            except sqlite3.OperationalError as e:
+                self.event_log.warning('shared_state.poll_failed', error=str(e))  # Locked for >5s - next tick retries
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'backend': 'sqlite', 'path': self.path, 'outbox': len(self._outbox), **self.stats}
+
+
+class RedisState:
+    """
+    Shared state on a Redis-compatible server (Redis, Valkey, KeyDB...)
+    Claims are SET NX PX, counters are hashes, the bus is one pub/sub channel
+    """
+
+    shared = True
+
+    def __init__(self, url: str = 'redis://localhost:6379/0', prefix: str = 'propflow:',
+                 client: Any = None, event_log: EventLog = event_log):
+        if client is None:
+            try:
+                import redis.asyncio as aioredis  # Optional - imported only for redis:// URLs
+            except ImportError:
+                raise RuntimeError("redis:// shared state needs the redis package (pip install redis)") from None
+            client = aioredis.from_url(url)
+        self.url = url
+        self.prefix = prefix
+        self.event_log = event_log
+        self.channel = f"{prefix}bus"
+        self.origin = worker_id()
+        self._redis = client
+        self._subscribers: List[Subscriber] = []
+        self._outbox: List[bytes] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._ready: Optional[asyncio.Event] = None
+        self.stats = {'claims': 0, 'claims_lost': 0, 'sent': 0, 'received': 0, 'errors': 0}
+
+    async def start(self):
+        if not self._tasks:
+            self._wakeup = asyncio.Event()
+            self._ready = asyncio.Event()
+            self._tasks = [asyncio.create_task(self._listen()), asyncio.create_task(self._send_loop())]
+            await asyncio.wait_for(self._ready.wait(), 10)
+
+    async def close(self):
+        if self._outbox:
+            await self._publish()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._redis.aclose() if hasattr(self._redis, 'aclose') else await self._redis.close()
+
+    def subscribe(self, callback: Subscriber):
+        self._subscribers.append(callback)
+
+    def send(self, message: Dict[str, Any]):
+        self._outbox.append(json.dumps({'o': self.origin, 'm': message}, separators=(',', ':')).encode())
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def claim(self, key: str, ttl: float) -> bool:
+        name = self.prefix + key
+        ttl_ms = max(1, int(ttl * 1000))
+        won = bool(await self._redis.set(name, self.origin, nx=True, px=ttl_ms))
+        if not won and await self._redis.get(name) == self.origin.encode():
+            won = bool(await self._redis.pexpire(name, ttl_ms))  # Already ours - extend
+        self.stats['claims' if won else 'claims_lost'] += 1
+        return won
+
+    async def incr_many(self, key: str, deltas: Dict[str, float], ttl: Optional[float] = None):
+        name = self.prefix + key
+        pipe = self._redis.pipeline(transaction=False)
+        for field_name, amount in deltas.items():
+            pipe.hincrbyfloat(name, field_name, amount)
+        if ttl:
+            pipe.expire(name, int(ttl))
+        await pipe.execute()
+
+    async def get_counters(self, key: str) -> Dict[str, float]:
+        values = await self._redis.hgetall(self.prefix + key)
+        return {field_name.decode(): float(value) for field_name, value in values.items()}
+
+    async def _publish(self):
+        messages, self._outbox = self._outbox, []
+        pipe = self._redis.pipeline(transaction=False)
+        for message in messages:
+            pipe.publish(self.channel, message)
+        await pipe.execute()
+        self.stats['sent'] += len(messages)
+
+    async def _send_loop(self):
+        """Everything sent during one loop tick goes out in one pipeline"""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                await self._publish()
+            except Exception as e:
+                self.stats['errors'] += 1
+                self.event_log.warning('shared_state.publish_failed', error=str(e))
+
+    async def _listen(self):
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                self._ready.set()
+                async for item in pubsub.listen():
+                    if item.get('type') != 'message':
+                        continue
+                    envelope = json.loads(item['data'])
+                    if envelope['o'] == self.origin:
+                        continue
+                    self.stats['received'] += 1
+                    _deliver(self._subscribers, envelope['m'], self.event_log)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['errors'] += 1
+                self.event_log.warning('shared_state.subscribe_failed', error=str(e))
+                await asyncio.sleep(1.0)  # Reconnect
+            finally:
+                await pubsub.aclose() if hasattr(pubsub, 'aclose') else await pubsub.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'backend': 'redis', 'outbox': len(self._outbox), **self.stats}
+
+
+def _deliver(subscribers: List[Subscriber], message: Dict[str, Any], event_log: EventLog):
+    for callback in subscribers:
+        try:
+            callback(message)
+        except Exception as e:
+            event_log.warning('shared_state.subscriber_failed', error=str(e), message_type=message.get('t'))
+
+
+def create_shared_state(url: str = DEFAULT_SHARED_STATE_URL, event_log: EventLog = event_log):
+    """'local', 'sqlite:///path' (sqlite:// alone -> data/shared_state.db) or 'redis://...'"""
+    if not url or url == 'local':
+        return LocalState()
+    if url.startswith('sqlite://'):
+        return SQLiteState(url[len('sqlite:///'):] or DEFAULT_SHARED_STATE_PATH, event_log=event_log)
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisState(url, event_log=event_log)
+    raise ValueError(f"Unsupported PROPFLOW_SHARED_STATE_URL: {url}")
@@ -0,0 +1,156 @@
+"""
+PropFlow AI Timing Spans
+Per-stage latency for every service method, in HDR-style histograms
+
+Each span records its duration into a log-linear histogram: fixed memory,
+~1.5% worst-case error on any percentile from a microsecond to an hour, and
+one list increment per record. Percentiles are computed only when someone
+asks (the /api/timings endpoint or a Prometheus scrape).
+"""
+
+from typing import Dict, Any, Callable, Iterator, Optional
+from contextlib import contextmanager
+import functools
+import inspect
+import math
+import time
+
+
+class LatencyHistogram:
+    """
+    Log-linear (HDR-style) histogram of durations, stored in microseconds
+    Values below 2**sub_bucket_bits us are exact; above that each power of
+    two is split into 2**(sub_bucket_bits - 1) linear buckets.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7, max_seconds: float = 3600.0):
+        self.sub_bucket_bits = sub_bucket_bits
+        self._half = 1 << (sub_bucket_bits - 1)
+        self._max_us = int(max_seconds * 1e6)
+        self.counts = [0] * (self._index(self._max_us) + 1)
+        self.total = 0
+        self.sum_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def _index(self, us: int) -> int:
+        shift = max(0, us.bit_length() - self.sub_bucket_bits)
+        return shift * self._half + (us >> shift)
+
+    def _bucket_value(self, index: int) -> float:
+        """Midpoint of a bucket, in microseconds"""
+        shift = max(0, index // self._half - 1)
+        mantissa = index - shift * self._half
+        return ((mantissa << shift) + ((1 << shift) - 1) / 2)
+
+    def record(self, seconds: float):
+        us = min(int(seconds * 1e6), self._max_us)
+        self.counts[self._index(us if us > 0 else 0)] += 1
+        self.total += 1
+        self.sum_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Duration in seconds at percentile pct (0-100)"""
+        if not self.total:
+            return None
+        target = max(1, math.ceil(self.total * pct / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._bucket_value(index) / 1e6, self.max_seconds)
+        return self.max_seconds
+
+    def mean(self) -> Optional[float]:
+        return self.sum_seconds / self.total if self.total else None
+
+    def summary(self) -> Dict[str, Any]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 3) if value is not None else None
+        return {
+            'count': self.total,
+            'mean_ms': ms(self.mean()),
+            'p50_ms': ms(self.percentile(50)),
+            'p90_ms': ms(self.percentile(90)),
+            'p99_ms': ms(self.percentile(99)),
+            'p999_ms': ms(self.percentile(99.9)),
+            'max_ms': ms(self.max_seconds) if self.total else None,
+        }
+
+
+class SpanRecorder:
+    """
+    name -> LatencyHistogram
+    Use span() around a block, or @timed() on a (sync or async) function
+    """
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+
+    def record(self, name: str, seconds: float):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.record(seconds)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def timed(self, name: str) -> Callable:
+        """Decorator: time every call, including ones that raise"""
+        return lambda fn: _timed(fn, name, lambda args: self)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: self.histograms[name].summary() for name in sorted(self.histograms)}
+
+    def quantiles(self, pcts=(50, 90, 99)) -> Dict[tuple, float]:
+        """(span, quantile) -> seconds, for the Prometheus gauge"""
+        return {
+            (name, str(pct / 100)): histogram.percentile(pct)
+            for name, histogram in self.histograms.items()
+            for pct in pcts
+            if histogram.total
+        }
+
+    def reset(self):
+        self.histograms.clear()
+
+
+def _timed(fn: Callable, name: str, recorder: Callable[[tuple], 'SpanRecorder']) -> Callable:
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                recorder(args).record(name, time.perf_counter() - started)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            recorder(args).record(name, time.perf_counter() - started)
+    return wrapper
+
+
+def timed(name: str) -> Callable:
+    """
+    Method decorator: time every call into the instance's own recorder (self.spans)
+    Two services in one process (one per app) keep separate histograms
+    """
+    return lambda fn: _timed(fn, name, lambda args: args[0].spans)
+
+
+# Default recorder for subsystems built on their own (benchmarks, scripts) -
+# the service gives itself and everything it builds a recorder of its own
+spans = SpanRecorder()
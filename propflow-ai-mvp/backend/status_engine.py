@@ -0,0 +1,204 @@
+"""
+PropFlow AI Status Engine
+Per-property status and per-host totals, kept up to date by events
+
+Escalated messages, cleaning start/finish and calendar conflicts each
+update one property's status and adjust its host's counters by the
+difference - O(1) per event. Escalations are keyed by message_id, so a
+replayed event counts once. Dashboards read the host totals directly
+instead of scanning the portfolio. A host's facts are (re)loaded in one
+pass only when its dashboard is rebuilt from storage.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+GOOD = 'good'
+NEEDS_ATTENTION = 'needs-attention'
+CLEANING = 'cleaning'
+
+# Escalated message ids remembered per property (oldest forgotten first) - replays come soon after
+MAX_TRACKED_MESSAGES = 1000
+
+
+def derive_status(unhandled_messages: int, has_conflict: bool, is_clean: bool) -> str:
+    """
+    Smart status detection - no manual updates needed
+    Human attention beats cleaning beats good
+    """
+    # Critical attention needed (human intervention required)
+    if unhandled_messages > 0 or has_conflict:
+        return NEEDS_ATTENTION
+
+    # Currently being cleaned
+    if not is_clean:
+        return CLEANING
+
+    # Everything good - no action needed
+    return GOOD
+
+
+@dataclass(slots=True)
+class PropertyState:
+    property_id: str
+    weekly_revenue: float
+    unhandled_messages: int
+    is_clean: bool
+    has_conflict: bool
+    status: str
+    hosts: Set[str] = field(default_factory=set)
+    escalated_ids: Optional[Dict[str, None]] = None  # Insertion-ordered set, created on the first escalation
+
+
+@dataclass
+class HostTotals:
+    properties: int = 0
+    needs_attention_count: int = 0
+    cleaning_count: int = 0
+    total_weekly_revenue: float = 0.0
+
+    @property
+    def overall_status(self) -> str:
+        return NEEDS_ATTENTION if self.needs_attention_count else GOOD
+
+    def add(self, state: PropertyState, sign: int = 1):
+        self.properties += sign
+        self.total_weekly_revenue += sign * state.weekly_revenue
+        if state.status == NEEDS_ATTENTION:
+            self.needs_attention_count += sign
+        elif state.status == CLEANING:
+            self.cleaning_count += sign
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'properties': self.properties,
+            'needs_attention_count': self.needs_attention_count,
+            'cleaning_count': self.cleaning_count,
+            'total_weekly_revenue': round(self.total_weekly_revenue, 2),
+            'overall_status': self.overall_status,
+        }
+
+
+class StatusEngine:
+    """
+    property_id -> PropertyState, host_id -> HostTotals
+    on_change(state) fires when an event changes a property's status or details
+    """
+
+    def __init__(self, on_change: Optional[Callable[[PropertyState], None]] = None):
+        self.on_change = on_change
+        self._properties: Dict[str, PropertyState] = {}
+        self._hosts: Dict[str, HostTotals] = {}
+        self._host_properties: Dict[str, Set[str]] = {}
+        self.stats = {'loads': 0, 'events': 0, 'changes': 0, 'untracked': 0, 'replays': 0}
+
+    def load_host(self, host_id: str, properties: Iterable[Any], has_conflict: Callable[[str], bool],
+                  stored_messages: bool = True):
+        """
+        Take a freshly built portfolio as the truth for this host and set each
+        property's .status - one pass, only when the dashboard is rebuilt.
+        stored_messages=False: the message counts aren't from storage (the demo
+        portfolio), so tracked properties keep - and report - their escalations
+        """
+        self.stats['loads'] += 1
+        totals = self._hosts.setdefault(host_id, HostTotals())
+        previous = self._host_properties.get(host_id, set())
+        current: Set[str] = set()
+        states = self._properties
+        for prop in properties:
+            property_id = prop.id
+            current.add(property_id)
+            conflict = has_conflict(property_id)
+            state = states.get(property_id)
+            if state is not None and not stored_messages:
+                prop.unhandled_messages = state.unhandled_messages
+            if state is None:
+                state = states[property_id] = PropertyState(
+                    property_id, prop.weekly_revenue, prop.unhandled_messages, prop.is_clean, conflict,
+                    derive_status(prop.unhandled_messages, conflict, prop.is_clean))
+            elif (state.weekly_revenue != prop.weekly_revenue or state.unhandled_messages != prop.unhandled_messages
+                  or state.is_clean != prop.is_clean or state.has_conflict != conflict):
+                self._update(state, notify=False, weekly_revenue=prop.weekly_revenue,
+                             unhandled_messages=prop.unhandled_messages, is_clean=prop.is_clean,
+                             has_conflict=conflict)
+            if host_id not in state.hosts:
+                state.hosts.add(host_id)
+                totals.add(state)
+            prop.status = state.status
+
+        for property_id in previous - current:
+            state = self._properties[property_id]
+            state.hosts.discard(host_id)
+            totals.add(state, -1)
+            if not state.hosts:
+                del self._properties[property_id]
+        self._host_properties[host_id] = current
+        if not current:
+            totals.total_weekly_revenue = 0.0  # No float residue on an empty portfolio
+
+    # ===== EVENTS - each is O(1) =====
+
+    def message_escalated(self, property_id: str, message_id: str) -> bool:
+        state = self._get(property_id)
+        if state is None:
+            return False
+        if state.escalated_ids is None:
+            state.escalated_ids = {}
+        elif message_id in state.escalated_ids:
+            self.stats['replays'] += 1  # Webhook retry or a broadcast we already applied
+            return False
+        state.escalated_ids[message_id] = None
+        if len(state.escalated_ids) > MAX_TRACKED_MESSAGES:
+            del state.escalated_ids[next(iter(state.escalated_ids))]
+        return self._update(state, unhandled_messages=state.unhandled_messages + 1)
+
+    def messages_resolved(self, property_id: str, count: int = 1) -> bool:
+        state = self._get(property_id)
+        return state is not None and self._update(
+            state, unhandled_messages=max(0, state.unhandled_messages - count))
+
+    def cleaning_changed(self, property_id: str, cleaning: bool) -> bool:
+        state = self._get(property_id)
+        return state is not None and self._update(state, is_clean=not cleaning)
+
+    def conflict_changed(self, property_id: str, has_conflict: bool) -> bool:
+        state = self._get(property_id)
+        return state is not None and self._update(state, has_conflict=has_conflict)
+
+    def revenue_changed(self, property_id: str, weekly_revenue: float) -> bool:
+        state = self._get(property_id)
+        return state is not None and self._update(state, weekly_revenue=weekly_revenue)
+
+    def _get(self, property_id: str) -> Optional[PropertyState]:
+        self.stats['events'] += 1
+        state = self._properties.get(property_id)
+        if state is None:
+            self.stats['untracked'] += 1  # No dashboard loaded it yet - storage has the truth
+        return state
+
+    def _update(self, state: PropertyState, notify: bool = True, **changes: Any) -> bool:
+        if all(getattr(state, name) == value for name, value in changes.items()):
+            return False
+        for host_id in state.hosts:
+            self._hosts[host_id].add(state, -1)
+        for name, value in changes.items():
+            setattr(state, name, value)
+        state.status = derive_status(state.unhandled_messages, state.has_conflict, state.is_clean)
+        for host_id in state.hosts:
+            self._hosts[host_id].add(state)
+        self.stats['changes'] += 1
+        if notify and self.on_change is not None:
+            self.on_change(state)
+        return True
+
+    # ===== READS =====
+
+    def status(self, property_id: str) -> Optional[str]:
+        state = self._properties.get(property_id)
+        return state.status if state is not None else None
+
+    def totals(self, host_id: str) -> HostTotals:
+        return self._hosts.get(host_id) or HostTotals()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'tracked_properties': len(self._properties), 'tracked_hosts': len(self._hosts)}
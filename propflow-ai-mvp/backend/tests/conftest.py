@@ -0,0 +1,8 @@
+"""
+Backend modules are flat (run from backend/) - make them importable from tests/
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,43 @@
+"""
+Apps built side by side keep their own metrics, spans and event log, and
+building one opens no database, queue or shared-state file
+
+Run with: python -m pytest tests
+"""
+
+from fastapi.testclient import TestClient
+
+import mvp_main
+from MVP_BackendService import DataSource
+
+
+def test_two_apps_keep_separate_metrics_and_timings():
+    first, second = mvp_main.create_app('mock'), mvp_main.create_app('mock')
+    with TestClient(first) as a, TestClient(second) as b:
+        a.post('/api/webhooks/booking-update', json={'property_id': '1', 'booking_id': 'x'})
+        a.get('/api/dashboard/demo_host')
+
+        assert 'dashboard.json' in a.get('/api/timings').json()['spans']
+        assert 'dashboard.json' not in b.get('/api/timings').json()['spans']
+        assert 'propflow_webhooks_total{' in a.get('/metrics').text
+        assert 'propflow_webhooks_total{' not in b.get('/metrics').text
+
+    services = first.state.backend_service, second.state.backend_service
+    assert services[0].metrics is not services[1].metrics
+    assert services[0].webhook_queue.get_stats()['received'] == 1
+    assert services[1].webhook_queue.get_stats()['received'] == 0
+
+
+def test_stores_open_in_the_startup_hook_not_at_construction(tmp_path, monkeypatch):
+    data_source = DataSource(database_url=f"sqlite:///{tmp_path}/propflow.db",
+                             webhook_queue_path=str(tmp_path / 'webhook_queue.db'),
+                             shared_state_url=f"sqlite:///{tmp_path}/shared_state.db",
+                             channel_urls={})
+    monkeypatch.setitem(mvp_main.DATA_SOURCES, 'tmp', data_source)
+
+    app = mvp_main.create_app('tmp')
+    assert list(tmp_path.iterdir()) == []
+
+    with TestClient(app):
+        opened = {path.name for path in tmp_path.iterdir()}
+    assert {'propflow.db', 'webhook_queue.db', 'shared_state.db'} <= opened
@@ -0,0 +1,72 @@
+"""
+Calendar sync keeps one booking per reservation and flags real double bookings
+
+Run with: python -m pytest tests
+"""
+
+from datetime import date
+
+import pytest
+
+from calendar_sync import Booking, BookingIndex, CalendarFeed, CalendarSync
+from ical_parser import CalendarEvent
+
+FEED = CalendarFeed('1', 'airbnb', 'unused.ics')
+
+
+@pytest.fixture
+def sync(tmp_path):
+    return CalendarSync(feeds_path=str(tmp_path / 'no_feeds.json'))
+
+
+def booking(uid, check_in, check_out, channel='airbnb'):
+    return Booking('1', channel, uid, date(2026, 6, check_in), date(2026, 6, check_out))
+
+
+def feed_event(uid, check_in, check_out):
+    return CalendarEvent(uid=uid, sequence=0, dtstart=date(2026, 6, check_in), dtend=date(2026, 6, check_out))
+
+
+def test_webhook_and_feed_report_one_reservation(sync):
+    assert sync.add_booking(booking('HM123', 10, 14)) == []             # Booking webhook
+    sync.apply_feed(FEED, [feed_event('ical-abc@airbnb.com', 10, 14)])  # Same stay from the iCal feed
+    assert sync.booking_count('1') == 1
+    assert not sync.has_conflicts('1')
+
+    # The feed dropping its event removes the reservation it aliased
+    sync.apply_feed(FEED, [])
+    assert sync.booking_count('1') == 0
+
+
+def test_a_different_reservation_is_still_a_double_booking(sync):
+    sync.add_booking(booking('HM123', 10, 14))
+    assert sync.add_booking(booking('HM456', 12, 16)) != []
+    assert sync.add_booking(booking('V1', 10, 14, channel='vrbo')) != []  # Same nights, other channel
+    assert len(sync.get_conflicts('1')) == 2
+
+
+def test_alias_moves_the_reservation(sync):
+    sync.add_booking(booking('HM123', 10, 14))
+    sync.add_booking(booking('ical-abc', 10, 14))
+    sync.add_booking(booking('ical-abc', 11, 15))  # The feed moved it
+    index = sync.indexes['1']
+    assert [(b.check_in.day, b.check_out.day) for b in index.overlapping(date(2026, 6, 1), date(2026, 6, 30))] == [(11, 15)]
+    assert not sync.has_conflicts('1')
+
+
+def test_remove_deletes_the_right_booking_and_retries_conflicts():
+    index = BookingIndex()
+    index.add(booking('a', 10, 12))
+    index.add(booking('b', 12, 14))
+    assert index.add(booking('c', 11, 13)) != []
+    assert index.remove(('airbnb', 'b')).uid == 'b'
+    assert index.get(('airbnb', 'a')) is not None
+    assert index.conflicts  # 'c' still overlaps 'a'
+    index.remove(('airbnb', 'a'))
+    assert not index.conflicts and index.get(('airbnb', 'c')) is not None
+
+
+def test_empty_or_inverted_stays_are_rejected(sync):
+    assert sync.add_booking(booking('x', 14, 14)) == []
+    assert sync.add_booking(booking('y', 14, 10)) == []
+    assert sync.booking_count('1') == 0 and sync.stats['bookings_rejected'] == 2
@@ -0,0 +1,83 @@
+"""
+ChannelClient retries only what is safe to send twice
+
+Run with: python -m pytest tests
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from channel_client import ChannelClient
+
+MAX_RETRIES = 3
+
+
+def send(method, outcome):
+    """Run one request against a channel whose every attempt ends with outcome(request)"""
+    attempts = []
+
+    def handler(request):
+        attempts.append(request.method)
+        return outcome(request)
+
+    async def run():
+        client = ChannelClient({'airbnb': 'http://airbnb'}, transport=httpx.MockTransport(handler),
+                               max_retries=MAX_RETRIES, backoff_base=0.001)
+        try:
+            return await client.request('airbnb', method, '/messages/m1/reply', json={'text': 'Hi'})
+        finally:
+            await client.close()
+
+    return attempts, run
+
+
+def fail_with(error_type):
+    def outcome(request):
+        raise error_type('channel unreachable', request=request)
+    return outcome
+
+
+@pytest.mark.parametrize('error_type', [httpx.ReadTimeout, httpx.RemoteProtocolError])
+def test_post_failing_after_sending_is_not_retried(error_type):
+    attempts, run = send('POST', fail_with(error_type))
+    with pytest.raises(error_type):
+        asyncio.run(run())
+    assert attempts == ['POST']
+
+
+def test_post_answered_with_503_is_not_retried():
+    attempts, run = send('POST', lambda request: httpx.Response(503))
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(run())
+    assert attempts == ['POST']
+
+
+def test_post_that_never_connected_is_retried():
+    outcomes = iter([fail_with(httpx.ConnectError), fail_with(httpx.ConnectError), lambda r: httpx.Response(200)])
+    attempts, run = send('POST', lambda request: next(outcomes)(request))
+    assert asyncio.run(run()).status_code == 200
+    assert attempts == ['POST'] * 3
+
+
+def test_post_connect_errors_give_up_after_the_retry_limit():
+    attempts, run = send('POST', fail_with(httpx.ConnectError))
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(run())
+    assert len(attempts) == MAX_RETRIES + 1
+
+
+@pytest.mark.parametrize('outcome', [lambda request: httpx.Response(503), fail_with(httpx.ReadTimeout)])
+def test_get_is_retried_up_to_the_limit(outcome):
+    attempts, run = send('GET', outcome)
+    with pytest.raises((httpx.HTTPStatusError, httpx.ReadTimeout)):
+        asyncio.run(run())
+    assert attempts == ['GET'] * (MAX_RETRIES + 1)
+
+
+def test_get_succeeds_once_the_channel_recovers():
+    outcomes = iter([lambda r: httpx.Response(503), lambda r: httpx.Response(200)])
+    attempts, run = send('GET', lambda request: next(outcomes)(request))
+    assert asyncio.run(run()).status_code == 200
+    assert attempts == ['GET', 'GET']
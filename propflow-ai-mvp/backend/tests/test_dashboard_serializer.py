@@ -0,0 +1,64 @@
+"""
+Contract: the one-pass dashboard encoder must produce exactly the bytes the
+old dict -> Pydantic -> response_model -> json.dumps path did
+
+Run with: python -m pytest tests
+"""
+
+import dataclasses
+
+import pytest
+from pydantic import TypeAdapter
+
+import dashboard_serializer
+from benchmarks.bench_dashboard_serialization import legacy_encode, synthetic_snapshot
+from MVP_BackendService import DATA_SOURCES, MVPBackendService
+from mvp_main import DashboardResponse
+
+
+@pytest.fixture(scope='module')
+def service():
+    return MVPBackendService(DATA_SOURCES['mock'])
+
+
+@pytest.fixture(scope='module')
+def adapter():
+    return TypeAdapter(DashboardResponse)
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def encoder(request, monkeypatch):
+    """Both encoders: orjson when installed, and the standard json fallback"""
+    if request.param == 'orjson':
+        if dashboard_serializer.orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(dashboard_serializer, 'orjson', None)
+    return dashboard_serializer.encode_dashboard
+
+
+SNAPSHOTS = {
+    'portfolio': lambda: synthetic_snapshot(50),
+    'no_opportunity': lambda: dataclasses.replace(synthetic_snapshot(3), money_opportunity=None),
+    'empty': lambda: dataclasses.replace(synthetic_snapshot(0), money_opportunity=None, total_weekly_revenue=0.0),
+}
+
+
+@pytest.mark.parametrize('name', SNAPSHOTS)
+def test_payload_matches_legacy_bytes(name, encoder, service, adapter):
+    snapshot = SNAPSHOTS[name]()
+    assert encoder(snapshot) == legacy_encode(service, snapshot, adapter)
+
+
+def test_payload_validates_against_schema(encoder):
+    response = DashboardResponse.model_validate_json(encoder(synthetic_snapshot(5)))
+    assert [p.id for p in response.properties] == ['0', '1', '2', '3', '4']
+    assert response.money_opportunity.id == 'event_f1_2024'
+
+
+def test_optional_fields_are_null_not_missing(encoder, service, adapter):
+    snapshot = synthetic_snapshot(1)
+    snapshot.properties[0].cleaner_name = None
+    snapshot.properties[0].next_guest = None
+    assert encoder(snapshot) == legacy_encode(service, snapshot, adapter)
+    assert b'"cleaner_name":null' in encoder(snapshot)
@@ -0,0 +1,58 @@
+"""
+Guest message endpoints report only what was delivered, on the guest's channel
+
+Run with: python -m pytest tests
+"""
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import mvp_main
+from channel_client import ChannelClient
+
+CHANNELS = {'airbnb': 'http://airbnb', 'vrbo': 'http://vrbo', 'notifications': 'http://notify'}
+
+
+@pytest.fixture
+def client():
+    with TestClient(mvp_main.create_app('mock')) as client:
+        yield client
+
+
+def use_channels(client, handler):
+    requests = []
+
+    def record(request):
+        requests.append(f"{request.url.host}{request.url.path}")
+        return handler(request)
+
+    client.app.state.backend_service.channel_client = ChannelClient(
+        CHANNELS, transport=httpx.MockTransport(record), backoff_base=0.001)
+    return requests
+
+
+def message(message_id, text, **fields):
+    return {'message_id': message_id, 'property_id': '1', 'message_text': text, 'guest_name': 'Guest', **fields}
+
+
+def test_failed_bulk_reply_is_not_counted_as_handled(client):
+    use_channels(client, lambda request: httpx.Response(500 if 'bulk-reply' in request.url.path else 200))
+    response = client.post('/api/guest-messages/batch', json={'messages': [
+        message('b1', "What's the WiFi password?"), message('b2', "The sink is broken")]}).json()
+
+    assert (response['auto_handled'], response['escalated'], response['failed']) == (0, 1, 1)
+    failed = response['results'][0]
+    assert failed['error'] and not failed['auto_handled'] and 'response_sent' not in failed
+
+
+def test_oversized_batch_is_rejected(client):
+    batch = [message(f"m{i}", "Hello") for i in range(mvp_main.MAX_MESSAGE_BATCH + 1)]
+    assert client.post('/api/guest-messages/batch', json={'messages': batch}).status_code == 413
+
+
+def test_single_reply_goes_to_the_request_channel(client):
+    requests = use_channels(client, lambda request: httpx.Response(200))
+    response = client.post('/api/guest-message', json=message('s1', "What's the WiFi password?", channel='vrbo'))
+    assert response.json()['auto_handled']
+    assert requests == ['vrbo/messages/s1/reply']
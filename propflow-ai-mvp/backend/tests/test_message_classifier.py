@@ -0,0 +1,60 @@
+"""
+The compiled classifier must give the old keyword scans' categories - plurals
+included - and differ only where a keyword sits inside a longer word
+
+Run with: python -m pytest tests
+"""
+
+import pytest
+
+import message_classifier
+from benchmarks.bench_classifier import SAMPLE_MESSAGES, legacy_classify
+from message_classifier import MessageClassifier
+
+PLURALS = [
+    "Where are the keys?",
+    "There are some problems with the shower",
+    "Which of the lockboxes is ours?",
+    "A few issues with the heating",
+    "What are the WiFi passwords?",
+    "Do you have extra towels and kitchens supplies?",
+    "Are there any complaints procedures?",
+    "Two emergencies: we're locked out and the sink is broken",
+]
+
+# Keywords inside longer words - the old substring scans matched these by accident
+INSIDE_WORDS = {
+    "The host was very helpful": 'unclear',
+    "Is the keyset in the drawer?": 'unclear',
+    "Great accessibility, thanks": 'unclear',
+}
+
+CORPUS = [m for m in SAMPLE_MESSAGES if 'helpful' not in m] + PLURALS
+
+
+@pytest.fixture(params=['automaton', 'regex'])
+def classifier(request):
+    if request.param == 'automaton' and message_classifier.ahocorasick is None:
+        pytest.skip("pyahocorasick not installed")
+    return MessageClassifier(use_automaton=request.param == 'automaton')
+
+
+@pytest.mark.parametrize('message', CORPUS)
+def test_same_category_as_legacy(classifier, message):
+    assert classifier.classify(message) == legacy_classify(message)
+
+
+@pytest.mark.parametrize('message', INSIDE_WORDS)
+def test_keywords_inside_longer_words_do_not_match(classifier, message):
+    assert classifier.classify(message)['type'] == INSIDE_WORDS[message]
+
+
+def test_substring_mode_is_exactly_legacy(classifier):
+    substring = MessageClassifier(word_boundary=False, use_automaton=classifier._automaton is not None)
+    for message in CORPUS + list(INSIDE_WORDS):
+        assert substring.classify(message) == legacy_classify(message)
+
+
+def test_classify_many_matches_classify(classifier):
+    messages = CORPUS + CORPUS[:3]
+    assert classifier.classify_many(messages) == [classifier.classify(m) for m in messages]
@@ -0,0 +1,52 @@
+"""
+Opportunity detectors: a slow competitor analysis can't blow its deadline
+or stall the event loop
+
+Run with: python -m pytest tests
+"""
+
+import asyncio
+import time
+
+from MVP_BackendService import DATA_SOURCES, MVPBackendService, Property
+
+PROPERTIES = [Property(id='1', name='Loft', weekly_revenue=1800.0, status='good')]
+
+
+def test_slow_competitor_analysis_times_out_without_blocking_the_loop():
+    service = MVPBackendService(DATA_SOURCES['mock'])
+    engine = service.competitor_pricing
+    analyze = engine.analyze
+
+    def slow_analyze(*args, **kwargs):
+        time.sleep(0.5)  # A big portfolio, all CPU
+        return analyze(*args, **kwargs)
+
+    engine.analyze = slow_analyze
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        found = await service._run_detector('competitor', service._detect_competitor_opportunities, 0.1, PROPERTIES)
+        elapsed = time.perf_counter() - started
+        ticking.cancel()
+        return found, elapsed, ticks
+
+    found, elapsed, ticks = asyncio.run(run())
+    assert found == [] and elapsed < 0.4
+    assert ticks >= 5  # The loop kept serving other tasks meanwhile
+    assert service.get_detector_stats()['competitor']['timeouts'] == 1
+
+
+def test_competitor_analysis_still_finds_underpriced_properties():
+    service = MVPBackendService(DATA_SOURCES['mock'])
+    found = asyncio.run(service._detect_competitor_opportunities(PROPERTIES))
+    assert [o.id for o in found] == ['competitor_1']
@@ -0,0 +1,74 @@
+"""
+Pricing fan-out: one failing property or platform never stops the rest
+
+Run with: python -m pytest tests
+"""
+
+import asyncio
+
+from pricing_fanout import PricingFanout
+
+
+def test_failing_items_are_reported_and_the_rest_complete():
+    async def worker(item):
+        await asyncio.sleep(0.01 if item == 'slow' else 0)
+        if item == 'boom':
+            raise ValueError('channel rejected the price')
+        if item == 'bare':
+            raise RuntimeError()
+        return {'property_id': item}
+
+    items = ['a', 'boom', 'slow', 'bare', 'b']
+    report = asyncio.run(PricingFanout().run(items, worker))
+
+    assert [r['property_id'] for r in report.results] == ['a', 'slow', 'b']
+    assert report.errors == [{'item': 'boom', 'error': 'channel rejected the price'},
+                             {'item': 'bare', 'error': 'RuntimeError'}]
+    assert report.timing()['items'] == 5 and report.timing()['failed'] == 2
+
+
+def test_a_cancelled_item_does_not_cancel_the_batch():
+    async def worker(item):
+        if item == 'cancelled':
+            raise asyncio.CancelledError()
+        await asyncio.sleep(0.01)
+        return {'property_id': item}
+
+    report = asyncio.run(PricingFanout().run(['a', 'cancelled', 'b'], worker))
+
+    assert [r['property_id'] for r in report.results] == ['a', 'b']
+    assert report.errors == [{'item': 'cancelled', 'error': 'CancelledError'}]
+
+
+def test_property_concurrency_is_bounded():
+    async def worker(item):
+        await asyncio.sleep(0.001)
+        return {'property_id': item}
+
+    report = asyncio.run(PricingFanout(max_concurrent_properties=4).run([str(i) for i in range(50)], worker))
+    assert len(report.results) == 50 and report.max_in_flight == 4
+
+
+def test_failing_platform_is_isolated_and_limits_are_per_platform():
+    fanout = PricingFanout(platform_limits={'airbnb': 2, 'vrbo': 1, 'direct': 10})
+    in_flight = {'airbnb': 0, 'vrbo': 0, 'direct': 0}
+    peak = dict(in_flight)
+
+    async def push(platform):
+        in_flight[platform] += 1
+        peak[platform] = max(peak[platform], in_flight[platform])
+        try:
+            await asyncio.sleep(0.005)
+            if platform == 'vrbo':
+                raise ConnectionError('vrbo is down')
+        finally:
+            in_flight[platform] -= 1
+
+    async def run():
+        return await asyncio.gather(*(fanout.push_to_platforms(['airbnb', 'vrbo', 'direct'], push)
+                                      for _ in range(6)))
+
+    for results in asyncio.run(run()):
+        assert {r.platform: r.success for r in results} == {'airbnb': True, 'vrbo': False, 'direct': True}
+        assert results[1].error == 'vrbo is down'
+    assert peak == {'airbnb': 2, 'vrbo': 1, 'direct': 6}
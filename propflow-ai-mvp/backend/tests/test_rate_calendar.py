@@ -0,0 +1,108 @@
+"""
+Rate calendar: diff() returns exactly the ranges not yet on the channels
+
+Run with: python -m pytest tests
+"""
+
+from datetime import date, timedelta
+
+from rate_calendar import RateCalendar, RateChange
+
+START = date(2026, 3, 1)
+
+
+def night(n):
+    return START + timedelta(days=n)
+
+
+def calendar(**kwargs):
+    return RateCalendar('p1', 100.0, start_date=START, horizon_days=30, **kwargs)
+
+
+def test_new_calendar_has_nothing_to_push():
+    assert calendar().diff() == []
+
+
+def test_diff_merges_consecutive_nights_with_the_same_values():
+    rates = calendar()
+    rates.adjust_price(night(5), night(8), percent=40)
+    rates.set_price(night(8), night(9), 150.0)
+    rates.set_min_stay(night(20), night(22), 3)
+    rates.set_available(night(25), night(26), False)
+
+    assert rates.diff() == [
+        RateChange(night(5), night(8), 140.0, 1, True),
+        RateChange(night(8), night(9), 150.0, 1, True),
+        RateChange(night(20), night(22), 100.0, 3, True),
+        RateChange(night(25), night(26), 100.0, 1, False),
+    ]
+
+
+def test_setting_a_night_back_to_its_published_value_is_not_a_change():
+    rates = calendar()
+    rates.set_price(night(3), night(6), 120.0)
+    rates.set_price(night(4), night(5), 100.0)
+    assert rates.diff() == [RateChange(night(3), night(4), 120.0, 1, True),
+                            RateChange(night(5), night(6), 120.0, 1, True)]
+
+
+def test_ranges_outside_the_horizon_are_clipped():
+    rates = calendar()
+    rates.set_price(START - timedelta(days=5), night(2), 90.0)
+    rates.set_price(night(28), night(40), 110.0)
+    assert rates.diff() == [RateChange(night(0), night(2), 90.0, 1, True),
+                            RateChange(night(28), night(30), 110.0, 1, True)]
+
+
+def test_mark_published_moves_the_baseline():
+    rates = calendar()
+    rates.set_price(night(1), night(3), 130.0)
+    assert rates.published_price_on(night(1)) == 100.0
+    rates.mark_published()
+
+    assert rates.diff() == []
+    assert rates.published_price_on(night(1)) == rates.price_on(night(1)) == 130.0
+
+
+def test_apply_published_keeps_other_unpublished_nights():
+    rates = calendar()
+    rates.set_price(night(10), night(12), 80.0)  # Ours, not pushed yet
+    pushed = RateChange(night(1), night(4), 125.0, 2, True)  # Another worker's confirmed push
+
+    rates.apply_published([pushed])
+
+    assert rates.price_on(night(2)) == rates.published_price_on(night(2)) == 125.0
+    assert rates.diff() == [RateChange(night(10), night(12), 80.0, 1, True)]
+
+
+def test_roll_forward_shifts_both_calendars_and_fills_new_nights():
+    rates = calendar()
+    rates.set_price(night(2), night(4), 150.0)
+    rates.mark_published()
+    rates.set_price(night(5), night(6), 175.0)
+    rates.set_available(night(29), night(30), False)
+
+    rates.roll_forward(night(3))
+
+    assert rates.start_date == night(3) and rates.horizon_days == 30
+    assert rates.price_on(night(3)) == rates.published_price_on(night(3)) == 150.0
+    assert rates.price_on(night(32)) == rates.published_price_on(night(32)) == 100.0
+    assert rates.diff() == [RateChange(night(5), night(6), 175.0, 1, True),
+                            RateChange(night(29), night(30), 100.0, 1, False)]
+
+
+def test_roll_forward_past_the_whole_horizon_resets_to_the_base_price():
+    rates = calendar()
+    rates.set_price(night(0), night(30), 200.0)
+    rates.roll_forward(night(45))
+    assert rates.start_date == night(45)
+    assert rates.diff() == []
+    assert rates.price_on(night(45)) == 100.0
+
+
+def test_roll_forward_to_an_earlier_day_is_a_no_op():
+    rates = calendar()
+    rates.set_price(night(1), night(2), 120.0)
+    rates.roll_forward(START - timedelta(days=1))
+    assert rates.start_date == START
+    assert rates.diff() == [RateChange(night(1), night(2), 120.0, 1, True)]
@@ -0,0 +1,38 @@
+"""
+Status engine events must be idempotent per message and survive dashboard reloads
+
+Run with: python -m pytest tests
+"""
+
+from MVP_BackendService import MVPBackendService
+from status_engine import NEEDS_ATTENTION, StatusEngine
+
+
+def load(engine, stored_messages=True):
+    properties = MVPBackendService._demo_properties()
+    engine.load_host('host', properties, lambda property_id: False, stored_messages=stored_messages)
+    return {p.id: p.unhandled_messages for p in properties}
+
+
+def test_replayed_escalation_counts_once():
+    engine = StatusEngine()
+    load(engine)
+    assert engine.message_escalated('1', 'msg-1')
+    assert not engine.message_escalated('1', 'msg-1')
+    assert engine.message_escalated('1', 'msg-2')
+    assert engine.status('1') == NEEDS_ATTENTION
+    assert load(engine, stored_messages=False)['1'] == 2
+    assert engine.stats['replays'] == 1
+
+
+def test_demo_reload_keeps_escalations_and_storage_reload_wins():
+    engine = StatusEngine()
+    load(engine, stored_messages=False)
+    engine.message_escalated('2', 'msg-1')
+    assert load(engine, stored_messages=False) == {'1': 0, '2': 2}
+    assert engine.totals('host').needs_attention_count == 1
+
+    # Stored counts are the truth - and a replay after the reload still counts once
+    assert load(engine, stored_messages=True) == {'1': 0, '2': 1}
+    assert not engine.message_escalated('2', 'msg-1')
+    assert engine.totals('host').needs_attention_count == 1
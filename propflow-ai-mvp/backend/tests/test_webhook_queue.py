@@ -0,0 +1,168 @@
+"""
+Webhook queue: each event is processed once, failures retry, leftovers replay,
+and events claimed by a dead worker are picked up once the claim expires
+
+Run with: python -m pytest tests
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from shared_state import SQLiteState
+from webhook_queue import QueueFull, WebhookQueue
+
+
+async def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def recorder(fail_times=0):
+    """Handler that records payloads, raising for the first fail_times calls"""
+    calls = []
+
+    async def handle(payload):
+        calls.append(payload['n'])
+        if len(calls) <= fail_times:
+            raise RuntimeError('channel down')
+    return calls, handle
+
+
+def test_duplicate_event_ids_are_processed_once(tmp_path):
+    calls, handle = recorder()
+
+    async def run():
+        queue = WebhookQueue({'message': handle}, path=str(tmp_path / 'queue.db'))
+        queue.start()
+        assert queue.enqueue('message', {'n': 1}, event_id='evt-1') == ('evt-1', True)
+        assert queue.enqueue('message', {'n': 1}, event_id='evt-1') == ('evt-1', False)
+        await queue.drain()
+        await queue.stop()
+        queue.close()
+
+        # A channel retrying after a restart is still recognised
+        queue = WebhookQueue({'message': handle}, path=str(tmp_path / 'queue.db'))
+        assert queue.enqueue('message', {'n': 1}, event_id='evt-1') == ('evt-1', False)
+        assert queue.stats['duplicates'] == 1
+        queue.close()
+
+    asyncio.run(run())
+    assert calls == [1]
+
+
+def test_payloads_without_an_id_dedup_on_their_body():
+    _, handle = recorder()
+    queue = WebhookQueue({'message': handle}, path=':memory:')
+    first, is_new = queue.enqueue('message', {'n': 1, 'text': 'hi'})
+    assert is_new
+    assert queue.enqueue('message', {'text': 'hi', 'n': 1}) == (first, False)
+    queue.close()
+
+
+def test_failed_handler_is_retried_until_it_succeeds():
+    calls, handle = recorder(fail_times=2)
+
+    async def run():
+        queue = WebhookQueue({'message': handle}, path=':memory:', retry_delay=0.001)
+        queue.start()
+        queue.enqueue('message', {'n': 1})
+        await wait_until(lambda: queue.stats['processed'] == 1)
+        stats = queue.get_stats()
+        await queue.stop()
+        queue.close()
+        return stats
+
+    stats = asyncio.run(run())
+    assert calls == [1, 1, 1]
+    assert (stats['retries'], stats['failed'], stats['pending']) == (2, 0, 0)
+
+
+def test_handler_failing_every_attempt_is_marked_failed():
+    calls, handle = recorder(fail_times=99)
+
+    async def run():
+        queue = WebhookQueue({'message': handle}, path=':memory:', retry_delay=0.001, max_attempts=3)
+        queue.start()
+        queue.enqueue('message', {'n': 1})
+        await wait_until(lambda: queue.stats['failed'] == 1)
+        status = queue._db.execute('SELECT status, attempts FROM webhook_events').fetchone()
+        await queue.stop()
+        queue.close()
+        return status
+
+    assert asyncio.run(run()) == ('failed', 3)
+    assert len(calls) == 3
+
+
+def test_pending_events_replay_on_the_next_start(tmp_path):
+    calls, handle = recorder()
+    path = str(tmp_path / 'queue.db')
+
+    queue = WebhookQueue({'message': handle}, path=path)
+    for n in range(3):
+        queue.enqueue('message', {'n': n})
+    queue.close()  # Process died before any worker ran
+
+    async def run():
+        queue = WebhookQueue({'message': handle}, path=path)
+        assert queue.get_stats()['pending'] == 0  # Nothing opened until start()
+        queue.start()
+        await queue.drain()
+        stats = queue.get_stats()
+        await queue.stop()
+        queue.close()
+        return stats
+
+    stats = asyncio.run(run())
+    assert calls == [0, 1, 2]
+    assert (stats['replayed'], stats['processed'], stats['pending']) == (3, 3, 0)
+
+
+def test_full_backlog_rejects_before_writing():
+    _, handle = recorder()
+    queue = WebhookQueue({'message': handle}, path=':memory:', max_pending=2)
+    queue.enqueue('message', {'n': 1})
+    queue.enqueue('message', {'n': 2})
+    with pytest.raises(QueueFull):
+        queue.enqueue('message', {'n': 3})
+    assert queue._count('pending') == 2
+    queue.close()
+
+
+def test_event_claimed_by_a_dead_worker_is_recovered_after_the_claim_expires(tmp_path):
+    calls, handle = recorder()
+    queue_path, state_path = str(tmp_path / 'queue.db'), str(tmp_path / 'shared.db')
+    claim_ttl = 0.3
+
+    async def run():
+        dead = SQLiteState(state_path)
+        dead.origin = 'dead-worker'
+        await dead.start()
+        crashed = WebhookQueue({'message': handle}, path=queue_path, shared=dead)
+        crashed.enqueue('message', {'n': 1})
+        assert await dead.claim('webhook:1', claim_ttl)  # Claimed, then the worker died
+        await dead.close()
+        crashed.close()
+
+        alive = SQLiteState(state_path)
+        alive.origin = 'live-worker'
+        await alive.start()
+        queue = WebhookQueue({'message': handle}, path=queue_path, shared=alive, claim_ttl=claim_ttl)
+        queue.start()
+        await queue.drain()
+        assert calls == [] and queue.stats['claimed_elsewhere'] == 1
+
+        await wait_until(lambda: queue.stats['processed'] == 1)
+        stats = queue.get_stats()
+        await queue.stop()
+        queue.close()
+        await alive.close()
+        return stats
+
+    stats = asyncio.run(run())
+    assert calls == [1]
+    assert stats['pending'] == 0
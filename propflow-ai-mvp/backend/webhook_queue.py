@@ -0,0 +1,307 @@
+"""
+PropFlow AI Webhook Queue
+Channel webhooks acknowledged in milliseconds, processed in the background
+
+Every webhook is written to a local SQLite queue before the 202 goes back,
+keyed by its event id - a channel retrying the same event is acknowledged
+again but never processed twice. A small asyncio worker pool does the real
+work; anything still pending when the process stopped is replayed on start.
+With several worker processes sharing the queue file, each event is
+claimed through the shared state before it runs, and events orphaned by a
+crashed worker are picked up by the others once the claim expires.
+"""
+
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+from collections import deque
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from event_log import EventLog, event_log, correlate
+from metrics import MetricsRegistry, metrics
+
+
+DEFAULT_QUEUE_PATH = os.environ.get(
+    'PROPFLOW_WEBHOOK_QUEUE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'webhook_queue.db')
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhook_events (
+    seq         INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id    TEXT NOT NULL UNIQUE,
+    kind        TEXT NOT NULL,
+    payload     TEXT NOT NULL,
+    status      TEXT NOT NULL DEFAULT 'pending',  -- pending / done / failed
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    received_at REAL NOT NULL,
+    finished_at REAL,
+    error       TEXT
+);
+CREATE INDEX IF NOT EXISTS webhook_events_pending ON webhook_events (status, seq);
+"""
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class QueueFull(Exception):
+    """Too much work pending - the channel should retry later"""
+
+
+def payload_event_id(kind: str, payload: Dict[str, Any]) -> str:
+    """Stable id for webhooks that don't carry one - same body, same id"""
+    body = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return f"{kind}:{hashlib.sha256(body.encode()).hexdigest()[:32]}"
+
+
+class WebhookQueue:
+    """
+    Durable, deduplicating webhook queue + asyncio worker pool
+    enqueue() persists and returns at once; handlers[kind](payload) runs later.
+    The queue file is opened on start() or the first enqueue(), never at construction
+    """
+
+    def __init__(self,
+                 handlers: Dict[str, Handler],
+                 path: str = DEFAULT_QUEUE_PATH,
+                 workers: int = 4,
+                 max_pending: int = 10000,
+                 max_attempts: int = 5,
+                 retry_delay: float = 2.0,
+                 keep_done_seconds: float = 7 * 86400,
+                 shared: Any = None,
+                 claim_ttl: float = 120.0,
+                 metrics: MetricsRegistry = metrics,
+                 event_log: EventLog = event_log):
+        self.handlers = handlers
+        self.path = path
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.keep_done_seconds = keep_done_seconds  # Dedup window for channel retries
+        self.shared = shared if shared is not None and shared.shared else None  # Multi-worker claims
+        self.claim_ttl = claim_ttl
+        self.event_log = event_log
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._retries: set = set()  # Pending retry timers
+        self._local: set = set()  # Seqs queued, running or waiting to retry in this process
+        self._pending = 0
+        self._in_flight = 0
+        self._latencies_ms: deque = deque(maxlen=1000)  # Received -> processed
+        self.stats = {'received': 0, 'duplicates': 0, 'rejected': 0, 'processed': 0,
+                      'retries': 0, 'failed': 0, 'replayed': 0, 'claimed_elsewhere': 0}
+        self._webhooks = metrics.counter('propflow_webhooks_total', 'Webhooks by kind and outcome', ('kind', 'result'))
+        self._lag = metrics.histogram('propflow_webhook_lag_seconds', 'Webhook received -> processed', ('kind',),
+                                      buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 120.0, 600.0))
+
+    def open(self):
+        """Open (or create) the queue file and load the backlog size - idempotent"""
+        if self._db is not None:
+            return
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        # WAL + NORMAL: a commit survives a process crash without an fsync per webhook
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(_SCHEMA)
+        self._pending = self._count('pending')
+
+    def _count(self, status: str) -> int:
+        return self._db.execute('SELECT COUNT(*) FROM webhook_events WHERE status = ?', (status,)).fetchone()[0]
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], event_id: Optional[str] = None) -> Tuple[str, bool]:
+        """
+        Persist one webhook - returns (event_id, is_new)
+        Duplicates are acknowledged but not queued again. Raises QueueFull
+        when the backlog is over max_pending, before anything is written.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"No handler for webhook kind '{kind}'")
+        self.open()
+        event_id = event_id or payload_event_id(kind, payload)
+        if self._pending >= self.max_pending:
+            self.stats['rejected'] += 1
+            self._webhooks.inc(kind, 'rejected')
+            raise QueueFull(f"{self._pending} webhooks pending")
+
+        received_at = time.time()
+        cursor = self._db.execute(
+            'INSERT OR IGNORE INTO webhook_events (event_id, kind, payload, received_at) VALUES (?, ?, ?, ?)',
+            (event_id, kind, json.dumps(payload, default=str), received_at)
+        )
+        if cursor.rowcount == 0:
+            self.stats['duplicates'] += 1
+            self._webhooks.inc(kind, 'duplicate')
+            return event_id, False
+
+        self.stats['received'] += 1
+        self._webhooks.inc(kind, 'accepted')
+        self._pending += 1
+        self.event_log.emit('webhook.accepted', webhook_kind=kind, webhook_seq=cursor.lastrowid, event_id=event_id)
+        if self._queue is not None:
+            self._put((cursor.lastrowid, kind, payload, received_at, 0))
+        return event_id, True
+
+    def _put(self, item: tuple):
+        self._local.add(item[0])
+        self._queue.put_nowait(item)
+
+    async def _worker(self):
+        while True:
+            seq, kind, payload, received_at, attempts = await self._queue.get()
+            self._in_flight += 1
+            try:
+                if self.shared is not None and not await self._claim(seq):
+                    self._local.discard(seq)  # Another worker owns it, or already finished it
+                    self.stats['claimed_elsewhere'] += 1
+                    continue
+                with correlate(webhook_kind=kind, webhook_seq=seq):
+                    await self.handlers[kind](payload)
+            except Exception as e:
+                self._retry_or_fail(seq, kind, payload, received_at, attempts + 1, e)
+            else:
+                self._finish(seq, 'done', attempts + 1)
+                self.stats['processed'] += 1
+                self._webhooks.inc(kind, 'processed')
+                lag = time.time() - received_at
+                self._latencies_ms.append(lag * 1000)
+                self._lag.observe(lag, kind)
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+    async def _claim(self, seq: int) -> bool:
+        if not await self.shared.claim(f"webhook:{seq}", self.claim_ttl):
+            return False
+        row = self._db.execute('SELECT status FROM webhook_events WHERE seq = ?', (seq,)).fetchone()
+        return row is not None and row[0] == 'pending'
+
+    def _finish(self, seq: int, status: str, attempts: int, error: Optional[str] = None):
+        self._db.execute(
+            'UPDATE webhook_events SET status = ?, attempts = ?, finished_at = ?, error = ? WHERE seq = ?',
+            (status, attempts, time.time(), error, seq)
+        )
+        self._pending -= 1
+        self._local.discard(seq)
+
+    def _retry_or_fail(self, seq: int, kind: str, payload: Dict[str, Any], received_at: float,
+                       attempts: int, error: Exception):
+        if attempts >= self.max_attempts:
+            self._finish(seq, 'failed', attempts, str(error))
+            self.stats['failed'] += 1
+            self._webhooks.inc(kind, 'failed')
+            self.event_log.warning('webhook.failed', webhook_kind=kind, webhook_seq=seq, attempts=attempts, error=str(error))
+            return
+        self._db.execute('UPDATE webhook_events SET attempts = ?, error = ? WHERE seq = ?',
+                         (attempts, str(error), seq))
+        self.stats['retries'] += 1
+        # Exponential backoff without holding a worker
+        item = (seq, kind, payload, received_at, attempts)
+        timer = asyncio.get_running_loop().call_later(
+            self.retry_delay * 2 ** (attempts - 1), lambda: self._requeue(timer, item)
+        )
+        self._retries.add(timer)
+
+    def _requeue(self, timer: asyncio.TimerHandle, item: tuple):
+        self._retries.discard(timer)
+        if self._queue is not None:
+            self._queue.put_nowait(item)
+
+    def _replay(self, received_before: Optional[float] = None) -> int:
+        """Queue everything left pending by the last run (or by a dead worker), oldest first"""
+        rows = self._db.execute(
+            "SELECT seq, kind, payload, received_at, attempts FROM webhook_events "
+            "WHERE status = 'pending' AND received_at < ? ORDER BY seq",
+            (received_before or time.time() + 1,)
+        ).fetchall()
+        replayed = 0
+        for seq, kind, payload, received_at, attempts in rows:
+            if seq not in self._local:
+                self._put((seq, kind, json.loads(payload), received_at, attempts))
+                replayed += 1
+        self.stats['replayed'] += replayed
+        return replayed
+
+    async def _recover(self):
+        """Multi-worker: pick up events whose claim expired with a dead worker, resync the backlog size"""
+        while True:
+            await asyncio.sleep(self.claim_ttl / 2)
+            try:
+                self._pending = self._count('pending')
+                recovered = self._replay(received_before=time.time() - self.claim_ttl)
+                if recovered:
+                    self.event_log.emit('webhook.recovered', count=recovered)
+            except sqlite3.OperationalError as e:
+                self.event_log.warning('webhook.recover_failed', error=str(e))
+
+    def prune(self) -> int:
+        """Forget finished events older than the dedup window"""
+        cursor = self._db.execute(
+            "DELETE FROM webhook_events WHERE status != 'pending' AND finished_at < ?",
+            (time.time() - self.keep_done_seconds,)
+        )
+        return cursor.rowcount
+
+    def start(self):
+        """Replay leftovers and start the worker pool (called from the app startup hook)"""
+        if self._tasks:
+            return
+        self.open()
+        self._queue = asyncio.Queue()
+        self.prune()
+        self._pending = self._count('pending')
+        replayed = self._replay()
+        if replayed:
+            self.event_log.emit('webhook.replayed', count=replayed)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if self.shared is not None:
+            self._tasks.append(asyncio.create_task(self._recover()))
+
+    async def drain(self):
+        """Wait until everything queued so far has been processed"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self):
+        """Stop the workers - unfinished events stay pending and replay next start"""
+        for timer in self._retries:
+            timer.cancel()
+        self._retries.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._local.clear()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Backpressure view: how much is waiting, for how long, and how fast it drains"""
+        oldest = self._db.execute(
+            "SELECT MIN(received_at) FROM webhook_events WHERE status = 'pending'"
+        ).fetchone()[0] if self._db is not None else None
+        latencies = sorted(self._latencies_ms)
+        return {
+            **self.stats,
+            'pending': self._pending,
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'in_flight': self._in_flight,
+            'retry_waiting': len(self._retries),
+            'workers': self.workers if self._tasks else 0,
+            'max_pending': self.max_pending,
+            'oldest_pending_age_seconds': round(time.time() - oldest, 1) if oldest else 0.0,
+            'processing_lag_ms_p50': round(latencies[len(latencies) // 2], 1) if latencies else None,
+            'processing_lag_ms_p99': round(latencies[int(len(latencies) * 0.99)], 1) if latencies else None,
+        }
@@ -4,6 +4,7 @@
  */
 
 import React, { useState, useEffect } from 'react';
+import { apiService } from '../services/ApiService';
 import '../styles/DesignSystem.css';
 import './PremiumDashboard.css';
 
@@ -43,6 +44,45 @@ interface MagicStats {
   automationPercentage: number;
 }
 
+const HOST_ID = 'premium';
+
+// Backend dashboard fields are snake_case; keep what the API doesn't send (photos, occupancy)
+const fromApiProperty = (api: any, previous?: Property): Property => ({
+  occupancyRate: 0,
+  lastUpdated: 'just now',
+  ...previous,
+  id: api.id,
+  name: api.name,
+  weeklyRevenue: api.weekly_revenue,
+  status: api.status,
+  cleanerName: api.cleaner_name ?? previous?.cleanerName,
+  cleaningTime: api.cleaning_time ?? previous?.cleaningTime,
+  nextGuest: api.next_guest ?? previous?.nextGuest,
+  guestArrivalTime: api.guest_arrival_time ?? previous?.guestArrivalTime,
+  unhandledMessages: api.unhandled_messages,
+  isClean: api.is_clean
+});
+
+const fromApiOpportunity = (api: any): RevenueOpportunity => ({
+  id: api.id,
+  event: api.event,
+  extraMoney: api.extra_money,
+  confidence: Math.round(api.confidence * 100),
+  timeRemaining: 'This week',
+  category: 'Revenue Opportunity'
+});
+
+// The dashboard carries today's counts only - the rest comes from /api/magic-stats
+const fromApiMagicStats = (api: any): MagicStats => ({
+  autoHandledMessages: api.auto_handled_messages,
+  revenueOptimizations: api.revenue_optimizations,
+  cleanersAutoBooked: 0,
+  calendarConflictsResolved: 0,
+  totalTimeSaved: 0,
+  weeklyExtraRevenue: 0,
+  automationPercentage: 0
+});
+
 const PremiumPropFlowDashboard: React.FC = () => {
   // Enhanced state management
   const [properties, setProperties] = useState<Property[]>([]);
@@ -55,19 +95,46 @@ const PremiumPropFlowDashboard: React.FC = () => {
   // Enhanced data loading with real API integration
   useEffect(() => {
     loadDashboardData();
+
+    // Live updates: the full dashboard on (re)connect, then only what changed
+    const stream = apiService.subscribeToDashboard(HOST_ID, {
+      dashboard: applyDashboard,
+      property: change => setProperties(prev =>
+        prev.map(p => p.id === change.id ? {
+          ...p,
+          status: change.status,
+          unhandledMessages: change.unhandled_messages,
+          isClean: change.is_clean,
+          weeklyRevenue: change.weekly_revenue,
+          lastUpdated: 'just now'
+        } : p)
+      ),
+      opportunity: change => setOpportunity(
+        change.money_opportunity ? fromApiOpportunity(change.money_opportunity) : null
+      )
+      // message_escalated needs no handler - the property diff carries the new unhandled count
+    });
+
+    return () => stream.close();
   }, []);
 
+  const applyDashboard = (data: any) => {
+    setProperties(prev =>
+      data.properties.map((api: any) => fromApiProperty(api, prev.find(p => p.id === api.id)))
+    );
+    setOpportunity(data.money_opportunity ? fromApiOpportunity(data.money_opportunity) : null);
+  };
+
   const loadDashboardData = async () => {
     try {
       setLoading(true);
       
       // Load from actual backend API
-      const response = await fetch('/api/dashboard/premium');
+      const response = await fetch(`/api/dashboard/${HOST_ID}`);
       if (response.ok) {
         const data = await response.json();
-        setProperties(data.properties || getMockProperties());
-        setOpportunity(data.money_opportunity || getMockOpportunity());
-        setMagicStats(data.magic_stats || getMockMagicStats());
+        applyDashboard(data);
+        setMagicStats(fromApiMagicStats(data.magic_stats));
       } else {
         // Fallback to enhanced mock data
         setProperties(getMockProperties());
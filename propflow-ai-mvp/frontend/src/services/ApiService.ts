@@ -365,6 +365,36 @@ export class ApiService {
   }
 
   // Real-time Events
+  /**
+   * Live dashboard over Server-Sent Events - replaces polling /dashboard/{hostId}.
+   * 'dashboard' carries the full dashboard (on connect and after a resync);
+   * 'property', 'opportunity' and 'message_escalated' are compact diffs.
+   * EventSource reconnects on its own; call close() on the result to stop.
+   */
+  subscribeToDashboard(
+    hostId: string,
+    handlers: {
+      dashboard?: (dashboard: any) => void;
+      property?: (change: any) => void;
+      opportunity?: (change: { money_opportunity: any }) => void;
+      message_escalated?: (escalation: any) => void;
+    }
+  ): EventSource {
+    const source = new EventSource(`${this.baseUrl}/dashboard/${encodeURIComponent(hostId)}/stream`);
+
+    (Object.keys(handlers) as Array<keyof typeof handlers>).forEach(eventType => {
+      source.addEventListener(eventType, (event: MessageEvent) => {
+        handlers[eventType]?.(JSON.parse(event.data));
+      });
+    });
+
+    source.onerror = () => {
+      console.log('Dashboard stream interrupted - reconnecting');
+    };
+
+    return source;
+  }
+
   setupWebSocketConnection(hostId: string): WebSocket {
     const wsUrl = `${this.baseUrl.replace('http', 'ws')}/ws/${hostId}`;
     const ws = new WebSocket(wsUrl);